@@ -0,0 +1,117 @@
+"""
+Évaluation vectorisée des opérateurs scalaires sur des tableaux d'opérandes.
+
+Chaque opérateur est associé à une ufunc NumPy et à sa règle de domaine: un
+million de sinus deviennent un seul appel vectorisé. Les erreurs de domaine
+(racine d'un négatif, log <= 0, division par zéro, ...) ne lèvent pas
+d'exception mais sont signalées élément par élément dans un masque.
+"""
+import math
+import re
+import numpy as np
+
+# Table des factorielles représentables en float64 (171! déborde)
+_FACTORIALS = np.array([math.factorial(i) for i in range(171)], dtype=float)
+
+
+def _factorial(a):
+    valid = (a >= 0) & (a == np.floor(a)) & (a < len(_FACTORIALS))
+    result = np.full(a.shape, np.nan)
+    result[valid] = _FACTORIALS[a[valid].astype(np.intp)]
+    return result
+
+
+# operateur: (nombre d'opérandes, fonction vectorisée, masque des erreurs de domaine)
+UFUNCS = {
+    '+': (2, np.add, None),
+    '-': (2, np.subtract, None),
+    '*': (2, np.multiply, None),
+    '/': (2, np.divide, lambda a, b: b == 0),
+    '^': (2, np.power, None),
+    '%': (2, np.mod, lambda a, b: b == 0),
+    'sqrt': (1, np.sqrt, lambda a: a < 0),
+    'log': (1, np.log, lambda a: a <= 0),
+    'sin': (1, np.sin, None),
+    'cos': (1, np.cos, None),
+    'tan': (1, np.tan, None),
+    '!': (1, _factorial, None),
+    'abs': (1, np.abs, None),
+    'exp': (1, np.exp, None),
+}
+
+_BINARY = re.compile(r'^\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*([-+*/^%])\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*$')
+_UNARY = re.compile(r'^\s*([a-z]+)\s*\(\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*\)\s*$')
+_FACTORIAL = re.compile(r'^\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*!\s*$')
+
+
+def batch(operator, *operands):
+    """
+    Applique operator élément par élément sur des tableaux d'opérandes.
+
+    :param operator: Symbole ou nom de l'opérateur ('+', 'sqrt', '!', ...).
+    :param operands: Un ou deux tableaux (ou scalaires) diffusables ensemble.
+    :return: Dictionnaire {'values': résultats (NaN en cas d'erreur),
+             'errors': masque booléen des éléments en erreur}.
+    """
+    if operator not in UFUNCS:
+        raise ValueError(f"Opérateur non vectorisable: {operator}")
+    arity, function, domain = UFUNCS[operator]
+    if len(operands) != arity:
+        raise ValueError(f"L'opérateur {operator} attend {arity} opérande(s)")
+    arrays = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in operands])
+    with np.errstate(all='ignore'):
+        values = np.asarray(function(*arrays), dtype=float)
+    errors = ~np.isfinite(values)
+    if domain is not None:
+        errors |= domain(*arrays)
+    values[errors] = np.nan
+    return {'values': values, 'errors': errors}
+
+
+def batch_operations(operations):
+    """
+    Évalue une liste d'opérations textuelles ('2 + 3', 'sqrt(4)', '5!', ...).
+
+    Les opérations sont regroupées par opérateur et chaque groupe est évalué en
+    un seul appel vectorisé; l'ordre d'entrée est conservé. Une opération non
+    reconnue est signalée dans le masque d'erreurs.
+    """
+    groups = {}
+    for index, operation in enumerate(operations):
+        match = _BINARY.match(operation)
+        if match:
+            key, args = match.group(2), (match.group(1), match.group(3))
+        else:
+            match = _UNARY.match(operation) or _FACTORIAL.match(operation)
+            if match and match.re is _UNARY and match.group(1) in UFUNCS:
+                key, args = match.group(1), (match.group(2),)
+            elif match and match.re is _FACTORIAL:
+                key, args = '!', (match.group(1),)
+            else:
+                key, args = None, ()
+        indices, columns = groups.setdefault(key, ([], [[] for _ in args]))
+        indices.append(index)
+        for column, arg in zip(columns, args):
+            column.append(arg)
+
+    values = np.full(len(operations), np.nan)
+    errors = np.ones(len(operations), dtype=bool)
+    for key, (indices, columns) in groups.items():
+        if key is None:
+            continue
+        try:
+            operands = [np.array(column, dtype=float) for column in columns]
+        except ValueError:
+            # Un nombre mal formé dans le groupe: évaluation élément par élément
+            for index, column_values in zip(indices, zip(*columns)):
+                try:
+                    result = batch(key, *[float(x) for x in column_values])
+                except ValueError:
+                    continue
+                values[index] = result['values']
+                errors[index] = result['errors']
+            continue
+        result = batch(key, *operands)
+        values[indices] = result['values']
+        errors[indices] = result['errors']
+    return {'values': values, 'errors': errors}
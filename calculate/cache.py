@@ -0,0 +1,291 @@
+"""
+Caches bornés partagés par les opérateurs.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+
+class LRUCache:
+    """
+    Cache LRU (moins récemment utilisé) de taille bornée.
+
+    Tient à jour les compteurs de succès (hits), d'échecs (misses) et
+    d'évictions, consultables via stats().
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à key et la marque comme récente"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Ajoute ou remplace une entrée, en évinçant la plus ancienne si besoin"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Retourne la valeur en cache ou la construit avec factory()"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Vide le cache sans remettre les compteurs à zéro"""
+        self._data.clear()
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+class RenderCache:
+    """
+    Cache des images rendues, adressé par contenu.
+
+    Les images encodées sont conservées en mémoire dans un LRU borné en
+    octets, avec une durée de vie optionnelle (ttl, en secondes). Un
+    répertoire optionnel sert de second niveau persistant, partagé entre
+    processus: une image trouvée sur disque est remontée en mémoire. Ce
+    répertoire est borné à max_disk_bytes: les images les moins récemment
+    lues ou écrites sont supprimées, et une image expirée l'est dès sa lecture.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=None, directory=None, clock=time.time,
+                 max_disk_bytes=256 * 1024 * 1024):
+        if max_bytes <= 0 or max_disk_bytes <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("La durée de vie doit être strictement positive")
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.directory = directory
+        self._clock = clock
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._disk_size = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_size = sum(item[3] for item in self._disk_files())
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Empreinte des éléments d'une requête de rendu (type de graphique,
+        arguments analysés, taille, format, ...). Les tableaux NumPy sont
+        hachés par leur type, leur forme et leur contenu.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+
+        def feed(part):
+            if isinstance(part, np.ndarray):
+                digest.update(f'array:{part.dtype.str}:{part.shape}:'.encode())
+                digest.update(np.ascontiguousarray(part).data)
+            elif isinstance(part, (tuple, list)):
+                digest.update(f'seq:{len(part)}:'.encode())
+                for item in part:
+                    feed(item)
+            else:
+                digest.update(f'{type(part).__name__}:{part!r};'.encode())
+
+        feed(parts)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and self._clock() - stored_at > self.ttl
+
+    def get(self, key):
+        """Retourne l'image associée à key (mémoire puis disque), ou None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                data, stored_at = entry
+                if not self._expired(stored_at):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return data
+                self._remove(key)
+        data, stored_at = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data, stored_at)
+        return data
+
+    def put(self, key, data):
+        """Ajoute une image en mémoire (et sur disque si configuré)"""
+        data = bytes(data)
+        stored_at = self._clock()
+        with self._lock:
+            self._store(key, data, stored_at)
+        if self.directory is not None:
+            self._write_disk(key, data)
+
+    def get_or_render(self, key, render):
+        """Retourne l'image en cache ou la produit avec render()"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def _store(self, key, data, stored_at):
+        if key in self._data:
+            self._remove(key)
+        if len(data) > self.max_bytes:
+            return
+        self._data[key] = (data, stored_at)
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        data, _ = self._data.pop(key)
+        self._size -= len(data)
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None, None
+        path = self._path(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if self._expired(stored_at):
+                self._delete_file(path)
+                return None, None
+            with open(path, 'rb') as file:
+                data = file.read()
+            # Date d'accès pour l'éviction LRU (la date de modification reste celle de l'écriture)
+            os.utime(path, (time.time(), stored_at))
+            return data, stored_at
+        except OSError:
+            return None, None
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        # Écriture atomique: un lecteur concurrent ne voit jamais un fichier partiel
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+        with self._lock:
+            self._disk_size += len(data) - previous
+            over = self._disk_size > self.max_disk_bytes
+        if over:
+            self._shrink_disk()
+
+    def _disk_files(self):
+        """Images du niveau disque: liste de (chemin, date d'utilisation, date d'écriture, taille)"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for item in os.scandir(entry.path):
+                if item.name.endswith('.tmp'):
+                    continue
+                try:
+                    info = item.stat()
+                except OSError:
+                    continue
+                files.append((item.path, max(info.st_atime, info.st_mtime), info.st_mtime, info.st_size))
+        return files
+
+    def _delete_file(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            self._disk_size -= size
+        return True
+
+    def _shrink_disk(self):
+        """Supprime les images expirées puis les moins récemment utilisées jusqu'à max_disk_bytes"""
+        files = sorted(self._disk_files(), key=lambda item: item[1])
+        # Taille relue sur disque: le répertoire peut être partagé entre processus
+        with self._lock:
+            self._disk_size = sum(item[3] for item in files)
+        for path, _, written_at, size in files:
+            if self._disk_size <= self.max_disk_bytes and not self._expired(written_at):
+                continue
+            if self._delete_file(path):
+                self.disk_evictions += 1
+
+    def clear(self):
+        """Vide le niveau mémoire sans remettre les compteurs à zéro"""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        return {
+            'size': len(self._data),
+            'bytes': self._size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'disk_bytes': self._disk_size,
+            'max_disk_bytes': self.max_disk_bytes,
+            'disk_evictions': self.disk_evictions
+        }
+
+
+_MISSING = object()
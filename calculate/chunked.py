@@ -0,0 +1,190 @@
+"""
+Réductions parallèles par blocs sur de grands tableaux.
+
+Le tableau est découpé en blocs réduits dans des threads (NumPy libère le GIL
+pendant les calculs), puis les résultats partiels sont combinés par des règles
+exactes:
+- moyenne et variance: fusion par paires des (count, mean, M2) de chaque bloc;
+- histogrammes: effectifs partiels de chaque bloc additionnés;
+- percentiles: histogramme fusionné des blocs pour localiser la classe de
+  chaque rang, puis sélection exacte (np.partition) parmi les seules valeurs
+  de cette classe (aussi sur une série lue par blocs: stream_percentile);
+  les infinis sont comptés aux extrémités, hors histogramme.
+En dessous de PARALLEL_THRESHOLD valeurs, le chemin série de NumPy est plus
+rapide et reste utilisé par Operators.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from calculate.streaming import RunningStats
+from calculate.histogram import Histogram, bin_rule
+
+PARALLEL_THRESHOLD = 1 << 22
+CHUNK_SIZE = 1 << 20
+HISTOGRAM_BINS = 4096
+
+
+def _chunks(values, chunk_size):
+    flat = np.asarray(values).ravel()
+    return [flat[start:start + chunk_size] for start in range(0, flat.size, chunk_size)]
+
+
+def _map(function, chunks, threads):
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count() or 1) as executor:
+        return list(executor.map(function, chunks))
+
+
+def parallel_stats(values, threads=None, chunk_size=CHUNK_SIZE):
+    """
+    Moyenne et variance d'un grand tableau, blocs réduits en parallèle.
+
+    :return: RunningStats fusionné (mean, variance, std, min, max).
+    """
+    chunks = _chunks(values, chunk_size)
+    accumulator = RunningStats()
+    for partial in _map(lambda chunk: RunningStats().update(chunk), chunks, threads):
+        accumulator.merge(partial)
+    return accumulator
+
+
+def _bin_indices(chunk, low, scale):
+    indices = ((chunk - low) * scale).astype(np.intp)
+    return np.minimum(indices, HISTOGRAM_BINS - 1, out=indices)
+
+
+def _bounds(chunk):
+    """Bornes et effectif des valeurs finies du bloc, puis effectifs de -inf, +inf et NaN"""
+    if chunk.size:
+        low, high = np.min(chunk), np.max(chunk)
+        if np.isfinite(low) and np.isfinite(high):
+            return low, high, chunk.size, 0, 0, 0
+    finite = chunk[np.isfinite(chunk)]
+    negative = np.count_nonzero(chunk == -np.inf)
+    positive = np.count_nonzero(chunk == np.inf)
+    missing = chunk.size - finite.size - negative - positive
+    if finite.size == 0:
+        return np.inf, -np.inf, 0, negative, positive, missing
+    return np.min(finite), np.max(finite), finite.size, negative, positive, missing
+
+
+def _finite(chunk):
+    return chunk[np.isfinite(chunk)]
+
+
+def _lerp(a, b, t):
+    """Interpolation linéaire de np.percentile (mêmes arrondis, mêmes NaN avec les infinis)"""
+    with np.errstate(invalid='ignore'):
+        difference = b - a
+        result = a + difference * t
+        upper = t >= 0.5
+        result[upper] = b[upper] - difference[upper] * (1 - t[upper])
+    return result
+
+
+def _select_finite(read, reduce, ranks, low, high, clean):
+    """Valeurs finies de rangs ranks (triés) par histogramme des blocs puis sélection"""
+    if low == high:
+        return np.full(ranks.size, low)
+    scale = HISTOGRAM_BINS / (high - low)
+    counts = sum(reduce(lambda chunk: np.bincount(_bin_indices(clean(chunk), low, scale),
+                                                  minlength=HISTOGRAM_BINS), read()))
+    before = np.concatenate(([0], np.cumsum(counts)))
+    bins = np.searchsorted(before, ranks, side='right') - 1
+    needed = np.unique(bins)
+
+    def extract(chunk):
+        chunk = clean(chunk)
+        indices = _bin_indices(chunk, low, scale)
+        return [chunk[indices == b] for b in needed]
+
+    parts = reduce(extract, read())
+    selected = np.empty(ranks.size)
+    for position, b in enumerate(needed):
+        members = np.concatenate([part[position] for part in parts])
+        wanted = bins == b
+        selected[wanted] = np.partition(members, ranks[wanted] - before[b])[ranks[wanted] - before[b]]
+    return selected
+
+
+def _select_percentiles(read, q, reduce):
+    """
+    Percentiles exacts par histogramme puis sélection, en trois passes sur
+    les blocs: bornes, histogramme, extraction des classes des rangs cherchés.
+    Seules les valeurs finies sont classées: les -inf et +inf occupent les
+    premiers et derniers rangs, comme dans np.percentile.
+
+    :param read: Fonction sans argument retournant les blocs (relue à chaque passe).
+    :param reduce: Fonction (f, blocs) -> liste des f(bloc).
+    """
+    q = np.asarray(q, dtype=float)
+    bounds = np.array(reduce(_bounds, read()), dtype=float).reshape(-1, 6)
+    finite, negative, positive, missing = bounds[:, 2:].sum(axis=0).astype(np.intp)
+    n = finite + negative + positive + missing
+    if n == 0:
+        raise ValueError("Aucune valeur")
+    if missing:
+        return np.full(q.shape, np.nan)[()]
+
+    positions = (q / 100 * (n - 1)).ravel()
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    ranks = np.unique(np.concatenate([lower, upper]))
+    selected = np.where(ranks < negative, -np.inf, np.inf)
+    inside = (ranks >= negative) & (ranks < negative + finite)
+    if inside.any():
+        clean = _finite if negative or positive else (lambda chunk: chunk)
+        selected[inside] = _select_finite(read, reduce, ranks[inside] - negative,
+                                          np.min(bounds[:, 0]), np.max(bounds[:, 1]), clean)
+
+    below = selected[np.searchsorted(ranks, lower)]
+    above = selected[np.searchsorted(ranks, upper)]
+    return _lerp(below, above, positions - lower).reshape(q.shape)[()]
+
+
+def parallel_percentile(values, q, threads=None, chunk_size=CHUNK_SIZE):
+    """
+    Percentiles exacts d'un grand tableau (interpolation linéaire, comme
+    np.percentile), calculés en trois passes parallèles: bornes, histogramme,
+    puis extraction des valeurs des classes contenant les rangs cherchés.
+
+    :param q: Percentile ou tableau de percentiles entre 0 et 100.
+    """
+    chunks = _chunks(values, chunk_size)
+    return _select_percentiles(lambda: chunks, q, lambda function, items: _map(function, items, threads))
+
+
+def stream_percentile(read, q):
+    """
+    Percentiles exacts d'une série lue par blocs (ex: colonne CSV), sans la
+    charger: mêmes trois passes, séquentielles, en ne gardant que les
+    valeurs des classes contenant les rangs cherchés.
+
+    :param read: Fonction sans argument retournant un nouvel itérable de blocs
+                 (ex: CsvColumn.chunks).
+    :param q: Percentile ou tableau de percentiles entre 0 et 100.
+    """
+    return _select_percentiles(read, q, lambda function, items: [function(np.asarray(chunk, dtype=float))
+                                                                 for chunk in items])
+
+
+def parallel_histogram(values, bins='auto', threads=None, chunk_size=CHUNK_SIZE):
+    """
+    Histogramme d'un grand tableau: bornes (et quartiles pour 'auto') puis
+    effectifs, chaque passe réduite par blocs en parallèle.
+
+    :param bins: Nombre de classes, 'auto', 'log' ou 'log:N'.
+    :return: Histogram.
+    """
+    summary = parallel_stats(values, threads, chunk_size)
+    if summary.count == 0:
+        raise ValueError("Aucune valeur")
+    if not (np.isfinite(summary.min) and np.isfinite(summary.max)):
+        raise ValueError("Les valeurs doivent être finies")
+    quartiles = None
+    if bin_rule(bins)[1] is None:
+        quartiles = parallel_percentile(values, [25, 75], threads, chunk_size)
+    histogram = Histogram.for_values(bins, summary.min, summary.max, summary.count, quartiles)
+    chunks = _chunks(values, chunk_size)
+    for partial in _map(lambda chunk: histogram.empty().update(chunk), chunks, threads):
+        histogram.merge(partial)
+    return histogram
@@ -1,10 +1,72 @@
 from calculate.view import View
 from calculate.operators import Operators
+from calculate.registry import OperationRegistry
+from calculate.lazy import lazy_import
+
+parallel = lazy_import('calculate.parallel')
+
+# Operations selected by the menu codes 1, 2, ... in the order of View.print_menu()
+MENU_OPERATIONS = [
+    '+', '-', '*', '/', '^', 'sqrt', 'log', '%', 'sin', 'cos', 'tan', '!', 'abs', 'exp',
+    'mean', 'median', 'mode', 'std', 'var', 'percentile', 'correlation', 'regression'
+]
+MENU_VISUALIZATIONS = [
+    'plot', 'scatter', 'histogram', 'polar', '3d', 'boxplot', 'qqplot', 'heatmap', 'pie', 'bar'
+]
+HELP_INPUTS = frozenset(["33", "help"])
+QUIT_INPUT = "34"
+
+
+def execute_record(registry, operation):
+    """
+    Executes one batch command and returns its record: {'operation', 'result'}
+    or {'operation', 'error'} if it failed.
+    """
+    try:
+        return {'operation': operation, 'result': registry.execute(operation)}
+    except Exception as e:
+        return {'operation': operation, 'error': str(e)}
+
 
 class Controller:
-    def __init__(self):
+    def __init__(self, plugins=()):
+        """
+        :param plugins: Callables receiving the OperationRegistry, used to
+                        register extra operations without editing the controller.
+        """
         self.operator = Operators()
         self.result = None
+        self.plugins = tuple(plugins)
+        self.registry = self._build_registry()
+        for plugin in self.plugins:
+            plugin(self.registry)
+
+    def _build_registry(self):
+        """
+        Builds the dispatch table mapping menu codes and command names to the
+        Operators methods.
+        """
+        registry = OperationRegistry(fallback=self._operator_method('execute'))
+        for name, function in self.operator.operators.items():
+            registry.register(name, self._operator_method(function.__name__))
+        for name, function in self.operator.visualization_functions.items():
+            registry.register(name, self._operator_method(function.__name__))
+        for code, name in enumerate(MENU_OPERATIONS, start=1):
+            registry.register_code(str(code), self._operator_method(self.operator.operators[name].__name__))
+        visualize = self._operator_method('visualize')
+        for code in range(len(MENU_OPERATIONS) + 1, len(MENU_OPERATIONS) + len(MENU_VISUALIZATIONS) + 1):
+            registry.register_code(str(code), visualize)
+        return registry
+
+    def _operator_method(self, attribute):
+        """
+        Returns a callable dispatching to self.operator.<attribute>, looked up
+        at call time so that replacing self.operator (e.g. by a mock) is honoured.
+        """
+        def dispatch(operation):
+            return getattr(self.operator, attribute)(operation)
+        dispatch.__name__ = attribute
+        return dispatch
 
     def run(self):
         """
@@ -12,19 +74,44 @@ class Controller:
         which operation he would like to use.
         """
         View.print_menu()
-        is_home_menu_run = True
-        while is_home_menu_run:
+        while True:
             input_msg = "Entrez votre choix"
             user_input = View.get_user_input(input_msg)
-            if self._is_input_valid(user_input):
-                if user_input == "help":
-                    View.print_visualization_help()
-                else:
-                    self._operations(user_input)
-                View.print_menu()
-            is_home_menu_run = self._is_quit(user_input)
+            if not self._is_quit(user_input):
+                break
+            if user_input in HELP_INPUTS:
+                View.print_visualization_help()
+                View.continue_message()
+            elif self._is_input_valid(user_input):
+                self._operations(user_input)
+            View.print_menu()
         View.end_message()
 
+    def run_batch(self, stream, output=None, jobs=1):
+        """
+        Non-interactive mode: executes one command per line of stream and
+        writes one NDJSON record per command, without menu nor pause.
+
+        :param stream: Iterable of lines (file, sys.stdin, list of str).
+        :param output: Writable stream for the records (stdout by default).
+        :param jobs: Number of worker processes (None: all cores). Records are
+                     written in input order whatever the number of processes.
+        :return: Number of executed commands.
+        """
+        operations = (line.strip() for line in stream)
+        operations = (operation for operation in operations
+                      if operation and not operation.startswith('#'))
+        if jobs == 1:
+            records = (execute_record(self.registry, operation) for operation in operations)
+        else:
+            records = parallel.execute_parallel(operations, jobs, self.plugins,
+                                                serialized=self.operator.visualization_functions)
+        count = 0
+        for record in records:
+            View.write_record(record, output)
+            count += 1
+        return count
+
     def _is_input_valid(self, user_input):
         """
         Checks if the input corresponds to a possibility of operations.
@@ -33,7 +120,8 @@ class Controller:
         :return: Return True if the input corresponds to a possibility of operations
                  otherwise it return False.
         """
-        return user_input in [str(i) for i in range(1, 35)] or user_input == "help"
+        return (self.registry.has_code(user_input) or user_input in HELP_INPUTS
+                or user_input == QUIT_INPUT)
 
     def _operations(self, user_input):
         """
@@ -46,58 +134,7 @@ class Controller:
         operation = View.get_user_input(input_msg)
 
         try:
-            # Opérations de base
-            if user_input == "1":
-                self.result = self.operator.addition(operation)
-            elif user_input == "2":
-                self.result = self.operator.substraction(operation)
-            elif user_input == "3":
-                self.result = self.operator.multiplication(operation)
-            elif user_input == "4":
-                self.result = self.operator.division(operation)
-            elif user_input == "5":
-                self.result = self.operator.power(operation)
-            elif user_input == "6":
-                self.result = self.operator.square_root(operation)
-            elif user_input == "7":
-                self.result = self.operator.logarithm(operation)
-            elif user_input == "8":
-                self.result = self.operator.modulo(operation)
-            elif user_input == "9":
-                self.result = self.operator.sine(operation)
-            elif user_input == "10":
-                self.result = self.operator.cosine(operation)
-            elif user_input == "11":
-                self.result = self.operator.tangent(operation)
-            elif user_input == "12":
-                self.result = self.operator.factorial(operation)
-            elif user_input == "13":
-                self.result = self.operator.absolute(operation)
-            elif user_input == "14":
-                self.result = self.operator.exponential(operation)
-            
-            # Statistiques
-            elif user_input == "15":
-                self.result = self.operator.mean(operation)
-            elif user_input == "16":
-                self.result = self.operator.median(operation)
-            elif user_input == "17":
-                self.result = self.operator.mode(operation)
-            elif user_input == "18":
-                self.result = self.operator.standard_deviation(operation)
-            elif user_input == "19":
-                self.result = self.operator.variance(operation)
-            elif user_input == "20":
-                self.result = self.operator.percentile(operation)
-            elif user_input == "21":
-                self.result = self.operator.correlation(operation)
-            elif user_input == "22":
-                self.result = self.operator.linear_regression(operation)
-            
-            # Visualisation
-            elif user_input in [str(i) for i in range(23, 33)]:
-                self.result = self.operator.visualize(operation)
-
+            self.result = self.registry.by_code(user_input)(operation)
             View.print_result(operation, self.result)
         except ValueError as e:
             print(f"\nErreur: {str(e)}")
@@ -114,4 +151,4 @@ class Controller:
         :param user_input: User input enter in the method run().
         :return: True if the user ask for exit the script.
         """
-        return not user_input == "34" 
\ No newline at end of file
+        return not user_input == QUIT_INPUT 
\ No newline at end of file
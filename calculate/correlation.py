@@ -0,0 +1,60 @@
+"""
+Matrices de corrélation de nombreuses séries en un seul calcul.
+
+Les séries (lignes) sont centrées-réduites puis la matrice est obtenue par
+produit matriciel (BLAS). Au-delà de block_size séries, le calcul se fait par
+blocs de lignes: seuls deux blocs standardisés sont en mémoire à la fois.
+"""
+import numpy as np
+from calculate.lazy import lazy_import
+
+stats = lazy_import('scipy.stats')
+
+DEFAULT_BLOCK_SIZE = 512
+METHODS = ('pearson', 'spearman')
+
+
+def _standardize(block, means, stds):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (block - means[:, np.newaxis]) / stds[:, np.newaxis]
+
+
+def correlation_matrix(series, method='pearson', block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Matrice de corrélation (k, k) de k séries de même longueur.
+
+    :param series: Tableau (k, n) ou liste de k séries de longueur n.
+    :param method: 'pearson' ou 'spearman' (Pearson sur les rangs).
+    :param block_size: Nombre de séries standardisées traitées à la fois.
+    :return: Tableau (k, k); les lignes des séries constantes valent NaN.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue: {method} (pearson ou spearman)")
+    if isinstance(series, (list, tuple)) and len({len(s) for s in series}) > 1:
+        raise ValueError("Toutes les séries doivent avoir la même longueur")
+    data = np.asarray(series, dtype=float)
+    if data.ndim != 2 or data.shape[0] < 2 or data.shape[1] < 2:
+        raise ValueError("Il faut au moins deux séries d'au moins deux valeurs")
+    if method == 'spearman':
+        data = stats.rankdata(data, axis=1)
+
+    k, n = data.shape
+    means = data.mean(axis=1)
+    stds = data.std(axis=1)
+    result = np.empty((k, k))
+    for start in range(0, k, block_size):
+        left = _standardize(data[start:start + block_size], means[start:start + block_size],
+                            stds[start:start + block_size])
+        for other in range(start, k, block_size):
+            if other == start:
+                right = left
+            else:
+                right = _standardize(data[other:other + block_size], means[other:other + block_size],
+                                     stds[other:other + block_size])
+            block = (left @ right.T) / n
+            result[start:start + block_size, other:other + block_size] = block
+            result[other:other + block_size, start:start + block_size] = block.T
+    np.clip(result, -1, 1, out=result)
+    constant = stds == 0
+    np.fill_diagonal(result, np.where(constant, np.nan, 1.0))
+    return result
@@ -0,0 +1,181 @@
+"""
+Références à des fichiers de données dans les commandes: mean(@data.npy).
+
+Les fichiers binaires sont projetés en mémoire (memory-map) en lecture seule:
+aucune conversion texte, aucune copie, et les pages sont partagées entre
+processus par le cache du système.
+
+Formats reconnus:
+- @fichier.npy          tableau NumPy (np.load en mmap_mode='r')
+- @fichier.npy:2        colonne 2 d'un tableau .npy à deux dimensions
+- @fichier.f64 / .f32   flottants bruts float64 / float32
+- @fichier.bin:float32  flottants bruts de type explicite (float64 par défaut)
+- @fichier.csv:colonne  colonne d'un CSV (nom d'en-tête ou indice), lue par blocs
+
+Les colonnes CSV ne sont pas chargées: CsvColumn les relit par blocs de
+lignes de taille fixe, que les opérateurs consomment avec des accumulateurs
+fusionnables (calculate.streaming, calculate.sketch).
+"""
+import csv
+import itertools
+import os
+import numpy as np
+
+RAW_DTYPES = {
+    '.f64': 'float64',
+    '.f32': 'float32',
+    '.bin': 'float64',
+    '.raw': 'float64',
+}
+ALLOWED_DTYPES = ('float64', 'float32', 'int64', 'int32', 'int16', 'int8', 'uint8')
+CSV_EXTENSIONS = ('.csv', '.tsv')
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def is_reference(text):
+    """Indique si un argument est une référence @fichier"""
+    return text.lstrip().startswith('@')
+
+
+def split_reference(text):
+    """
+    Sépare une référence '@chemin:sélecteur' en (chemin, sélecteur ou None).
+    """
+    reference = text.strip()[1:]
+    path, separator, selector = reference.rpartition(':')
+    if not separator or not selector or '/' in selector or '\\' in selector or not path:
+        return reference, None
+    return path, selector
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+class CsvColumn:
+    """
+    Colonne d'un fichier CSV lue par blocs de chunk_rows lignes.
+
+    Le séparateur (',', ';' ou tabulation) est détecté sur la première ligne,
+    qui est un en-tête si l'un de ses champs n'est pas numérique. Chaque appel
+    à chunks() relit le fichier: plusieurs passes sont possibles.
+    """
+
+    def __init__(self, path, column=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if not os.path.isfile(path):
+            raise ValueError(f"Fichier de données introuvable: {path}")
+        self.path = path
+        self.chunk_rows = chunk_rows
+        with open(path, newline='') as file:
+            first = file.readline()
+        try:
+            self.delimiter = csv.Sniffer().sniff(first, delimiters=',;\t').delimiter
+        except csv.Error:
+            self.delimiter = ','
+        header = next(csv.reader([first], delimiter=self.delimiter), [])
+        self.has_header = not all(_is_number(field) for field in header)
+        names = [name.strip() for name in header]
+        if column is None:
+            self.index = 0
+        elif column.isdigit():
+            self.index = int(column)
+        elif self.has_header and column.strip() in names:
+            self.index = names.index(column.strip())
+        else:
+            raise ValueError(f"Colonne inconnue '{column}' dans {path}")
+        if self.index >= len(header):
+            raise ValueError(f"Colonne invalide '{column}' pour {path}")
+        self.name = names[self.index] if self.has_header else str(self.index)
+
+    def chunks(self):
+        """Générateur des blocs de la colonne (tableaux de flottants)"""
+        index = self.index
+        with open(self.path, newline='') as file:
+            reader = csv.reader(file, delimiter=self.delimiter)
+            if self.has_header:
+                next(reader, None)
+            while True:
+                rows = [row for row in itertools.islice(reader, self.chunk_rows) if row]
+                if not rows:
+                    return
+                try:
+                    yield np.array([row[index] for row in rows], dtype=float)
+                except (ValueError, IndexError):
+                    raise ValueError(f"Valeur manquante ou non numérique dans la colonne {self.name}")
+
+    def to_array(self):
+        """Charge toute la colonne en mémoire"""
+        chunks = list(self.chunks())
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+def iter_aligned(sources):
+    """
+    Parcourt plusieurs séries bloc par bloc, en parallèle.
+
+    :param sources: Liste de CsvColumn ou de tableaux; les tableaux sont
+                    découpés selon la taille des blocs des colonnes CSV.
+    :return: Générateur de tuples de blocs de même longueur.
+    """
+    readers = [source.chunks() for source in sources if isinstance(source, CsvColumn)]
+    position = 0
+    while True:
+        chunks = [next(reader, None) for reader in readers]
+        if all(chunk is None for chunk in chunks):
+            break
+        if any(chunk is None for chunk in chunks) or len({len(c) for c in chunks}) != 1:
+            raise ValueError("Toutes les séries doivent avoir la même longueur")
+        size = len(chunks[0])
+        aligned = iter(chunks)
+        yield tuple(next(aligned) if isinstance(source, CsvColumn)
+                    else np.asarray(source)[position:position + size] for source in sources)
+        position += size
+    if any(not isinstance(source, CsvColumn) and len(source) != position for source in sources):
+        raise ValueError("Toutes les séries doivent avoir la même longueur")
+
+
+def load_source(text):
+    """
+    Résout une référence @fichier en source de données: CsvColumn pour un
+    CSV (lu par blocs), tableau projeté en mémoire sinon.
+    """
+    path, selector = split_reference(text)
+    if os.path.splitext(path)[1].lower() in CSV_EXTENSIONS:
+        return CsvColumn(path, selector)
+    return load_array(text)
+
+
+def load_array(text):
+    """
+    Charge sans copie le tableau désigné par une référence @fichier (une
+    colonne CSV est, elle, entièrement lue en mémoire).
+
+    :return: Tableau NumPy (np.memmap ou vue) en lecture seule.
+    """
+    path, selector = split_reference(text)
+    if not os.path.isfile(path):
+        raise ValueError(f"Fichier de données introuvable: {path}")
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return CsvColumn(path, selector).to_array()
+    if extension == '.npy':
+        array = np.load(path, mmap_mode='r')
+        if selector is None:
+            return array
+        if array.ndim != 2 or not selector.isdigit() or int(selector) >= array.shape[1]:
+            raise ValueError(f"Colonne invalide '{selector}' pour {path}")
+        return array[:, int(selector)]
+    if extension in RAW_DTYPES:
+        dtype = selector or RAW_DTYPES[extension]
+        if dtype not in ALLOWED_DTYPES:
+            raise ValueError(f"Type de données non supporté: {dtype}")
+        if os.path.getsize(path) % np.dtype(dtype).itemsize:
+            raise ValueError(f"Taille de {path} incompatible avec le type {dtype}")
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+    raise ValueError(f"Format de fichier non supporté: {path}")
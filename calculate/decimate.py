@@ -0,0 +1,155 @@
+"""
+Réduction des grands jeux de points avant le tracé.
+
+L'image finale ne compte qu'environ un millier de colonnes de pixels: au-delà,
+les points supplémentaires coûtent du temps de rendu sans changer l'image.
+- courbes: décimation min-max par colonne de pixels (enveloppe exacte de la
+  courbe) ou LTTB (Largest Triangle Three Buckets, forme visuelle conservée
+  avec un nombre de points fixé);
+- nuages de points: regroupement sur la grille des pixels de l'axe, un seul
+  point par pixel occupé.
+"""
+import numpy as np
+
+METHODS = ('minmax', 'lttb')
+
+
+def _finite_runs(y):
+    """Intervalles [début, fin) des suites de valeurs finies de y"""
+    finite = np.isfinite(y)
+    edges = np.diff(np.concatenate(([False], finite, [False])).astype(np.int8))
+    return zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+
+
+def _join_runs(x, y, runs, reduce, buckets):
+    """Réduit chaque suite finie séparément et les rejoint par des NaN (coupures du tracé)"""
+    parts_x, parts_y = [], []
+    span = x[-1] - x[0] if x.size > 1 else 0
+    for start, stop in runs:
+        # Nombre de classes proportionnel à la largeur occupée par la suite
+        width = (x[stop - 1] - x[start]) / span if span else 1
+        share = max(2, int(np.ceil(buckets * width)))
+        rx, ry = reduce(x[start:stop], y[start:stop], share)
+        parts_x.extend([rx, [np.nan]])
+        parts_y.extend([ry, [np.nan]])
+    if not parts_x:
+        return x[:0], y[:0]
+    return np.concatenate(parts_x[:-1]), np.concatenate(parts_y[:-1])
+
+
+def _first_per_bucket(positions, ordinal):
+    """Première position de chaque classe parmi positions (triées)"""
+    buckets = ordinal[positions]
+    return positions[np.flatnonzero(np.diff(np.concatenate(([-1], buckets))))]
+
+
+def _minmax_run(x, y, buckets):
+    if x.size <= 4 * buckets:
+        return x, y
+    index = np.minimum(((x - x[0]) / (x[-1] - x[0]) * buckets).astype(np.intp), buckets - 1)
+    starts = np.flatnonzero(np.diff(np.concatenate(([-1], index))))
+    sizes = np.diff(np.append(starts, x.size))
+    ordinal = np.repeat(np.arange(starts.size), sizes)
+    # Positions (dans l'ordre de x) du premier minimum et du premier maximum de chaque classe
+    lowest = _first_per_bucket(np.flatnonzero(y == np.minimum.reduceat(y, starts)[ordinal]), ordinal)
+    highest = _first_per_bucket(np.flatnonzero(y == np.maximum.reduceat(y, starts)[ordinal]), ordinal)
+    keep = np.unique(np.concatenate([starts, starts + sizes - 1, lowest, highest]))
+    return x[keep], y[keep]
+
+
+def minmax(x, y, buckets):
+    """
+    Décimation min-max: premier, dernier, minimum et maximum de chaque classe
+    de x (une classe par colonne de pixels). Le tracé obtenu couvre exactement
+    les mêmes pixels que la courbe complète.
+
+    :param x: Abscisses croissantes.
+    :param buckets: Nombre de classes (largeur de l'axe en pixels).
+    :return: Tuple (x, y) réduit; les NaN (coupures) sont conservés.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size <= 4 * buckets:
+        return x, y
+    return _join_runs(x, y, _finite_runs(y), _minmax_run, buckets)
+
+
+def _lttb_run(x, y, threshold):
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Sommet suivant: moyenne de la classe suivante (ou dernier point)
+        following = slice(stop, edges[i + 2]) if i + 2 < len(edges) else slice(n - 1, n)
+        cx, cy = x[following].mean(), y[following].mean()
+        ax, ay = x[previous], y[previous]
+        areas = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return x[selected], y[selected]
+
+
+def lttb(x, y, threshold):
+    """
+    Décimation LTTB: conserve threshold points choisis pour maximiser l'aire
+    des triangles formés avec leurs voisins (pics et creux préservés).
+
+    :param x: Abscisses croissantes.
+    :param threshold: Nombre de points conservés (au moins 3).
+    :return: Tuple (x, y) réduit; les NaN (coupures) sont conservés.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size <= threshold:
+        return x, y
+    return _join_runs(x, y, _finite_runs(y), _lttb_run, threshold)
+
+
+def decimate_line(x, y, pixels, method='minmax'):
+    """
+    Réduit une courbe à la résolution de l'axe.
+
+    :param pixels: Largeur de l'axe en pixels.
+    :param method: 'minmax' (enveloppe exacte) ou 'lttb' (2 points par pixel).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode de décimation inconnue: {method}")
+    pixels = max(1, int(pixels))
+    if method == 'minmax':
+        return minmax(x, y, pixels)
+    return lttb(x, y, 2 * pixels)
+
+
+def padded_limits(values, margin):
+    """Limites d'axe calculées comme l'autoscale de matplotlib (marge relative)"""
+    low, high = float(np.nanmin(values)), float(np.nanmax(values))
+    pad = (high - low) * margin
+    if pad == 0:
+        pad = abs(low) * margin or margin
+    return low - pad, high + pad
+
+
+def bin_points(x, y, xlim, ylim, shape):
+    """
+    Regroupe un nuage de points sur une grille (largeur, hauteur) couvrant
+    xlim x ylim: un point au centre de chaque cellule occupée.
+
+    :return: Tuple (x, y, effectifs) des cellules occupées.
+    """
+    width, height = (max(1, int(n)) for n in shape)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    column = np.clip(((x - xlim[0]) / (xlim[1] - xlim[0]) * width).astype(np.intp), 0, width - 1)
+    row = np.clip(((y - ylim[0]) / (ylim[1] - ylim[0]) * height).astype(np.intp), 0, height - 1)
+    counts = np.bincount(row * width + column, minlength=width * height)
+    occupied = np.flatnonzero(counts)
+    centers_x = xlim[0] + (occupied % width + 0.5) * (xlim[1] - xlim[0]) / width
+    centers_y = ylim[0] + (occupied // width + 0.5) * (ylim[1] - ylim[0]) / height
+    return centers_x, centers_y, counts[occupied]
@@ -0,0 +1,192 @@
+"""
+Évaluateur d'expressions arithmétiques complètes.
+
+Une formule comme ``sqrt(2)+1*3^2`` est analysée une seule fois par un
+analyseur de Pratt (priorité des opérateurs, parenthèses, imbrication) et
+compilée en un arbre de fermetures Python réutilisable: évaluer de nouveau la
+formule ne coûte plus aucune analyse.
+
+Les opérateurs et fonctions d'un argument sont ceux de scalar, partagés avec
+les commandes d'Operators; les fonctions à nombre variable d'arguments (mean,
+median, ...) sont fournies à la compilation, par défaut les statistiques
+d'Operators (Operators.formula_functions).
+"""
+import math
+import re
+from calculate import scalar
+
+_TOKEN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(\S))')
+
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+
+# Puissance de liaison à gauche des opérateurs infixes et postfixes
+_BINDING_POWER = {
+    '+': 10, '-': 10,
+    '*': 20, '/': 20, '%': 20,
+    '^': 30,
+    '!': 40,
+}
+_UNARY_BINDING_POWER = 25
+
+
+def tokenize(text):
+    """Découpe une formule en jetons (type, valeur)"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(('number', float(number)))
+        elif name is not None:
+            tokens.append(('name', name))
+        elif symbol in _BINDING_POWER or symbol in '(),':
+            tokens.append(('op', symbol))
+        else:
+            raise ValueError(f"Caractère inattendu '{symbol}'")
+        position = match.end()
+    tokens.append(('end', None))
+    return tokens
+
+
+class _PrattParser:
+    """Analyseur descendant à priorité d'opérateurs produisant des fermetures"""
+
+    def __init__(self, tokens, functions):
+        self.tokens = tokens
+        self.functions = functions
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position]
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        kind, token = self.next()
+        if kind != 'op' or token != value:
+            raise ValueError(f"'{value}' attendu")
+
+    def parse(self):
+        node = self.expression(0)
+        if self.peek()[0] != 'end':
+            raise ValueError(f"Jeton inattendu '{self.peek()[1]}'")
+        return node
+
+    def expression(self, right_binding_power):
+        left = self.prefix(self.next())
+        while True:
+            kind, value = self.peek()
+            if kind != 'op' or _BINDING_POWER.get(value, 0) <= right_binding_power:
+                return left
+            self.next()
+            left = self.infix(value, left)
+
+    def prefix(self, token):
+        kind, value = token
+        if kind == 'number':
+            return lambda env: value
+        if kind == 'name':
+            return self.name(value)
+        if kind == 'op' and value == '(':
+            node = self.expression(0)
+            self.expect(')')
+            return node
+        if kind == 'op' and value in '+-':
+            operand = self.expression(_UNARY_BINDING_POWER)
+            if value == '-':
+                return lambda env: -operand(env)
+            return operand
+        raise ValueError("Expression incomplète" if kind == 'end' else f"Jeton inattendu '{value}'")
+
+    def infix(self, symbol, left):
+        if symbol == '!':
+            factorial = scalar.UNARY['!']
+            return lambda env: factorial(left(env))
+        # '^' est associatif à droite: 2^3^2 = 2^(3^2)
+        binding_power = _BINDING_POWER[symbol] - (1 if symbol == '^' else 0)
+        right = self.expression(binding_power)
+        function = scalar.BINARY[symbol]
+        return lambda env: function(left(env), right(env))
+
+    def name(self, name):
+        if self.peek() == ('op', '('):
+            self.next()
+            arguments = self.arguments()
+            if name in scalar.UNARY and name != '!':
+                if len(arguments) != 1:
+                    raise ValueError(f"{name} attend un seul argument")
+                function, argument = scalar.UNARY[name], arguments[0]
+                return lambda env: function(argument(env))
+            if name in self.functions:
+                function = self.functions[name]
+                return lambda env: function(*[argument(env) for argument in arguments])
+            raise ValueError(f"Fonction inconnue '{name}'")
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env: value
+
+        def variable(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise ValueError(f"Variable non définie '{name}'")
+        return variable
+
+    def arguments(self):
+        arguments = [self.expression(0)]
+        while self.peek() == ('op', ','):
+            self.next()
+            arguments.append(self.expression(0))
+        self.expect(')')
+        return arguments
+
+
+class Formula:
+    """
+    Formule compilée, réévaluable sans nouvelle analyse.
+
+    Les noms libres de la formule sont des variables fournies à l'appel:
+    Formula('2*x+1')(x=3) == 7.
+
+    :param functions: Fonctions à nombre variable d'arguments, {nom: f(*valeurs)}.
+    """
+
+    def __init__(self, text, functions=None):
+        self.text = text
+        self._root = _PrattParser(tokenize(text), functions or {}).parse()
+
+    def __call__(self, **variables):
+        try:
+            return self._root(variables)
+        except OverflowError as e:
+            # Ex: 1000!+1 (entier trop grand pour un float) ou 171!/1
+            raise ValueError(f"Dépassement de capacité: {str(e)}")
+
+
+_default_functions = None
+
+
+def compile_formula(text, functions=None):
+    """
+    Analyse et compile une formule.
+
+    :param functions: Fonctions à nombre variable d'arguments; par défaut
+                      les statistiques d'un Operators (mean, median, ...).
+    """
+    global _default_functions
+    if functions is None:
+        if _default_functions is None:
+            # Import différé: operators importe ce module
+            from calculate.operators import Operators
+            _default_functions = Operators().formula_functions
+        functions = _default_functions
+    return Formula(text, functions)
@@ -0,0 +1,174 @@
+"""
+Compilation des expressions mathématiques utilisées par les visualisations.
+
+Une expression comme ``x^2+sin(y)`` est analysée une seule fois en arbre
+syntaxique, vérifiée, puis compilée en une fonction NumPy vectorisée qui
+évalue toute une grille (``np.linspace``/``np.meshgrid``) en un seul passage.
+"""
+import ast
+import io
+import tokenize
+import numpy as np
+from calculate.cache import LRUCache
+
+FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'asin': np.arcsin,
+    'acos': np.arccos,
+    'atan': np.arctan,
+    'sinh': np.sinh,
+    'cosh': np.cosh,
+    'tanh': np.tanh,
+    'sqrt': np.sqrt,
+    'log': np.log,
+    'log10': np.log10,
+    'exp': np.exp,
+    'abs': np.abs,
+}
+
+CONSTANTS = {
+    'pi': np.pi,
+    'e': np.e,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod,
+    ast.UAdd, ast.USub,
+)
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """Convertit les constantes entières en flottants (évite 9**9**9 en entier)"""
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Constante non autorisée: {node.value!r}")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+class CompiledExpression:
+    """
+    Expression mathématique compilée en fonction vectorisée.
+
+    Les erreurs de domaine (log d'un négatif, division par zéro, ...) ne lèvent
+    pas d'exception: les points concernés valent NaN dans le résultat.
+    """
+
+    def __init__(self, expr, variables=('x',)):
+        self.expr = expr
+        self.variables = tuple(variables)
+        try:
+            tree = ast.parse(expr.replace('^', '**').strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Expression invalide '{expr}': {e.msg}")
+        self._validate(tree)
+        tree = ast.fix_missing_locations(_FloatConstants().visit(tree))
+        self._code = compile(tree, '<expression>', 'eval')
+
+    def _validate(self, tree):
+        """Vérifie que l'arbre ne contient que des nœuds et des noms autorisés"""
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"Syntaxe non autorisée dans '{self.expr}'")
+            if isinstance(node, ast.Call):
+                if (not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS
+                        or node.keywords or len(node.args) != 1):
+                    raise ValueError(f"Appel de fonction invalide dans '{self.expr}'")
+            elif isinstance(node, ast.Name):
+                if (node.id not in FUNCTIONS and node.id not in CONSTANTS
+                        and node.id not in self.variables):
+                    raise ValueError(f"Nom inconnu '{node.id}' dans '{self.expr}'")
+
+    def __call__(self, *values):
+        """Évalue l'expression sur des tableaux (ou scalaires) de même forme"""
+        if len(values) != len(self.variables):
+            raise ValueError(f"{len(self.variables)} variable(s) attendue(s), {len(values)} reçue(s)")
+        arrays = [np.asarray(v, dtype=float) for v in values]
+        namespace = dict(FUNCTIONS)
+        namespace.update(CONSTANTS)
+        namespace.update(zip(self.variables, arrays))
+        with np.errstate(all='ignore'):
+            try:
+                result = eval(self._code, {'__builtins__': {}}, namespace)
+            except (ArithmeticError, TypeError) as e:
+                raise ValueError(f"Évaluation impossible de '{self.expr}': {str(e)}")
+            shape = np.broadcast(*arrays).shape if arrays else ()
+            result = np.array(np.broadcast_to(np.real_if_close(result), shape), dtype=float)
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+def compile_expression(expr, variables=('x',)):
+    """Compile une expression en fonction vectorisée des variables données"""
+    return CompiledExpression(expr, variables)
+
+
+def evaluate_constant(expr):
+    """Évalue une expression constante (ex: '2*pi') et retourne un flottant"""
+    value = float(CompiledExpression(expr, ())())
+    if np.isnan(value):
+        raise ValueError(f"Valeur non définie: '{expr}'")
+    return value
+
+
+# Opérateurs Python de deux caractères, qu'il ne faut pas former en retirant un espace
+_OPERATOR_PAIRS = frozenset(['**', '//', '<<', '>>', '<=', '>=', '==', '!=', '->', ':=',
+                             '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '@='])
+
+
+def _tokens(text):
+    """Lexèmes Python de text (sans fins de ligne)"""
+    ignored = (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER)
+    return [token.string for token in tokenize.generate_tokens(io.StringIO(text).readline)
+            if token.type not in ignored]
+
+
+def _merges(left, right):
+    """Vrai si deux lexèmes accolés formeraient un autre lexème (ex: '2' '3', '*' '*')"""
+    word = str.isalnum
+    edge = left[-1] + right[0]
+    return (word(left[-1]) or left[-1] in '_.') and (word(right[0]) or right[0] in '_.') \
+        or edge in _OPERATOR_PAIRS
+
+
+def normalize_expression(expr):
+    """
+    Forme canonique d'une expression: puissance notée ^, espaces retirés
+    sauf entre deux lexèmes qui fusionneraient sans eux (ex: '2 3' reste
+    '2 3', invalide, au lieu de devenir 23).
+    """
+    text = expr.strip()
+    try:
+        tokens = ['^' if token == '**' else token for token in _tokens(text)]
+    except (tokenize.TokenError, SyntaxError):
+        return text
+    parts = tokens[:1]
+    for previous, token in zip(tokens, tokens[1:]):
+        parts.append(' ' + token if _merges(previous, token) else token)
+    return ''.join(parts)
+
+
+class ExpressionCache:
+    """
+    Cache LRU des expressions compilées, indexé par la forme normalisée de
+    l'expression et par ses variables.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, expr, variables=('x',)):
+        """Retourne l'expression compilée, en la compilant au premier appel"""
+        key = (normalize_expression(expr), tuple(variables))
+        return self._cache.get_or_create(key, lambda: CompiledExpression(key[0], key[1]))
+
+    def clear(self):
+        """Vide le cache"""
+        self._cache.clear()
+
+    def stats(self):
+        """Retourne les compteurs hits/misses/evictions du cache"""
+        return self._cache.stats()
@@ -0,0 +1,111 @@
+"""
+Réserve de figures matplotlib réutilisées d'un graphique à l'autre.
+
+Construire une Figure, son FigureCanvasAgg et ses axes coûte plus cher que de
+tracer un petit graphique. Les figures sont donc conservées par (projection,
+taille) et simplement vidées (ax.cla()) avant d'être réutilisées. Matplotlib
+n'étant pas thread-safe, chaque thread dispose de ses propres figures.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+from calculate.lazy import lazy_import
+
+mpl_figure = lazy_import('matplotlib.figure')
+backend_agg = lazy_import('matplotlib.backends.backend_agg')
+
+DEFAULT_POOL_SIZE = 8
+
+
+class FigurePool:
+    """
+    Figures inactives, au plus maxsize par thread; au-delà, la figure la
+    moins récemment rendue est abandonnée.
+    """
+
+    def __init__(self, maxsize=DEFAULT_POOL_SIZE):
+        if maxsize < 0:
+            raise ValueError("La taille de la réserve doit être positive")
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._defaults = {}
+        self.created = 0
+        self.reused = 0
+
+    def _idle(self):
+        """Figures inactives du thread courant: OrderedDict clé -> liste"""
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = OrderedDict()
+        return idle
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def acquire(self, figsize=(10, 6), projection=None):
+        """
+        Fournit une figure vide à un seul axe (réutilisée si possible).
+
+        :return: Tuple (figure, axe).
+        """
+        key = (projection, tuple(figsize))
+        figures = self._idle().get(key)
+        if figures:
+            fig = figures.pop()
+            self._reset(fig, projection, self._defaults.get(key))
+            self._count('reused')
+        else:
+            fig = mpl_figure.Figure(figsize=figsize)
+            backend_agg.FigureCanvasAgg(fig)
+            ax = fig.add_subplot(111, projection=projection)
+            # État initial des axes cartésiens que cla() ne restaure pas (modifié par pie)
+            if projection is None:
+                self._defaults.setdefault(key, (ax.get_aspect(), ax.get_frame_on()))
+            self._count('created')
+        return fig, fig.axes[0]
+
+    def release(self, fig, figsize=(10, 6), projection=None):
+        """Rend une figure à la réserve du thread courant"""
+        key = (projection, tuple(figsize))
+        idle = self._idle()
+        idle.setdefault(key, []).append(fig)
+        idle.move_to_end(key)
+        while sum(len(figures) for figures in idle.values()) > self.maxsize:
+            oldest = next(iter(idle))
+            idle[oldest].pop(0)
+            if not idle[oldest]:
+                del idle[oldest]
+
+    @contextmanager
+    def figure(self, figsize=(10, 6), projection=None):
+        """Contexte: with pool.figure((10, 6)) as (fig, ax): ..."""
+        fig, ax = self.acquire(figsize, projection)
+        try:
+            yield fig, ax
+        finally:
+            self.release(fig, figsize, projection)
+
+    @staticmethod
+    def _reset(fig, projection, defaults):
+        """Vide la figure; recrée l'axe si des axes ont été ajoutés (colorbar)"""
+        if len(fig.axes) != 1:
+            fig.clf()
+            fig.add_subplot(111, projection=projection)
+            return
+        ax = fig.axes[0]
+        ax.cla()
+        if defaults is not None:
+            aspect, frame_on = defaults
+            ax.set_aspect(aspect)
+            ax.set_frame_on(frame_on)
+
+    def stats(self):
+        """Figures créées, réutilisées et inactives dans le thread courant"""
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'idle': sum(len(figures) for figures in self._idle().values()),
+            'maxsize': self.maxsize
+        }
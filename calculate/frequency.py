@@ -0,0 +1,114 @@
+"""
+Calcul du mode et des valeurs les plus fréquentes.
+
+La stratégie dépend des données:
+- petites entrées: comptage par table de hachage (Counter);
+- entiers sur une plage réduite: comptage linéaire par np.bincount;
+- autres cas (flottants, grandes plages): tri via np.unique(return_counts);
+- flux non bornés: résumé Misra-Gries des valeurs fréquentes (mémoire O(k)).
+En cas d'égalité, la plus petite valeur est retenue.
+"""
+from collections import Counter
+import numpy as np
+
+SMALL_INPUT = 256
+BINCOUNT_MAX_RANGE = 1 << 20
+
+
+def frequencies(values):
+    """
+    Valeurs distinctes (triées) et leurs effectifs.
+
+    :return: Tuple (valeurs, effectifs) de tableaux NumPy.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    if values.size == 0:
+        raise ValueError("Aucune valeur")
+    if values.size <= SMALL_INPUT:
+        counter = Counter(values.tolist())
+        uniques = np.array(sorted(counter))
+        return uniques, np.array([counter[v] for v in uniques.tolist()])
+    low, high = values.min(), values.max()
+    if (np.isfinite(low) and np.isfinite(high) and high - low < BINCOUNT_MAX_RANGE
+            and np.array_equal(values, np.floor(values))):
+        counts = np.bincount((values - low).astype(np.intp))
+        present = np.flatnonzero(counts)
+        return present + low, counts[present]
+    return np.unique(values, return_counts=True)
+
+
+def mode(values):
+    """Valeur la plus fréquente (la plus petite en cas d'égalité)"""
+    uniques, counts = frequencies(values)
+    return uniques[np.argmax(counts)]
+
+
+def top_k(values, k):
+    """
+    Les k valeurs les plus fréquentes, par effectif décroissant.
+
+    :return: Liste de tuples (valeur, effectif).
+    """
+    if k < 1:
+        raise ValueError("k doit être un entier strictement positif")
+    uniques, counts = frequencies(values)
+    order = np.lexsort((uniques, -counts))[:int(k)]
+    return [(float(uniques[i]), int(counts[i])) for i in order]
+
+
+class MisraGries:
+    """
+    Résumé Misra-Gries des valeurs fréquentes d'un flux.
+
+    Conserve au plus k compteurs. Tout effectif estimé sous-estime l'effectif
+    réel d'au plus n/(k+1); toute valeur plus fréquente que n/(k+1) est
+    conservée. Deux résumés se fusionnent avec la même garantie.
+    """
+
+    def __init__(self, k=100):
+        if k < 1:
+            raise ValueError("k doit être un entier strictement positif")
+        self.k = k
+        self.count = 0
+        self.counters = {}
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs (compté d'un coup avec np.unique)"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        uniques, counts = np.unique(values, return_counts=True)
+        self.count += values.size
+        self._add(zip(uniques.tolist(), counts.tolist()))
+        return self
+
+    def merge(self, other):
+        """Fusionne le résumé other (construit sur un autre fragment)"""
+        self.count += other.count
+        self._add(other.counters.items())
+        return self
+
+    def _add(self, items):
+        counters = self.counters
+        for value, count in items:
+            counters[value] = counters.get(value, 0) + count
+        if len(counters) > self.k:
+            # Retire à tous les compteurs le (k+1)-ième plus grand effectif
+            threshold = sorted(counters.values(), reverse=True)[self.k]
+            self.counters = {v: c - threshold for v, c in counters.items() if c > threshold}
+
+    @property
+    def error(self):
+        """Sous-estimation maximale d'un effectif"""
+        return self.count / (self.k + 1)
+
+    def top_k(self, k=None):
+        """Les k valeurs les plus fréquentes estimées: liste de (valeur, effectif)"""
+        items = sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))
+        return items if k is None else items[:k]
+
+    def mode(self):
+        """Mode estimé du flux"""
+        if not self.counters:
+            raise ValueError("Aucune valeur")
+        return self.top_k(1)[0][0]
@@ -0,0 +1,154 @@
+"""
+Histogrammes à classes précalculées.
+
+Les bornes sont fixées une fois (nombre donné, règle 'auto' de NumPy ou
+classes logarithmiques), puis chaque bloc de valeurs est classé par calcul
+direct de l'indice de classe et compté par np.bincount. Les effectifs
+partiels de blocs ou de threads se fusionnent par simple addition, et le
+graphique ne trace que les effectifs agrégés (une marche par classe).
+"""
+import math
+import numpy as np
+
+MAX_BINS = 10000
+
+
+def bin_rule(bins):
+    """
+    Analyse une règle de classes: nombre entier, 'auto', 'log' ou 'log:N'.
+
+    :return: Tuple (logarithmique, nombre de classes ou None pour 'auto').
+    """
+    text = str(bins).strip().lower()
+    log = text == 'log' or text.startswith('log:')
+    if log:
+        text = text[4:] or 'auto'
+    if text == 'auto':
+        return log, None
+    try:
+        count = float(text)
+    except ValueError:
+        raise ValueError(f"Classes invalides: {bins}. Utilisez un nombre, auto, log ou log:N")
+    if not count.is_integer() or count <= 0:
+        raise ValueError("Le nombre de classes doit être un entier strictement positif")
+    return log, min(int(count), MAX_BINS)
+
+
+def auto_bin_count(count, low, high, q25, q75):
+    """Nombre de classes 'auto' de NumPy: min des largeurs de Sturges et Freedman-Diaconis"""
+    if high == low:
+        return 1
+    width = (high - low) / (math.log2(count) + 1)
+    fd_width = 2 * (q75 - q25) * count ** (-1 / 3)
+    if fd_width > 0:
+        width = min(width, fd_width)
+    return min(MAX_BINS, max(1, int(math.ceil((high - low) / width))))
+
+
+class Histogram:
+    """
+    Effectifs sur des classes régulières (ou régulières en échelle
+    logarithmique) de [low, high]; la dernière classe inclut high, les
+    valeurs hors bornes et NaN sont ignorées (comme np.histogram).
+    """
+
+    def __init__(self, low, high, bins, log=False):
+        if bins <= 0:
+            raise ValueError("Le nombre de classes doit être un entier strictement positif")
+        if log and low <= 0:
+            raise ValueError("Classes logarithmiques: les valeurs doivent être strictement positives")
+        if low == high:
+            low, high = (low / 2, low * 2) if log else (low - 0.5, high + 0.5)
+        self.log = log
+        self.bins = int(bins)
+        if log:
+            self.edges = np.logspace(math.log10(low), math.log10(high), self.bins + 1)
+            self.edges[[0, -1]] = low, high
+            self._low, self._high = math.log10(low), math.log10(high)
+        else:
+            self.edges = np.linspace(low, high, self.bins + 1)
+            self._low, self._high = float(low), float(high)
+        self._scale = self.bins / (self._high - self._low)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    @classmethod
+    def for_values(cls, bins, low, high, count=None, quartiles=None):
+        """
+        Histogramme vide dont les classes suivent la règle bins.
+
+        :param count: Nombre de valeurs, nécessaire pour 'auto'.
+        :param quartiles: (q25, q75) des valeurs, nécessaires pour 'auto'.
+        """
+        log, number = bin_rule(bins)
+        if log and low <= 0:
+            raise ValueError("Classes logarithmiques: les valeurs doivent être strictement positives")
+        if number is None:
+            if log:
+                # Règle appliquée aux log10 des valeurs (quartiles conservés par le logarithme)
+                number = auto_bin_count(count, math.log10(low), math.log10(high),
+                                        *np.log10(quartiles))
+            else:
+                number = auto_bin_count(count, low, high, *quartiles)
+        return cls(low, high, number, log)
+
+    def indices(self, values):
+        """Indices de classe des valeurs comprises dans les bornes"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[(values >= self.edges[0]) & (values <= self.edges[-1])]
+        positions = np.log10(values) if self.log else values
+        index = ((positions - self._low) * self._scale).astype(np.intp)
+        np.minimum(index, self.bins - 1, out=index)
+        # Corrige les arrondis au voisinage des bornes de classe (comme np.histogram)
+        index -= values < self.edges[index]
+        index += (values >= self.edges[index + 1]) & (index != self.bins - 1)
+        return index
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs; retourne self"""
+        self.counts += np.bincount(self.indices(values), minlength=self.bins)
+        return self
+
+    def merge(self, other):
+        """Fusionne les effectifs partiels other (mêmes classes) dans cet histogramme"""
+        if self.log != other.log or not np.array_equal(self.edges, other.edges):
+            raise ValueError("Impossible de fusionner des histogrammes aux classes différentes")
+        self.counts += other.counts
+        return self
+
+    def empty(self):
+        """Histogramme vide aux mêmes classes (ex: effectifs partiels d'un bloc)"""
+        histogram = Histogram.__new__(Histogram)
+        histogram.__dict__.update(self.__dict__)
+        histogram.counts = np.zeros_like(self.counts)
+        return histogram
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def draw(self, ax):
+        """Trace les effectifs agrégés sur ax"""
+        draw_histogram(ax, self.counts, self.edges, self.log)
+
+
+def draw_histogram(ax, counts, edges, log=False):
+    """Trace des effectifs précalculés: une marche pleine par classe"""
+    ax.stairs(counts, edges, fill=True)
+    if log:
+        ax.set_xscale('log')
+
+
+def histogram_of(values, bins='auto'):
+    """
+    Histogramme d'un tableau en mémoire.
+
+    :param bins: Nombre de classes, 'auto', 'log' ou 'log:N'.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    if values.size == 0:
+        raise ValueError("Aucune valeur")
+    low, high = float(values.min()), float(values.max())
+    if not (np.isfinite(low) and np.isfinite(high)):
+        raise ValueError("Les valeurs doivent être finies")
+    quartiles = np.percentile(values, [25, 75]) if bin_rule(bins)[1] is None else None
+    return Histogram.for_values(bins, low, high, values.size, quartiles).update(values)
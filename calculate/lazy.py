@@ -0,0 +1,37 @@
+"""
+Chargement paresseux des dépendances lourdes (matplotlib, scipy).
+
+Le module réel n'est importé qu'au premier accès à l'un de ses attributs: un
+processus qui n'utilise que addition ou mean ne paie jamais leur import.
+"""
+import importlib
+
+
+class LazyModule:
+    """Mandataire d'un module importé au premier accès à un attribut"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        """Indique si le module réel a déjà été importé"""
+        return self._module is not None
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "chargé" if self.loaded else "non chargé"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """Retourne un mandataire du module name, importé au premier usage"""
+    return LazyModule(name)
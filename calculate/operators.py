@@ -1,10 +1,48 @@
-import math
 import re
+from functools import partial
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-from scipy import stats
+from calculate.lazy import lazy_import
+from calculate.expression import ExpressionCache, evaluate_constant, normalize_expression
+from calculate.parser import parse_command, command_name, parse_numbers, parse_number
+from calculate.evaluator import compile_formula
+from calculate import scalar
+from calculate import batch
+from calculate.streaming import (stream_stats, stream_histogram, iter_chunks, RunningStats,
+                                 RunningRegression, DEFAULT_CHUNK_SIZE)
+from calculate.datasource import CsvColumn, iter_aligned
+from calculate.chunked import (parallel_stats, parallel_percentile, stream_percentile, parallel_histogram,
+                              PARALLEL_THRESHOLD)
+from calculate.histogram import histogram_of, draw_histogram, bin_rule
+from calculate.sketch import QuantileSketch
+from calculate import frequency
+from calculate.regression import least_squares, simple_regression
+from calculate.correlation import correlation_matrix
+
+from calculate.cache import LRUCache, RenderCache
+from calculate.figures import FigurePool
+from calculate.render import RenderOptions, render_figure, encoding, deliver, DEFAULT_DPI
+from calculate.decimate import decimate_line, bin_points, padded_limits
+from calculate.sampling import AdaptiveSampler, adaptive_grid, view_limits, DEFAULT_BUDGET
+
+# Dépendance lourde chargée au premier usage (statistiques SciPy)
+stats = lazy_import('scipy.stats')
+
+# Statistiques appelables dans une formule: evaluate('mean(1,2,3)*2')
+FORMULA_STATISTICS = ('mean', 'median', 'mode', 'std', 'var')
+
+# Fichier écrit par chaque graphique lorsqu'aucune sortie n'est précisée
+VISUALIZATION_FILES = {
+    'plot': 'function_plot.png',
+    'scatter': 'scatter_plot.png',
+    'histogram': 'histogram.png',
+    'polar': 'polar_plot.png',
+    '3d': '3d_plot.png',
+    'boxplot': 'boxplot.png',
+    'qqplot': 'qqplot.png',
+    'heatmap': 'heatmap.png',
+    'pie': 'pie_chart.png',
+    'bar': 'bar_chart.png'
+}
 
 class Operators:
     def __init__(self):
@@ -30,7 +68,9 @@ class Operators:
             'var': self.variance,
             'percentile': self.percentile,
             'correlation': self.correlation,
-            'regression': self.linear_regression
+            'regression': self.linear_regression,
+            'describe': self.describe,
+            'corrmatrix': self.correlation_matrix
         }
         self.visualization_functions = {
             'plot': self.plot_function,
@@ -44,127 +84,333 @@ class Operators:
             'pie': self.pie_chart,
             'bar': self.bar_chart
         }
+        # Fonctions à nombre variable d'arguments des formules, calculées par self.operators
+        self.formula_functions = {name: partial(self._formula_statistic, name)
+                                  for name in FORMULA_STATISTICS}
+        self.expression_cache = ExpressionCache(maxsize=256)
+        self.formula_cache = LRUCache(maxsize=256)
+        # Échantillonneurs adaptatifs par (expression, variable): un zoom réutilise leurs évaluations
+        self.samplers = LRUCache(maxsize=64)
+        self.figure_pool = FigurePool()
+        # Images déjà rendues, par empreinte de la requête (None pour désactiver)
+        self.render_cache = RenderCache()
+        # Courbes réduites à la largeur de l'axe en pixels ('minmax' ou 'lttb') dès
+        # qu'elles dépassent 4 points par colonne de pixels: avec le budget par défaut
+        # de plot_points points, seules les courbes d'un budget relevé sont réduites;
+        # nuages de plus de scatter_binning_threshold points regroupés par pixel
+        self.line_decimation = 'minmax'
+        self.plot_points = DEFAULT_BUDGET
+        self.scatter_binning_threshold = 100000
+        # None: percentile et median exacts; sinon erreur de rang du sketch KLL utilisé
+        self.quantile_error = None
+        # Au-delà de ce nombre de valeurs, mean/var/std/median/percentile sont
+        # réduits par blocs dans self.threads threads (None: tous les cœurs)
+        self.parallel_threshold = PARALLEL_THRESHOLD
+        self.threads = None
 
     def addition(self, operation):
         """Addition de deux nombres"""
         a, b = self._parse_operation(operation, '+')
-        return a + b
+        return scalar.addition(a, b)
 
     def substraction(self, operation):
         """Soustraction de deux nombres"""
         a, b = self._parse_operation(operation, '-')
-        return a - b
+        return scalar.substraction(a, b)
 
     def multiplication(self, operation):
         """Multiplication de deux nombres"""
         a, b = self._parse_operation(operation, '*')
-        return a * b
+        return scalar.multiplication(a, b)
 
     def division(self, operation):
         """Division de deux nombres"""
         a, b = self._parse_operation(operation, '/')
-        if b == 0:
-            raise ValueError("Division par zéro impossible")
-        return a / b
+        return scalar.division(a, b)
 
     def power(self, operation):
         """Calcul de la puissance"""
         a, b = self._parse_operation(operation, '^')
-        return math.pow(a, b)
+        return scalar.power(a, b)
 
     def square_root(self, operation):
         """Calcul de la racine carrée"""
         a = self._parse_single_number(operation, 'sqrt')
-        if a < 0:
-            raise ValueError("Impossible de calculer la racine carrée d'un nombre négatif")
-        return math.sqrt(a)
+        return scalar.square_root(a)
 
     def logarithm(self, operation):
         """Calcul du logarithme naturel"""
         a = self._parse_single_number(operation, 'log')
-        if a <= 0:
-            raise ValueError("Le logarithme n'est défini que pour les nombres strictement positifs")
-        return math.log(a)
+        return scalar.logarithm(a)
 
     def modulo(self, operation):
         """Calcul du modulo"""
         a, b = self._parse_operation(operation, '%')
-        if b == 0:
-            raise ValueError("Division par zéro impossible")
-        return a % b
+        return scalar.modulo(a, b)
 
     def sine(self, operation):
         """Calcul du sinus (en radians)"""
         a = self._parse_single_number(operation, 'sin')
-        return math.sin(a)
+        return scalar.sine(a)
 
     def cosine(self, operation):
         """Calcul du cosinus (en radians)"""
         a = self._parse_single_number(operation, 'cos')
-        return math.cos(a)
+        return scalar.cosine(a)
 
     def tangent(self, operation):
         """Calcul de la tangente (en radians)"""
         a = self._parse_single_number(operation, 'tan')
-        return math.tan(a)
+        return scalar.tangent(a)
 
     def factorial(self, operation):
         """Calcul de la factorielle"""
         a = self._parse_single_number(operation, '!')
-        if not a.is_integer() or a < 0:
-            raise ValueError("La factorielle n'est définie que pour les entiers positifs")
-        return math.factorial(int(a))
+        return scalar.factorial(a)
 
     def absolute(self, operation):
         """Calcul de la valeur absolue"""
         a = self._parse_single_number(operation, 'abs')
-        return abs(a)
+        return scalar.absolute(a)
 
     def exponential(self, operation):
         """Calcul de l'exponentielle"""
         a = self._parse_single_number(operation, 'exp')
-        return math.exp(a)
+        return scalar.exponential(a)
 
     def mean(self, operation):
         """Calcule la moyenne d'une série de nombres"""
-        values = self._parse_list(operation, 'mean')
-        return np.mean(values)
+        values = self._parse_source(operation, 'mean')
+        if isinstance(values, CsvColumn):
+            summary = RunningStats.from_chunks(values.chunks())
+            if summary.count == 0:
+                raise ValueError("Aucune valeur")
+            return summary.mean
+        if self._is_large(values):
+            return parallel_stats(values, self.threads).mean
+        return np.mean(values, dtype=float)
 
     def median(self, operation):
         """Calcule la médiane d'une série de nombres"""
-        values = self._parse_list(operation, 'median')
+        values = self._parse_source(operation, 'median')
+        if self.quantile_error is not None:
+            if isinstance(values, CsvColumn):
+                return self._stream_sketch(values).median()
+            return self._quantile_sketch(values).median()
+        if isinstance(values, CsvColumn):
+            return stream_percentile(values.chunks, 50)
+        if self._is_large(values):
+            return parallel_percentile(values, 50, self.threads)
         return np.median(values)
 
     def mode(self, operation):
-        """Calcule le mode d'une série de nombres"""
-        values = self._parse_list(operation, 'mode')
-        return stats.mode(values)[0][0]
+        """
+        Calcule le mode d'une série de nombres.
+        Avec mode(valeurs;k), retourne les k valeurs les plus fréquentes sous
+        forme de liste de (valeur, effectif).
+        Exemple: mode(1,2,2,3,3,3) ou mode(1,2,2,3,3,3;2)
+        """
+        try:
+            command = parse_command(operation, 'mode')
+            if len(command) > 2:
+                raise ValueError("Format invalide. Utilisez: mode(valeurs;k)")
+            values = command.numbers(0)
+            k = command.number(1) if len(command) == 2 else None
+            if k is not None and (not k.is_integer() or k < 1):
+                raise ValueError("k doit être un entier strictement positif")
+        except ValueError as e:
+            raise ValueError(f"Format de liste invalide: {str(e)}")
+        if k is None:
+            return frequency.mode(values)
+        return frequency.top_k(values, int(k))
+
+    def stream_mode(self, source, k=100, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Valeurs fréquentes d'un flux non borné en mémoire O(k) (Misra-Gries).
+        Retourne le résumé: summary.mode(), summary.top_k(10), summary.error.
+        """
+        summary = frequency.MisraGries(k)
+        for chunk in iter_chunks(source, chunk_size):
+            summary.update(chunk)
+        return summary
 
     def standard_deviation(self, operation):
         """Calcule l'écart-type d'une série de nombres"""
-        values = self._parse_list(operation, 'std')
+        values = self._parse_source(operation, 'std')
+        if isinstance(values, CsvColumn):
+            return RunningStats.from_chunks(values.chunks()).std
+        if self._is_large(values):
+            return parallel_stats(values, self.threads).std
         return np.std(values)
 
     def variance(self, operation):
         """Calcule la variance d'une série de nombres"""
-        values = self._parse_list(operation, 'var')
+        values = self._parse_source(operation, 'var')
+        if isinstance(values, CsvColumn):
+            return RunningStats.from_chunks(values.chunks()).variance
+        if self._is_large(values):
+            return parallel_stats(values, self.threads).variance
         return np.var(values)
 
+    def describe(self, operation):
+        """
+        Calcule toutes les statistiques descriptives en une seule analyse de la
+        liste et un seul tri.
+        Format: describe(valeurs) ou describe(valeurs;percentile1,percentile2,...)
+        Exemple: describe(1,2,2,3,4;90)
+        """
+        try:
+            command = parse_command(operation, 'describe')
+            if len(command) > 2:
+                raise ValueError("Format invalide. Utilisez: describe(valeurs;percentiles)")
+            values = command.numbers(0)
+            percentiles = command.numbers(1) if len(command) == 2 else np.array([25.0, 75.0])
+        except ValueError as e:
+            raise ValueError(f"Format invalide: {str(e)}")
+        if np.any((percentiles < 0) | (percentiles > 100)):
+            raise ValueError("Le percentile doit être entre 0 et 100")
+
+        ordered = np.sort(values)
+        n = ordered.size
+        mean = ordered.mean()
+        variance = np.square(ordered - mean).mean()
+
+        # Percentiles par interpolation linéaire sur le tableau trié (comme np.percentile)
+        positions = np.concatenate(([50.0], percentiles)) / 100 * (n - 1)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, n - 1)
+        quantiles = ordered[lower] + (ordered[upper] - ordered[lower]) * (positions - lower)
+
+        # Mode: plus longue suite de valeurs égales (la plus petite en cas d'égalité)
+        starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+        run_lengths = np.diff(np.append(starts, n))
+        mode = ordered[starts[np.argmax(run_lengths)]]
+
+        return {
+            'count': n,
+            'mean': mean,
+            'median': quantiles[0],
+            'mode': mode,
+            'std': np.sqrt(variance),
+            'variance': variance,
+            'min': ordered[0],
+            'max': ordered[-1],
+            'percentiles': {float(p): q for p, q in zip(percentiles, quantiles[1:])}
+        }
+
+    def stream_statistics(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Moyenne, variance et écart-type d'un flux de valeurs en un seul passage
+        et en mémoire constante (générateur, fichier, socket, tableau).
+        Retourne count, mean, m2, min, max, variance et std.
+        """
+        return stream_stats(source, chunk_size).result()
+
     def percentile(self, operation):
-        """Calcule le percentile d'une série de nombres"""
+        """
+        Calcule le ou les percentiles d'une série de nombres.
+        Exemple: percentile(1,2,3,4,5;75) ou percentile(1,2,3,4,5;50,90,99)
+        """
         parts = self._parse_operation_with_percentile(operation, 'percentile')
         values = parts[0]
         p = parts[1]
+        if self.quantile_error is not None:
+            if isinstance(values, CsvColumn):
+                return self._stream_sketch(values).percentiles(p)
+            return self._quantile_sketch(values).percentiles(p)
+        if isinstance(values, CsvColumn):
+            return stream_percentile(values.chunks, p)
+        if self._is_large(values):
+            return parallel_percentile(values, p, self.threads)
         return np.percentile(values, p)
 
+    def _is_large(self, values):
+        """Indique si la série justifie une réduction parallèle par blocs"""
+        return values.size >= self.parallel_threshold
+
+    def quantile_sketch(self, source, error=0.01, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Construit en un passage et en mémoire bornée un sketch de quantiles
+        (KLL) sur un flux de valeurs. Le sketch répond à plusieurs percentiles
+        (sketch.percentiles([50, 90, 99])) et se fusionne avec d'autres sketchs.
+        """
+        sketch = QuantileSketch.with_error(error)
+        for chunk in iter_chunks(source, chunk_size):
+            sketch.update(chunk)
+        return sketch
+
+    def _quantile_sketch(self, values):
+        """Sketch KLL des valeurs, à l'erreur configurée par quantile_error"""
+        return QuantileSketch.with_error(self.quantile_error).update(values)
+
+    def _stream_sketch(self, column):
+        """Sketch KLL d'une colonne CSV lue par blocs, à l'erreur configurée par quantile_error"""
+        sketch = QuantileSketch.with_error(self.quantile_error)
+        for chunk in column.chunks():
+            sketch.update(chunk)
+        return sketch
+
     def correlation(self, operation):
         """Calcule le coefficient de corrélation entre deux séries"""
         x, y = self._parse_two_lists(operation, 'correlation')
+        if isinstance(x, CsvColumn) or isinstance(y, CsvColumn):
+            return RunningRegression.from_chunks(iter_aligned([x, y])).correlation
         return np.corrcoef(x, y)[0,1]
 
+    def correlation_matrix(self, operation):
+        """
+        Calcule la matrice de corrélation de plusieurs séries en un seul calcul.
+        Format: corrmatrix(serie1;serie2;...) ou corrmatrix(serie1;serie2;...;method=spearman)
+        Exemple: corrmatrix(1,2,3;4,5,7;3,2,1)
+        """
+        try:
+            command = parse_command(operation, 'corrmatrix')
+            positional, options = command.options()
+            unknown = set(options) - {'method'}
+            if unknown:
+                raise ValueError(f"Option inconnue: {', '.join(sorted(unknown))}")
+            series = [command.numbers(i) for i in positional]
+            method = options.get('method', 'pearson').strip()
+        except ValueError as e:
+            raise ValueError(f"Format de liste invalide: {str(e)}")
+        return correlation_matrix(series, method)
+
     def linear_regression(self, operation):
-        """Effectue une régression linéaire sur deux séries de données"""
-        x, y = self._parse_two_lists(operation, 'regression')
+        """
+        Effectue une régression linéaire par moindres carrés.
+        Format simple: regression(x;y)
+        Régression multiple: regression(x1;x2;...;y), la dernière série étant la réponse
+        Options: ;weights=w1,w2,... (poids des observations) et ;ridge=valeur
+        Avec un seul prédicteur, le résultat garde slope et p_value, options ou non.
+        Exemple: regression(1,2,3,4;2,1,4,3;5,6,8,9;weights=1,1,2,2)
+        """
+        try:
+            command = parse_command(operation, 'regression')
+            positional, options = command.options()
+            unknown = set(options) - {'weights', 'ridge'}
+            if unknown:
+                raise ValueError(f"Option inconnue: {', '.join(sorted(unknown))}")
+            if len(positional) < 2:
+                raise ValueError("Format invalide. Utilisez: regression(liste1;liste2)")
+            columns = [command.source(i) for i in positional]
+            # Régression simple sur des colonnes CSV: un seul passage par blocs
+            streamed = (len(columns) == 2 and not options
+                        and any(isinstance(c, CsvColumn) for c in columns))
+            if not streamed:
+                columns = [c.to_array() if isinstance(c, CsvColumn) else c for c in columns]
+                if len({len(column) for column in columns}) != 1:
+                    raise ValueError("Toutes les séries doivent avoir la même longueur")
+            weights = parse_numbers(options['weights']) if 'weights' in options else None
+            ridge = parse_number(options['ridge']) if 'ridge' in options else 0.0
+        except ValueError as e:
+            raise ValueError(f"Format de liste invalide: {str(e)}")
+        if streamed:
+            return RunningRegression.from_chunks(iter_aligned(columns)).result()
+        if len(columns) > 2:
+            return least_squares(columns[:-1], columns[-1], weights, ridge)
+        x, y = columns
+        if options:
+            return simple_regression(x, y, weights, ridge)
         slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
         return {
             'slope': slope,
@@ -173,6 +419,17 @@ class Operators:
             'p_value': p_value
         }
 
+    def stream_regression(self, pairs):
+        """
+        Régression linéaire et corrélation sur un flux de blocs (x, y), en un
+        seul passage et en mémoire constante. Retourne slope, intercept,
+        r_squared, p_value et correlation.
+        """
+        regression = RunningRegression.from_chunks(pairs)
+        result = regression.result()
+        result['correlation'] = regression.correlation
+        return result
+
     def _parse_operation(self, operation, operator):
         """Parse une opération binaire"""
         try:
@@ -194,27 +451,58 @@ class Operators:
             raise ValueError(f"Format de nombre invalide: {str(e)}")
 
     def evaluate(self, operation):
-        """Évalue une expression mathématique"""
-        # Nettoie l'opération
-        operation = operation.strip()
-        
-        # Vérifie si c'est une opération unaire
-        for op in ['sqrt', 'log', 'sin', 'cos', 'tan', 'abs', 'exp']:
-            if operation.startswith(op):
-                return self.operators[op](operation)
-        
-        # Vérifie si c'est une factorielle
-        if operation.endswith('!'):
-            return self.factorial(operation)
-        
-        # Pour les opérations binaires
-        for op in ['+', '-', '*', '/', '^', '%']:
-            if op in operation:
-                return self.operators[op](operation)
-        
-        raise ValueError("Opération non reconnue")
+        """
+        Évalue une expression mathématique complète.
+        Exemple: evaluate('sqrt(2)+1*3^2'), evaluate('mean(1,2,3)*2')
+
+        La formule est compilée une seule fois puis conservée en cache.
+        """
+        return self.compile(operation)()
+
+    def execute(self, operation):
+        """
+        Exécute une commande quelconque: appel nommé (mean(...), plot(...), ...)
+        ou formule évaluée par evaluate().
+        """
+        name = command_name(operation)
+        if name in self.operators:
+            return self.operators[name](operation.strip())
+        if name in self.visualization_functions:
+            return self.visualization_functions[name](operation.strip())
+        return self.evaluate(operation)
+
+    def evaluate_many(self, operations):
+        """Évalue une série de formules, chacune analysée une seule fois"""
+        return [self.evaluate(operation) for operation in operations]
+
+    def compile(self, operation):
+        """Retourne la formule compilée (réutilisable) correspondant à operation"""
+        text = operation.strip()
+        if not text:
+            raise ValueError("Opération non reconnue")
+        return self.formula_cache.get_or_create(text, lambda: compile_formula(text, self.formula_functions))
+
+    def _formula_statistic(self, name, *values):
+        """Statistique d'une formule: passe par la commande name de self.operators"""
+        return self.operators[name](f"{name}({','.join(repr(float(value)) for value in values)})")
+
+    def batch(self, operator, *operands):
+        """
+        Applique un opérateur scalaire sur des tableaux d'opérandes en un seul
+        appel vectorisé.
+        Exemple: batch('sqrt', np.array([4, -1, 9]))
+                 -> {'values': [2, nan, 3], 'errors': [False, True, False]}
+        """
+        return batch.batch(operator, *operands)
 
-    def plot_function(self, operation):
+    def batch_operations(self, operations):
+        """
+        Évalue une liste d'opérations ('2 + 3', 'sqrt(4)', '5!', ...) regroupées
+        par opérateur, avec un masque d'erreurs par élément.
+        """
+        return batch.batch_operations(operations)
+
+    def plot_function(self, operation, output=None):
         """
         Trace le graphe d'une fonction mathématique.
         Format: plot(f(x), x_min, x_max)
@@ -222,363 +510,389 @@ class Operators:
         """
         try:
             # Parse l'expression de la fonction et les limites
-            parts = operation.replace('plot(', '').replace(')', '').split(',')
+            parts = parse_command(operation, 'plot').arguments()
             if len(parts) != 3:
                 raise ValueError("Format invalide. Utilisez: plot(f(x), x_min, x_max)")
             
-            expr = parts[0].strip()
-            x_min = float(parts[1].strip())
-            x_max = float(parts[2].strip())
-            
-            # Créer les points x
-            x = np.linspace(x_min, x_max, 1000)
-            
-            # Évaluer la fonction pour chaque point x
-            y = []
-            for x_val in x:
-                # Remplacer x par la valeur actuelle dans l'expression
-                expr_eval = expr.replace('x', str(x_val))
-                try:
-                    y_val = eval(expr_eval)
-                    y.append(y_val)
-                except:
-                    y.append(np.nan)
-            
-            # Créer le graphique
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.plot(x, y)
-            ax.grid(True)
-            ax.set_title(f'Graphe de {expr}')
-            ax.set_xlabel('x')
-            ax.set_ylabel('f(x)')
-            
-            # Sauvegarder le graphique
-            fig.savefig('function_plot.png')
-            return "Graphique sauvegardé dans 'function_plot.png'"
+            # Forme normalisée: même titre et même clé de cache pour 'x ^ 2' et 'x**2'
+            expr = normalize_expression(parts[0])
+            x_min = evaluate_constant(parts[1])
+            x_max = evaluate_constant(parts[2])
+            
+            # Points concentrés là où la courbe s'écarte de ses cordes
+            sampler = self._sampler(expr, 'x')
+            x, y = sampler.sample(x_min, x_max)
+            asymptotes = sampler.asymptotes
+            
+            def draw(fig, ax):
+                ax.plot(*decimate_line(x, y, ax.bbox.width, self.line_decimation))
+                if asymptotes:
+                    # Les valeurs proches des asymptotes écraseraient le reste de la courbe
+                    ax.set_ylim(padded_limits(view_limits(x, y), ax.margins()[1]))
+                ax.grid(True)
+                ax.set_title(f'Graphe de {expr}')
+                ax.set_xlabel('x')
+                ax.set_ylabel('f(x)')
+            
+            key = ('plot', expr, x_min, x_max, self.line_decimation, self.plot_points)
+            return self._render(VISUALIZATION_FILES['plot'], draw, output=output, key=key)
             
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def scatter_plot(self, operation):
+    def scatter_plot(self, operation, output=None):
         """
         Crée un nuage de points.
         Format: scatter(x1,y1,x2,y2,...)
         """
         try:
             # Parse les coordonnées
-            coords = operation.replace('scatter(', '').replace(')', '').split(',')
+            coords = parse_command(operation, 'scatter').numbers().ravel()
             if len(coords) % 2 != 0:
                 raise ValueError("Nombre impair de coordonnées")
             
-            x = [float(coords[i]) for i in range(0, len(coords), 2)]
-            y = [float(coords[i+1]) for i in range(0, len(coords), 2)]
-            
-            # Créer le graphique
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.scatter(x, y)
-            ax.grid(True)
-            ax.set_title('Nuage de points')
-            ax.set_xlabel('x')
-            ax.set_ylabel('y')
-            
-            fig.savefig('scatter_plot.png')
-            return "Graphique sauvegardé dans 'scatter_plot.png'"
+            x = coords[0::2]
+            y = coords[1::2]
+            
+            def draw(fig, ax):
+                if x.size > self.scatter_binning_threshold:
+                    # Un point par demi-pixel occupé, limites fixées comme l'autoscale
+                    xlim = padded_limits(x, ax.margins()[0])
+                    ylim = padded_limits(y, ax.margins()[1])
+                    grid = (2 * ax.bbox.width, 2 * ax.bbox.height)
+                    bx, by, _ = bin_points(x, y, xlim, ylim, grid)
+                    ax.scatter(bx, by)
+                    ax.set_xlim(xlim)
+                    ax.set_ylim(ylim)
+                else:
+                    ax.scatter(x, y)
+                ax.grid(True)
+                ax.set_title('Nuage de points')
+                ax.set_xlabel('x')
+                ax.set_ylabel('y')
+            
+            key = ('scatter', coords, self.scatter_binning_threshold)
+            return self._render(VISUALIZATION_FILES['scatter'], draw, output=output, key=key)
             
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def histogram(self, operation):
+    def histogram(self, operation, output=None):
         """
         Crée un histogramme.
-        Format: histogram(valeur1,valeur2,...)
+        Format: histogram(valeur1,valeur2,...) ou histogram(valeurs;bins=20|auto|log|log:N)
         """
         try:
-            # Parse les valeurs
-            values = [float(x.strip()) for x in operation.replace('histogram(', '').replace(')', '').split(',')]
-            
-            # Créer le graphique
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.hist(values, bins='auto')
-            ax.grid(True)
-            ax.set_title('Histogramme')
-            ax.set_xlabel('Valeurs')
-            ax.set_ylabel('Fréquence')
-            
-            fig.savefig('histogram.png')
-            return "Graphique sauvegardé dans 'histogram.png'"
+            # Parse les valeurs et la règle de classes
+            command = parse_command(operation, 'histogram')
+            positional, options = command.options()
+            unknown = set(options) - {'bins'}
+            if unknown:
+                raise ValueError(f"Option inconnue: {', '.join(sorted(unknown))}")
+            if len(positional) != 1:
+                raise ValueError("Format invalide. Utilisez: histogram(valeurs;bins=...)")
+            values = command.source(positional[0])
+            bins = options.get('bins', 'auto').strip().lower()
+            log = bin_rule(bins)[0]
+            
+            # Effectifs agrégés une seule fois; seules les classes sont tracées
+            if isinstance(values, CsvColumn):
+                counts, edges = stream_histogram(values.chunks, bins)
+            else:
+                aggregated = (parallel_histogram(values, bins, self.threads) if self._is_large(values)
+                              else histogram_of(values, bins))
+                counts, edges = aggregated.counts, aggregated.edges
+            
+            def draw(fig, ax):
+                draw_histogram(ax, counts, edges, log)
+                ax.grid(True)
+                ax.set_title('Histogramme')
+                ax.set_xlabel('Valeurs')
+                ax.set_ylabel('Fréquence')
+            
+            key = None if isinstance(values, CsvColumn) else ('histogram', values, bins)
+            return self._render(VISUALIZATION_FILES['histogram'], draw, output=output, key=key)
             
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def polar_plot(self, operation):
+    def polar_plot(self, operation, output=None):
         """
         Crée un graphique polaire.
         Format: polar(r(theta), theta_min, theta_max)
         """
         try:
             # Parse l'expression et les limites
-            parts = operation.replace('polar(', '').replace(')', '').split(',')
+            parts = parse_command(operation, 'polar').arguments()
             if len(parts) != 3:
                 raise ValueError("Format invalide. Utilisez: polar(r(theta), theta_min, theta_max)")
             
-            expr = parts[0].strip()
-            theta_min = float(parts[1].strip())
-            theta_max = float(parts[2].strip())
-            
-            # Créer les points theta
-            theta = np.linspace(theta_min, theta_max, 1000)
-            
-            # Évaluer la fonction pour chaque point theta
-            r = []
-            for theta_val in theta:
-                expr_eval = expr.replace('theta', str(theta_val))
-                try:
-                    r_val = eval(expr_eval)
-                    r.append(r_val)
-                except:
-                    r.append(np.nan)
+            expr = normalize_expression(parts[0])
+            theta_min = evaluate_constant(parts[1])
+            theta_max = evaluate_constant(parts[2])
             
-            # Créer le graphique
-            fig = Figure(figsize=(10, 10))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111, projection='polar')
+            # Erreur d'échantillonnage mesurée sur la courbe tracée (coordonnées cartésiennes)
+            theta, r = self._sampler(expr, 'theta').sample(
+                theta_min, theta_max, transform=lambda t, v: (v * np.cos(t), v * np.sin(t)))
             
-            ax.plot(theta, r)
-            ax.grid(True)
-            ax.set_title(f'Graphique polaire de {expr}')
+            def draw(fig, ax):
+                ax.plot(theta, r)
+                ax.grid(True)
+                ax.set_title(f'Graphique polaire de {expr}')
             
-            fig.savefig('polar_plot.png')
-            return "Graphique sauvegardé dans 'polar_plot.png'"
+            return self._render(VISUALIZATION_FILES['polar'], draw, figsize=(10, 10), projection='polar', output=output,
+                                key=('polar', expr, theta_min, theta_max, self.plot_points))
             
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def plot_3d(self, operation):
+    def plot_3d(self, operation, output=None):
         """
         Crée un graphique 3D.
         Format: 3d(z(x,y), x_min, x_max, y_min, y_max)
         """
         try:
             # Parse l'expression et les limites
-            parts = operation.replace('3d(', '').replace(')', '').split(',')
+            parts = parse_command(operation, '3d').arguments()
             if len(parts) != 5:
                 raise ValueError("Format invalide. Utilisez: 3d(z(x,y), x_min, x_max, y_min, y_max)")
             
-            expr = parts[0].strip()
-            x_min = float(parts[1].strip())
-            x_max = float(parts[2].strip())
-            y_min = float(parts[3].strip())
-            y_max = float(parts[4].strip())
+            expr = normalize_expression(parts[0])
+            x_min, x_max, y_min, y_max = (evaluate_constant(p) for p in parts[1:])
             
-            # Créer la grille
-            x = np.linspace(x_min, x_max, 100)
-            y = np.linspace(y_min, y_max, 100)
+            # Grille resserrée là où la surface varie le plus
+            f = self.expression_cache.get(expr, ('x', 'y'))
+            x, y, Z = adaptive_grid(f, (x_min, x_max), (y_min, y_max))
             X, Y = np.meshgrid(x, y)
             
-            # Évaluer la fonction
-            Z = np.zeros_like(X)
-            for i in range(len(x)):
-                for j in range(len(y)):
-                    expr_eval = expr.replace('x', str(X[i,j])).replace('y', str(Y[i,j]))
-                    try:
-                        Z[i,j] = eval(expr_eval)
-                    except:
-                        Z[i,j] = np.nan
-            
-            # Créer le graphique
-            fig = Figure(figsize=(10, 8))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111, projection='3d')
-            
-            ax.plot_surface(X, Y, Z, cmap='viridis')
-            ax.set_title(f'Surface 3D de {expr}')
-            ax.set_xlabel('x')
-            ax.set_ylabel('y')
-            ax.set_zlabel('z')
-            
-            fig.savefig('3d_plot.png')
-            return "Graphique sauvegardé dans '3d_plot.png'"
+            def draw(fig, ax):
+                # Toutes les lignes de la grille (par défaut, plot_surface en garde 50)
+                ax.plot_surface(X, Y, Z, cmap='viridis', rcount=y.size, ccount=x.size)
+                ax.set_title(f'Surface 3D de {expr}')
+                ax.set_xlabel('x')
+                ax.set_ylabel('y')
+                ax.set_zlabel('z')
+            
+            return self._render(VISUALIZATION_FILES['3d'], draw, figsize=(10, 8), projection='3d', output=output,
+                                key=('3d', expr, x_min, x_max, y_min, y_max))
             
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def boxplot(self, operation):
+    def boxplot(self, operation, output=None):
         """Crée un diagramme en boîte (boxplot)"""
         try:
             values = self._parse_list(operation, 'boxplot')
             
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.boxplot(values)
-            ax.set_title('Diagramme en boîte')
-            ax.set_ylabel('Valeurs')
+            def draw(fig, ax):
+                ax.boxplot(values)
+                ax.set_title('Diagramme en boîte')
+                ax.set_ylabel('Valeurs')
             
-            fig.savefig('boxplot.png')
-            return "Graphique sauvegardé dans 'boxplot.png'"
+            return self._render(VISUALIZATION_FILES['boxplot'], draw, output=output, key=('boxplot', values))
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def qqplot(self, operation):
+    def qqplot(self, operation, output=None):
         """Crée un graphique Q-Q (quantile-quantile)"""
         try:
             values = self._parse_list(operation, 'qqplot')
             
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
+            def draw(fig, ax):
+                stats.probplot(values, dist="norm", plot=ax)
+                ax.set_title('Graphique Q-Q')
             
-            stats.probplot(values, dist="norm", plot=ax)
-            ax.set_title('Graphique Q-Q')
-            
-            fig.savefig('qqplot.png')
-            return "Graphique sauvegardé dans 'qqplot.png'"
+            return self._render(VISUALIZATION_FILES['qqplot'], draw, output=output, key=('qqplot', values))
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def heatmap(self, operation):
-        """Crée une carte de chaleur (heatmap)"""
+    def heatmap(self, operation, output=None):
+        """
+        Crée une carte de chaleur (heatmap).
+        Accepte une matrice littérale heatmap(1,2;3,4), une matrice de
+        corrélation heatmap(corrmatrix(...)) ou directement un tableau NumPy 2D.
+        """
         try:
-            matrix = self._parse_matrix(operation, 'heatmap')
-            
-            fig = Figure(figsize=(10, 8))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            im = ax.imshow(matrix, cmap='viridis')
-            fig.colorbar(im)
-            ax.set_title('Carte de chaleur')
-            
-            fig.savefig('heatmap.png')
-            return "Graphique sauvegardé dans 'heatmap.png'"
+            if isinstance(operation, np.ndarray):
+                matrix = operation
+            else:
+                matrix = self._heatmap_matrix(operation)
+            
+            def draw(fig, ax):
+                im = ax.imshow(matrix, cmap='viridis')
+                fig.colorbar(im)
+                ax.set_title('Carte de chaleur')
+            
+            return self._render(VISUALIZATION_FILES['heatmap'], draw, figsize=(10, 8), output=output,
+                                key=('heatmap', np.asarray(matrix)))
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def pie_chart(self, operation):
+    def _heatmap_matrix(self, operation):
+        """Matrice à afficher: littérale ou résultat d'un corrmatrix(...) imbriqué"""
+        command = parse_command(operation, 'heatmap')
+        if len(command) == 1 and command_name(command.groups[0]) == 'corrmatrix':
+            return self.correlation_matrix(command.groups[0])
+        return self._parse_matrix(operation, 'heatmap')
+
+    def pie_chart(self, operation, output=None):
         """Crée un diagramme circulaire"""
         try:
             values, labels = self._parse_pie_data(operation)
             
-            fig = Figure(figsize=(10, 8))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.pie(values, labels=labels, autopct='%1.1f%%')
-            ax.set_title('Diagramme circulaire')
+            def draw(fig, ax):
+                ax.pie(values, labels=labels, autopct='%1.1f%%')
+                ax.set_title('Diagramme circulaire')
             
-            fig.savefig('pie_chart.png')
-            return "Graphique sauvegardé dans 'pie_chart.png'"
+            return self._render(VISUALIZATION_FILES['pie'], draw, figsize=(10, 8), output=output,
+                                key=('pie', values, labels))
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
-    def bar_chart(self, operation):
+    def bar_chart(self, operation, output=None):
         """Crée un diagramme en barres"""
         try:
             values, labels = self._parse_bar_data(operation)
             
-            fig = Figure(figsize=(10, 6))
-            canvas = FigureCanvasAgg(fig)
-            ax = fig.add_subplot(111)
-            
-            ax.bar(labels, values)
-            ax.set_title('Diagramme en barres')
-            plt.xticks(rotation=45)
+            def draw(fig, ax):
+                ax.bar(labels, values)
+                ax.set_title('Diagramme en barres')
+                for label in ax.get_xticklabels():
+                    label.set_rotation(45)
             
-            fig.savefig('bar_chart.png')
-            return "Graphique sauvegardé dans 'bar_chart.png'"
+            return self._render(VISUALIZATION_FILES['bar'], draw, output=output, key=('bar', values, labels))
         except Exception as e:
             raise ValueError(f"Erreur lors du tracé: {str(e)}")
 
+    def _sampler(self, expr, variable):
+        """Échantillonneur adaptatif (mémorisé) de l'expression d'une variable"""
+        key = (expr, variable)
+        sampler = self.samplers.get(key)
+        if sampler is None:
+            sampler = AdaptiveSampler(self.expression_cache.get(expr, (variable,)))
+            self.samplers.put(key, sampler)
+        sampler.budget = self.plot_points
+        return sampler
+
+    def _render(self, filename, draw, figsize=(10, 6), projection=None, output=None, key=None):
+        """
+        Trace un graphique sur une figure de la réserve et produit le résultat
+        demandé par output (voir calculate.render).
+
+        :param filename: Fichier image produit par défaut.
+        :param draw: Fonction draw(fig, ax) qui trace sur l'axe fourni.
+        :param output: None, 'bytes', 'rgba', chemin de fichier ou RenderOptions.
+        :param key: Arguments analysés identifiant le graphique; l'image encodée
+                    est alors servie par render_cache si elle y figure.
+        """
+        options = RenderOptions.from_output(output)
+        if key is not None and self.render_cache is not None and not (options and options.keeps_figure):
+            encoded = encoding(options)
+            cache_key = RenderCache.make_key(key, figsize, projection, encoded.key())
+            data = self.render_cache.get_or_render(
+                cache_key, lambda: self._render(filename, draw, figsize, projection, encoded))
+            return deliver(data, options, filename)
+        fig, ax = self.figure_pool.acquire(figsize, projection)
+        try:
+            # Résolution finale fixée avant le tracé: la décimation en dépend
+            fig.set_dpi(options.dpi if options is not None else DEFAULT_DPI)
+            draw(fig, ax)
+            return render_figure(fig, options, filename)
+        finally:
+            # Un memoryview RGBA référence le tampon de la figure: elle n'est pas réutilisée
+            if options is None or not options.keeps_figure:
+                self.figure_pool.release(fig, figsize, projection)
+
     def _parse_list(self, operation, operator):
         """Parse une liste de nombres"""
         try:
-            values_str = operation.replace(f'{operator}(', '').replace(')', '')
-            return [float(x.strip()) for x in values_str.split(',')]
+            return parse_command(operation, operator).numbers()
+        except ValueError as e:
+            raise ValueError(f"Format de liste invalide: {str(e)}")
+
+    def _parse_source(self, operation, operator):
+        """Parse une liste de nombres ou une colonne CSV (CsvColumn)"""
+        try:
+            return parse_command(operation, operator).source()
         except ValueError as e:
             raise ValueError(f"Format de liste invalide: {str(e)}")
 
     def _parse_two_lists(self, operation, operator):
-        """Parse deux listes de nombres"""
+        """Parse deux listes de nombres ou colonnes CSV"""
         try:
-            parts = operation.replace(f'{operator}(', '').replace(')', '').split(';')
-            if len(parts) != 2:
+            command = parse_command(operation, operator)
+            if len(command) != 2:
                 raise ValueError("Format invalide. Utilisez: operator(liste1;liste2)")
-            return self._parse_list(parts[0], ''), self._parse_list(parts[1], '')
+            return command.source(0), command.source(1)
         except ValueError as e:
             raise ValueError(f"Format de liste invalide: {str(e)}")
 
     def _parse_matrix(self, operation, operator):
         """Parse une matrice de nombres"""
         try:
-            matrix_str = operation.replace(f'{operator}(', '').replace(')', '')
-            rows = matrix_str.split(';')
-            return np.array([self._parse_list(row, '') for row in rows])
+            command = parse_command(operation, operator)
+            rows = [command.numbers(i) for i in range(len(command))]
+            if len(rows) == 1 and rows[0].ndim == 2:
+                # Matrice complète issue d'un fichier @matrice.npy
+                return rows[0]
+            if len({len(row) for row in rows}) != 1:
+                raise ValueError("Toutes les lignes doivent avoir la même longueur")
+            return np.array(rows)
         except ValueError as e:
             raise ValueError(f"Format de matrice invalide: {str(e)}")
 
+    def _parse_labeled_values(self, operation, operator):
+        """Parse des valeurs associées à des labels: operator(valeurs;labels)"""
+        command = parse_command(operation, operator)
+        if len(command) != 2:
+            raise ValueError(f"Format invalide. Utilisez: {operator}(valeurs;labels)")
+        values = command.numbers(0)
+        labels = command.labels(1)
+        if len(values) != len(labels):
+            raise ValueError("Le nombre de valeurs doit correspondre au nombre de labels")
+        return values, labels
+
     def _parse_pie_data(self, operation):
         """Parse les données pour un diagramme circulaire"""
         try:
-            data_str = operation.replace('pie(', '').replace(')', '')
-            parts = data_str.split(';')
-            if len(parts) != 2:
-                raise ValueError("Format invalide. Utilisez: pie(valeurs;labels)")
-            values = self._parse_list(parts[0], '')
-            labels = [x.strip() for x in parts[1].split(',')]
-            if len(values) != len(labels):
-                raise ValueError("Le nombre de valeurs doit correspondre au nombre de labels")
-            return values, labels
+            return self._parse_labeled_values(operation, 'pie')
         except ValueError as e:
             raise ValueError(f"Format de données invalide: {str(e)}")
 
     def _parse_bar_data(self, operation):
         """Parse les données pour un diagramme en barres"""
         try:
-            data_str = operation.replace('bar(', '').replace(')', '')
-            parts = data_str.split(';')
-            if len(parts) != 2:
-                raise ValueError("Format invalide. Utilisez: bar(valeurs;labels)")
-            values = self._parse_list(parts[0], '')
-            labels = [x.strip() for x in parts[1].split(',')]
-            if len(values) != len(labels):
-                raise ValueError("Le nombre de valeurs doit correspondre au nombre de labels")
-            return values, labels
+            return self._parse_labeled_values(operation, 'bar')
         except ValueError as e:
             raise ValueError(f"Format de données invalide: {str(e)}")
 
     def _parse_operation_with_percentile(self, operation, operator):
         """Parse une opération avec un percentile"""
         try:
-            parts = operation.replace(f'{operator}(', '').replace(')', '').split(';')
-            if len(parts) != 2:
+            command = parse_command(operation, operator)
+            if len(command) != 2:
                 raise ValueError("Format invalide. Utilisez: operator(valeurs;percentile)")
-            values = self._parse_list(parts[0], '')
-            p = float(parts[1].strip())
-            if not 0 <= p <= 100:
+            values = command.source(0)
+            p = command.numbers(1)
+            if np.any((p < 0) | (p > 100)):
                 raise ValueError("Le percentile doit être entre 0 et 100")
-            return values, p
+            return values, (float(p[0]) if p.size == 1 else p)
         except ValueError as e:
             raise ValueError(f"Format invalide: {str(e)}")
 
-    def visualize(self, operation):
+    def visualize(self, operation, output=None):
         """
-        Méthode principale pour la visualisation qui détermine le type de graphique à créer
+        Méthode principale pour la visualisation qui détermine le type de graphique à créer.
+        output choisit le résultat: None (fichier au nom fixe), 'bytes' (image
+        encodée), 'rgba' (memoryview du tampon Agg), un chemin, ou RenderOptions
+        pour préciser le format et la résolution.
+        Exemple: visualize('bar(1,2;A,B)', RenderOptions('bytes', format='svg'))
         """
         operation = operation.strip()
         
         # Déterminer le type de visualisation
         for viz_type, func in self.visualization_functions.items():
             if operation.startswith(viz_type):
-                return func(operation)
+                return func(operation, output)
         
         raise ValueError("Type de visualisation non reconnu") 
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Exécution parallèle des commandes du mode batch sur plusieurs processus.
+
+Chaque processus du pool construit une seule fois son Controller (et donc son
+Operators, ses caches et, au premier graphique, matplotlib), puis exécute des
+lots de commandes consécutives. Les lots sont soumis au fil de la lecture,
+au plus WINDOW_FACTOR lots par processus en cours, et les résultats sont
+restitués dans l'ordre des commandes; une erreur n'affecte que sa commande.
+
+Les graphiques d'un même type écrivent le même fichier: les processus les
+rendent en mémoire, en parallèle, et seule l'écriture du fichier est faite
+par le processus principal, dans l'ordre des commandes, pour que le fichier
+final soit celui du dernier, comme en exécution séquentielle.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from calculate.controller import Controller, execute_record
+from calculate.operators import VISUALIZATION_FILES
+from calculate.parser import command_name
+from calculate.render import deliver
+from calculate.view import View
+
+TASK_SIZE = 16
+WINDOW_FACTOR = 4
+
+_controller = None
+
+
+def _init_worker(plugins):
+    """Initialise le processus: un Controller conservé entre les lots"""
+    global _controller
+    _controller = Controller(plugins)
+
+
+def _execute(operation, serialized):
+    """Exécute une commande; un graphique sérialisé est rendu en mémoire (clé 'image')"""
+    name = command_name(operation)
+    if name not in serialized:
+        return View._to_json(execute_record(_controller.registry, operation))
+    try:
+        image = _controller.operator.visualization_functions[name](operation, 'bytes')
+        return {'operation': operation, 'image': image, 'file': VISUALIZATION_FILES[name]}
+    except Exception as e:
+        return {'operation': operation, 'error': str(e)}
+
+
+def _run_task(task, serialized=frozenset()):
+    """Exécute un lot de (indice, commande) et retourne des enregistrements sérialisables"""
+    return [(index, _execute(operation, serialized)) for index, operation in task]
+
+
+def build_tasks(operations, task_size):
+    """
+    Découpe les commandes, au fil de la lecture, en lots consécutifs.
+
+    :param operations: Itérable de commandes (éventuellement un flux sans fin).
+    :param task_size: Nombre maximal de commandes par lot.
+    :return: Générateur de lots, chacun étant une liste de (indice, commande).
+    """
+    numbered = enumerate(operations)
+    while True:
+        task = list(islice(numbered, task_size))
+        if not task:
+            return
+        yield task
+
+
+def _finish(record):
+    """Écrit l'image d'un graphique sérialisé dans son fichier et retourne l'enregistrement final"""
+    if 'image' not in record:
+        return record
+    return {'operation': record['operation'], 'result': deliver(record['image'], None, record['file'])}
+
+
+def execute_parallel(operations, jobs=None, plugins=(), serialized=(), task_size=TASK_SIZE):
+    """
+    Exécute les commandes sur un pool de processus, en lisant operations au
+    fur et à mesure (mémoire bornée par la fenêtre de lots en cours).
+
+    :param operations: Itérable de commandes.
+    :param jobs: Nombre de processus (tous les cœurs par défaut).
+    :param plugins: Plugins du Controller, installés dans chaque processus
+                    (doivent être des fonctions de niveau module).
+    :param serialized: Noms des graphiques écrivant un fichier commun: rendus
+                       en parallèle, fichiers écrits dans l'ordre.
+    :return: Générateur des enregistrements {'operation', 'result'|'error'},
+             dans l'ordre des commandes.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 0:
+        raise ValueError("Le nombre de processus doit être positif")
+    tasks = build_tasks(operations, task_size)
+    first = next(tasks, None)
+    if first is None:
+        return
+    serialized = frozenset(serialized)
+    window = WINDOW_FACTOR * jobs
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(tuple(plugins),)) as executor:
+        pending = deque([executor.submit(_run_task, first, serialized)])
+        for task in tasks:
+            if len(pending) >= window:
+                for _, record in pending.popleft().result():
+                    yield _finish(record)
+            pending.append(executor.submit(_run_task, task, serialized))
+        while pending:
+            for _, record in pending.popleft().result():
+                yield _finish(record)
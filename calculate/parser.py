@@ -0,0 +1,178 @@
+"""
+Analyse du langage de commandes nom(arguments;arguments).
+
+Une commande est découpée en une seule passe: le nom, puis les groupes séparés
+par des ';' de premier niveau, chaque groupe contenant des arguments séparés
+par des ','. Les groupes numériques sont convertis directement en tableaux
+NumPy, sans liste Python intermédiaire. Un groupe '@fichier' désigne des
+données binaires projetées en mémoire (voir calculate.datasource).
+"""
+import re
+import warnings
+import numpy as np
+from calculate.datasource import is_reference, load_array, load_source
+
+_STRUCTURE = re.compile(r'[();,]')
+_CALL = re.compile(r'([A-Za-z0-9_]+)\(')
+_OPTION = re.compile(r'\s*([A-Za-z_]\w*)\s*=')
+
+
+def _split_top_level(text, separator):
+    """
+    Découpe text sur les séparateurs de premier niveau (hors parenthèses).
+
+    Sans parenthèses imbriquées, le découpage est délégué à str.split; sinon
+    seuls les caractères structurels sont parcourus.
+    """
+    if '(' not in text and ')' not in text:
+        return text.split(separator)
+    parts = []
+    depth = 0
+    start = 0
+    for match in _STRUCTURE.finditer(text):
+        char = match.group()
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                raise ValueError("Parenthèses non équilibrées")
+        elif char == separator and depth == 0:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    if depth != 0:
+        raise ValueError("Parenthèses non équilibrées")
+    parts.append(text[start:])
+    return parts
+
+
+def parse_numbers(text):
+    """
+    Convertit une liste 'v1,v2,...' en tableau NumPy de flottants, ou charge
+    sans copie le fichier d'une référence '@fichier'.
+    """
+    if is_reference(text):
+        return load_array(text)
+    expected = text.count(',') + 1
+    try:
+        with warnings.catch_warnings():
+            # Les anciennes versions de NumPy avertissent au lieu de lever
+            warnings.simplefilter('error', DeprecationWarning)
+            values = np.fromstring(text, dtype=float, sep=',')
+    except (ValueError, DeprecationWarning):
+        values = None
+    if values is None or values.size != expected:
+        bad = next((x.strip() for x in text.split(',') if not _is_number(x)), text.strip())
+        raise ValueError(f"could not convert string to float: '{bad}'")
+    return values
+
+
+def parse_number(text):
+    """Convertit un argument en flottant"""
+    return float(text.strip())
+
+
+def parse_labels(text):
+    """Convertit une liste 'a,b,...' en liste de libellés"""
+    return [x.strip() for x in text.split(',')]
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+class Command:
+    """
+    Commande analysée: nom et groupes d'arguments bruts, convertis à la demande
+    en nombres, tableaux, libellés ou arguments.
+    """
+
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body
+        self.groups = _split_top_level(body, ';')
+
+    def __len__(self):
+        return len(self.groups)
+
+    def numbers(self, index=0):
+        """Groupe index converti en tableau NumPy"""
+        return parse_numbers(self.groups[index])
+
+    def source(self, index=0):
+        """
+        Groupe index converti en source de données: tableau NumPy, ou
+        CsvColumn (lue par blocs) pour une référence '@fichier.csv:colonne'.
+        """
+        if is_reference(self.groups[index]):
+            return load_source(self.groups[index])
+        return self.numbers(index)
+
+    def number(self, index):
+        """Groupe index converti en flottant"""
+        return parse_number(self.groups[index])
+
+    def labels(self, index):
+        """Groupe index converti en liste de libellés"""
+        return parse_labels(self.groups[index])
+
+    def options(self):
+        """
+        Sépare les groupes positionnels des options nom=valeur.
+
+        :return: Tuple (indices des groupes positionnels, {nom: texte de la valeur}).
+        """
+        positional = []
+        options = {}
+        for index, group in enumerate(self.groups):
+            match = _OPTION.match(group)
+            if match:
+                options[match.group(1)] = group[match.end():]
+            else:
+                positional.append(index)
+        return positional, options
+
+    def arguments(self, index=0):
+        """Groupe index découpé sur les virgules de premier niveau"""
+        return [x.strip() for x in _split_top_level(self.groups[index], ',')]
+
+
+def parse_command(operation, operator):
+    """
+    Analyse une commande operator(...) et retourne un objet Command.
+
+    :param operation: Texte de la commande, ex: 'percentile(1,2,3;50)', ou
+                      son seul contenu, ex: '1,2,3;50' (saisi après le choix
+                      de l'opération dans le menu).
+    :param operator: Nom attendu de la commande, ex: 'percentile'.
+    """
+    text = operation.strip()
+    prefix = f'{operator}('
+    if text.startswith(prefix):
+        if not text.endswith(')'):
+            raise ValueError(f"Format invalide. Utilisez: {operator}(...)")
+        return Command(operator, text[len(prefix):-1])
+    if command_name(text) is not None:
+        # Appel d'une autre commande, ex: mean(...) passé à median
+        raise ValueError(f"Format invalide. Utilisez: {operator}(...)")
+    return Command(operator, text)
+
+
+def command_name(operation):
+    """
+    Retourne le nom de la commande si operation est un appel unique nom(...),
+    None sinon (ex: '2 + 3' ou 'sqrt(2)+1').
+    """
+    text = operation.strip()
+    match = _CALL.match(text)
+    if match is None or not text.endswith(')'):
+        return None
+    try:
+        _split_top_level(text[match.end():-1], ';')
+    except ValueError:
+        return None
+    return match.group(1)
@@ -0,0 +1,78 @@
+"""
+Table de dispatch des opérations, construite une seule fois au démarrage.
+"""
+from calculate.parser import command_name
+
+
+class OperationRegistry:
+    """
+    Associe les codes du menu et les noms de commandes aux fonctions qui les
+    exécutent, avec une recherche en O(1).
+
+    Les plugins ajoutent leurs opérations dans la même table:
+        registry.register('double', lambda operation: ..., code='35')
+    """
+
+    def __init__(self, fallback=None):
+        """
+        :param fallback: Fonction utilisée par execute() quand l'opération n'est
+                         pas un appel à une commande enregistrée (ex: '1+2*3').
+        """
+        self._by_name = {}
+        self._by_code = {}
+        self.fallback = fallback
+
+    def register(self, name, function, code=None):
+        """
+        Enregistre une fonction sous un nom de commande et, éventuellement,
+        sous un code du menu.
+
+        :param name: Nom de la commande, ex: 'mean' pour mean(1,2,3).
+        :param function: Fonction prenant le texte de l'opération.
+        :param code: Code du menu (str) sélectionnant cette opération.
+        """
+        self._by_name[name] = function
+        if code is not None:
+            self.register_code(code, function)
+
+    def register_code(self, code, function):
+        """Enregistre une fonction sous un code du menu uniquement"""
+        self._by_code[str(code)] = function
+
+    def has_code(self, code):
+        """Indique si le code du menu est enregistré"""
+        return code in self._by_code
+
+    def has_name(self, name):
+        """Indique si le nom de commande est enregistré"""
+        return name in self._by_name
+
+    def by_code(self, code):
+        """Retourne la fonction associée à un code du menu"""
+        try:
+            return self._by_code[code]
+        except KeyError:
+            raise ValueError(f"Code d'opération inconnu: {code}")
+
+    def by_name(self, name):
+        """Retourne la fonction associée à un nom de commande"""
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f"Opération inconnue: {name}")
+
+    def names(self):
+        """Liste des noms de commandes enregistrés"""
+        return list(self._by_name)
+
+    def execute(self, operation):
+        """
+        Exécute une opération: appel nom(...) à une commande enregistrée, ou
+        sinon la fonction de repli.
+        """
+        name = command_name(operation)
+        if name in self._by_name:
+            return self._by_name[name](operation.strip())
+        if self.fallback is None:
+            raise ValueError("Opération non reconnue")
+        return self.fallback(operation)
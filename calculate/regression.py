@@ -0,0 +1,150 @@
+"""
+Régression par moindres carrés: multiple, pondérée et régularisée (ridge).
+
+Le système est résolu par factorisation QR de la matrice de conception (plus
+stable que l'inversion des équations normales). Plusieurs variables réponses
+indépendantes (colonnes de Y) sont ajustées en un seul appel LAPACK sur la
+même matrice de conception. Les colonnes sont ramenées à la norme 1 avant
+la factorisation: le test de colinéarité ne dépend pas de l'échelle des
+prédicteurs.
+"""
+import numpy as np
+from calculate.lazy import lazy_import
+
+stats = lazy_import('scipy.stats')
+
+
+def design_matrix(predictors, intercept=True):
+    """
+    Construit la matrice de conception (n, p) à partir des prédicteurs.
+
+    :param predictors: Tableau (n,) ou (n, p), ou liste de colonnes de même longueur.
+    :param intercept: Ajoute une colonne de 1 en tête.
+    """
+    if isinstance(predictors, (list, tuple)):
+        lengths = {len(column) for column in predictors}
+        if len(lengths) != 1:
+            raise ValueError("Toutes les séries doivent avoir la même longueur")
+        predictors = np.column_stack(predictors)
+    X = np.asarray(predictors, dtype=float)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    if intercept:
+        X = np.column_stack([np.ones(X.shape[0]), X])
+    return X
+
+
+def _fit(predictors, responses, weights, ridge, intercept):
+    """Résout le système; retourne (X, Y, w, beta, R, scale) avec A*scale = QR"""
+    X = design_matrix(predictors, intercept)
+    Y = np.asarray(responses, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, np.newaxis]
+    n, p = X.shape
+    if Y.shape[0] != n:
+        raise ValueError("Les prédicteurs et la réponse doivent avoir la même longueur")
+    if ridge < 0:
+        raise ValueError("Le coefficient ridge doit être positif")
+    if n < p and ridge == 0:
+        raise ValueError("Pas assez d'observations pour le nombre de prédicteurs")
+
+    if weights is None:
+        w = np.ones(n)
+    else:
+        w = np.asarray(weights, dtype=float)
+        if w.shape != (n,):
+            raise ValueError("Il faut un poids par observation")
+        if np.any(w < 0) or not np.any(w > 0):
+            raise ValueError("Les poids doivent être positifs")
+    root_w = np.sqrt(w)[:, np.newaxis]
+    A = X * root_w
+    B = Y * root_w
+    if ridge > 0:
+        # Ridge: lignes supplémentaires sqrt(ridge)*I (hors ordonnée) dans le système
+        penalty = np.sqrt(ridge) * np.eye(p)
+        if intercept:
+            penalty = penalty[1:]
+        A = np.vstack([A, penalty])
+        B = np.vstack([B, np.zeros((penalty.shape[0], B.shape[1]))])
+
+    # Colonnes de norme 1: la tolérance de rang est relative, quelle que soit l'échelle
+    norms = np.linalg.norm(A, axis=0)
+    scale = 1 / np.where(norms > 0, norms, 1.0)
+    Q, R = np.linalg.qr(A * scale)
+    diagonal = np.abs(np.diag(R))
+    if diagonal.size == 0 or diagonal.min() <= np.finfo(float).eps * max(A.shape) * diagonal.max():
+        raise ValueError("Prédicteurs colinéaires: la régression n'est pas définie")
+    beta = np.linalg.solve(R, Q.T @ B) * scale[:, np.newaxis]
+    return X, Y, w, beta, R, scale
+
+
+def _r_squared(X, Y, w, beta):
+    residuals = Y - X @ beta
+    weighted_mean = (w @ Y) / w.sum()
+    total = w @ np.square(Y - weighted_mean)
+    residual = w @ np.square(residuals)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, 1 - residual / total, 1.0), residual
+
+
+def least_squares(predictors, responses, weights=None, ridge=0.0, intercept=True):
+    """
+    Ajuste responses ~ predictors par moindres carrés.
+
+    :param predictors: Prédicteurs (n,) ou (n, p), ou liste de colonnes.
+    :param responses: Réponse (n,) ou plusieurs réponses (n, m) ajustées ensemble.
+    :param weights: Poids positifs des observations (n,), optionnels.
+    :param ridge: Coefficient de régularisation L2 (l'ordonnée n'est pas pénalisée).
+    :param intercept: Ajuste une ordonnée à l'origine.
+    :return: Dictionnaire avec 'coefficients' (p,) ou (p, m), 'intercept'
+             (scalaire ou (m,)) et 'r_squared' (scalaire ou (m,)).
+    """
+    single = np.ndim(responses) == 1
+    X, Y, w, beta, R, scale = _fit(predictors, responses, weights, ridge, intercept)
+    r_squared, _ = _r_squared(X, Y, w, beta)
+
+    if intercept:
+        intercepts, coefficients = beta[0], beta[1:]
+    else:
+        intercepts, coefficients = np.zeros(beta.shape[1]), beta
+    if single:
+        return {
+            'coefficients': coefficients[:, 0],
+            'intercept': float(intercepts[0]),
+            'r_squared': float(r_squared[0])
+        }
+    return {
+        'coefficients': coefficients,
+        'intercept': intercepts,
+        'r_squared': r_squared
+    }
+
+
+def simple_regression(x, y, weights=None, ridge=0.0):
+    """
+    Régression y ~ x (un seul prédicteur), pondérée et/ou ridge, au format
+    de scipy.stats.linregress.
+
+    :return: Dictionnaire avec 'slope', 'intercept', 'r_squared' et
+             'p_value' (test t de la pente sur n-2 degrés de liberté, n
+             observations de poids non nul; avec ridge, la variance de la
+             pente inclut la pénalité).
+    """
+    X, Y, w, beta, R, scale = _fit(np.asarray(x, dtype=float), y, weights, ridge, True)
+    r_squared, residual = _r_squared(X, Y, w, beta)
+    freedom = np.count_nonzero(w) - 2
+    if freedom > 0:
+        # Var(pente) = s² [(A'A)^-1]_11, avec A'A = D^-1 R'R D^-1
+        inverse = np.linalg.inv(R) * scale[:, np.newaxis]
+        variance = residual[0] / freedom * (inverse[1] @ inverse[1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = abs(beta[1, 0]) / np.sqrt(variance)
+        p_value = float(2 * stats.t.sf(t, freedom)) if not np.isnan(t) else 1.0
+    else:
+        p_value = float('nan')
+    return {
+        'slope': float(beta[1, 0]),
+        'intercept': float(beta[0, 0]),
+        'r_squared': float(r_squared[0]),
+        'p_value': p_value
+    }
@@ -0,0 +1,97 @@
+"""
+Destination et encodage des graphiques.
+
+Par défaut, un graphique est enregistré dans un fichier au nom fixe du
+répertoire courant. Avec une option de rendu, il est plutôt:
+- encodé en mémoire (PNG, SVG, PDF, ...) et retourné en bytes;
+- rendu par Agg et retourné en memoryview (hauteur, largeur, 4) sur le tampon
+  RGBA, sans copie ni encodage;
+- enregistré dans un fichier choisi par l'appelant.
+"""
+import io
+import os
+
+FORMATS = ('png', 'svg', 'pdf', 'jpg', 'jpeg', 'webp', 'eps', 'ps')
+TARGETS = ('bytes', 'rgba')
+DEFAULT_DPI = 100
+
+
+class RenderOptions:
+    """
+    Options de rendu d'un graphique.
+
+    :param target: 'bytes', 'rgba' ou chemin du fichier à écrire.
+    :param format: Format d'encodage; déduit de l'extension du chemin, png sinon.
+    :param dpi: Résolution en points par pouce.
+    """
+
+    def __init__(self, target='bytes', format=None, dpi=DEFAULT_DPI):
+        if format is None and target not in TARGETS:
+            format = os.path.splitext(str(target))[1][1:].lower() or None
+        format = (format or 'png').lower()
+        if format not in FORMATS:
+            raise ValueError(f"Format d'image non supporté: {format}")
+        if dpi <= 0:
+            raise ValueError("La résolution doit être strictement positive")
+        self.target = target
+        self.format = format
+        self.dpi = dpi
+
+    @classmethod
+    def from_output(cls, output):
+        """Convertit l'argument output des graphiques: None, 'bytes', 'rgba', chemin ou RenderOptions"""
+        if output is None or isinstance(output, cls):
+            return output
+        return cls(os.fspath(output) if isinstance(output, os.PathLike) else output)
+
+    @property
+    def keeps_figure(self):
+        """Vrai si le résultat référence le tampon de la figure (qui ne doit pas être réutilisée)"""
+        return self.target == 'rgba'
+
+    def key(self):
+        """Identifiant hachable des options (ex: pour un cache de rendus)"""
+        return (self.target, self.format, self.dpi)
+
+
+def render_figure(fig, options, filename):
+    """
+    Produit le résultat d'un graphique tracé sur fig.
+
+    :param options: RenderOptions, ou None pour enregistrer dans filename.
+    :param filename: Fichier par défaut du graphique.
+    :return: Message, bytes encodés ou memoryview RGBA selon options.
+    """
+    if options is None:
+        fig.savefig(filename)
+        return f"Graphique sauvegardé dans '{filename}'"
+    if options.target == 'bytes':
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=options.format, dpi=options.dpi)
+        return buffer.getvalue()
+    if options.target == 'rgba':
+        fig.set_dpi(options.dpi)
+        fig.canvas.draw()
+        return fig.canvas.buffer_rgba()
+    fig.savefig(options.target, format=options.format, dpi=options.dpi)
+    return f"Graphique sauvegardé dans '{options.target}'"
+
+
+def encoding(options):
+    """Options d'encodage en bytes équivalentes (fichier par défaut: PNG à DEFAULT_DPI)"""
+    if options is None:
+        return RenderOptions('bytes')
+    return RenderOptions('bytes', options.format, options.dpi)
+
+
+def deliver(data, options, filename):
+    """
+    Produit le résultat d'un graphique déjà encodé (ex: lu dans un cache),
+    comme render_figure l'aurait fait (sauf pour 'rgba').
+    """
+    if options is not None and options.target == 'bytes':
+        return data
+    path = filename if options is None else options.target
+    with open(path, 'wb') as file:
+        file.write(data)
+    return f"Graphique sauvegardé dans '{path}'"
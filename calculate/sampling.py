@@ -0,0 +1,283 @@
+"""
+Échantillonnage adaptatif des fonctions à tracer.
+
+L'intervalle est d'abord échantillonné uniformément, assez finement pour ne
+pas replier une oscillation (la moitié du budget, au moins MIN_POINTS points:
+sin(20*x) vu tous les 0.3 ressemblerait à une courbe lente). Les intervalles
+où la courbe s'écarte de sa corde (erreur d'interpolation linéaire, mesurée
+en coordonnées normalisées du graphique) sont ensuite subdivisés, jusqu'à
+épuisement d'un budget de points, puis les points alignés avec leurs voisins
+sont retirés: les zones plates gardent peu de points, les pics, bords de
+domaine et asymptotes beaucoup.
+
+Les évaluations sont conservées par AdaptiveSampler: un zoom sur une partie
+de l'intervalle réutilise les points déjà calculés.
+"""
+import math
+import numpy as np
+
+DEFAULT_BUDGET = 2000
+INITIAL_POINTS = 65
+MIN_POINTS = 1000
+TOLERANCE = 1e-3
+MIN_WIDTH = 1e-9
+MAX_KNOWN = 200000
+GRID_BUDGET = 20000
+GRID_INITIAL = 17
+GRID_MIN_POINTS = 100
+GRID_TOLERANCE = 5e-3
+VIEW_QUANTILES = (0.01, 0.99)
+
+
+def _weights(x):
+    """Poids de chaque point: demi-largeur des intervalles voisins"""
+    gaps = np.diff(x)
+    return np.concatenate(([0], gaps)) / 2 + np.concatenate((gaps, [0])) / 2
+
+
+def view_limits(x, y, quantiles=VIEW_QUANTILES):
+    """
+    Limites robustes de y: quantiles pondérés par l'espacement des x (comme
+    sur une grille uniforme), pour que les valeurs démesurées au voisinage
+    des asymptotes n'écrasent pas le graphique.
+    """
+    finite = np.isfinite(y)
+    if not finite.any():
+        return -1.0, 1.0
+    values, weights = y[finite], _weights(x)[finite]
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    if cumulative[-1] <= 0:
+        return float(values.min()), float(values.max())
+    low, high = np.interp(np.asarray(quantiles) * cumulative[-1], cumulative, values[order])
+    return float(low), float(high)
+
+
+def _scale(t, values):
+    """Étendue visible des valeurs (limites robustes), 1 si elle est nulle"""
+    low, high = view_limits(t, values)
+    return high - low if high > low else 1.0
+
+
+def _spread(values):
+    finite = values[np.isfinite(values)]
+    spread = float(finite.max() - finite.min()) if finite.size else 0.0
+    return spread if spread > 0 else 1.0
+
+
+def _deviations(X, Y):
+    """
+    Distance normalisée de chaque point intérieur à la corde de ses voisins.
+    Un triplet partiellement indéfini (bord de domaine) vaut +inf.
+    """
+    x0, x1, x2 = X[:-2], X[1:-1], X[2:]
+    y0, y1, y2 = Y[:-2], Y[1:-1], Y[2:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dx, dy = x2 - x0, y2 - y0
+        distance = np.abs(dx * (y1 - y0) - dy * (x1 - x0)) / np.hypot(dx, dy)
+    finite = np.isfinite(y0) & np.isfinite(y1) & np.isfinite(y2)
+    undefined = ~(np.isfinite(y0) | np.isfinite(y1) | np.isfinite(y2))
+    distance[~finite] = np.inf
+    distance[undefined] = 0
+    return np.nan_to_num(distance, nan=np.inf)
+
+
+def _chord_errors(X, Y, finite, left, right):
+    """
+    Écart maximal des points d'indices ]left, right[ à la corde left-right,
+    pour des intervalles disjoints; +inf si un point est indéfini sans que
+    tout l'intervalle le soit.
+    """
+    inside = np.concatenate([np.arange(l + 1, r) for l, r in zip(left, right)])
+    span = np.repeat(np.arange(left.size), right - left - 1)
+    x0, y0, x1, y1 = X[left][span], Y[left][span], X[right][span], Y[right][span]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dx, dy = x1 - x0, y1 - y0
+        distance = np.abs(dx * (Y[inside] - y0) - dy * (X[inside] - x0)) / np.hypot(dx, dy)
+    error = np.zeros(left.size)
+    np.maximum.at(error, span, np.nan_to_num(distance, nan=np.inf))
+    defined = finite[left].astype(int) + finite[right]
+    np.add.at(defined, span, finite[inside])
+    undefined = defined == 0
+    partial = ~undefined & (defined < right - left + 1)
+    error[partial] = np.inf
+    error[undefined] = 0
+    return error
+
+
+class AdaptiveSampler:
+    """
+    Échantillonneur adaptatif d'une fonction vectorisée f(t), avec mémoire
+    des évaluations déjà faites.
+
+    :param function: Fonction NumPy vectorisée (ex: CompiledExpression).
+    :param budget: Nombre maximal de points par échantillonnage.
+    :param tolerance: Écart maximal toléré à la corde (fraction du graphique).
+    """
+
+    def __init__(self, function, budget=DEFAULT_BUDGET, tolerance=TOLERANCE):
+        self.function = function
+        self.budget = budget
+        self.tolerance = tolerance
+        self.evaluations = 0
+        self.asymptotes = 0
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+    def _evaluate(self, t):
+        """Évalue f sur de nouveaux points et les mémorise"""
+        values = np.asarray(self.function(t), dtype=float)
+        values = np.broadcast_to(values, t.shape).copy()
+        self.evaluations += t.size
+        if self._x.size + t.size > MAX_KNOWN:
+            self._x, self._y = np.empty(0), np.empty(0)
+        x = np.concatenate([self._x, t])
+        order = np.argsort(x, kind='stable')
+        self._x, self._y = x[order], np.concatenate([self._y, values])[order]
+        return values
+
+    def _initial(self, low, high):
+        """Points de départ: évaluations connues de [low, high] complétées par une grille grossière"""
+        inside = (self._x >= low) & (self._x <= high)
+        known_x, known_y = self._x[inside], self._y[inside]
+        # Densité uniforme contre le repliement: la moitié du budget, au moins MIN_POINTS
+        points = max(INITIAL_POINTS, min(self.budget, max(MIN_POINTS, self.budget // 2)))
+        grid = np.linspace(low, high, points)
+        step = (high - low) / (points - 1)
+        if known_x.size:
+            position = np.clip(np.searchsorted(known_x, grid), 1, known_x.size) - 1
+            nearest = np.minimum(np.abs(grid - known_x[position]),
+                                 np.abs(grid - known_x[np.minimum(position + 1, known_x.size - 1)]))
+            grid = grid[(nearest > step / 4) | (grid == low) & (known_x[0] != low)
+                        | (grid == high) & (known_x[-1] != high)]
+        values = self._evaluate(grid) if grid.size else grid
+        x = np.concatenate([known_x, grid])
+        order = np.argsort(x, kind='stable')
+        return x[order], np.concatenate([known_y, values])[order]
+
+    def sample(self, low, high, transform=None):
+        """
+        Échantillonne f sur [low, high].
+
+        :param transform: Fonction (t, v) -> (X, Y) donnant les coordonnées
+                          tracées (ex: polaires vers cartésiennes) dans
+                          lesquelles l'erreur est mesurée.
+        :return: Tuple (t, v) trié; des NaN séparent les branches d'une
+                 asymptote verticale (leur nombre est noté dans asymptotes).
+        """
+        if not np.isfinite(low) or not np.isfinite(high) or low >= high:
+            raise ValueError("Intervalle d'échantillonnage invalide")
+        t, v = self._initial(low, high)
+        min_width = max(MIN_WIDTH, (high - low) * 1e-12)
+        while t.size < self.budget:
+            X, Y = transform(t, v) if transform else (t, v)
+            deviation = _deviations(X / _scale(t, X), Y / _scale(t, Y))
+            # Un point trop éloigné de sa corde fait subdiviser ses deux intervalles
+            score = np.zeros(t.size - 1)
+            np.maximum.at(score, np.arange(deviation.size), deviation)
+            np.maximum.at(score, np.arange(1, deviation.size + 1), deviation)
+            candidates = np.flatnonzero((score > self.tolerance) & (np.diff(t) > min_width))
+            if candidates.size == 0:
+                break
+            chosen = candidates[np.argsort(-score[candidates], kind='stable')][:self.budget - t.size]
+            middles = (t[chosen] + t[chosen + 1]) / 2
+            values = self._evaluate(middles)
+            position = np.searchsorted(t, middles)
+            t, v = np.insert(t, position, middles), np.insert(v, position, values)
+        return self._split_asymptotes(*self._simplify(t, v, transform))
+
+    def _simplify(self, t, v, transform):
+        """
+        Retire les points intérieurs inutiles (zones plates de la grille
+        initiale): un point est retiré si la corde de ses voisins reste, pour
+        tous les points échantillonnés qu'elle remplace, sous le quart de la
+        tolérance (les retraits successifs ne cumulent pas d'écart visible).
+        """
+        X, Y = transform(t, v) if transform else (t, v)
+        X, Y = X / _scale(t, X), Y / _scale(t, Y)
+        finite = np.isfinite(Y)
+        kept = np.arange(t.size)
+        removed = True
+        while removed and kept.size > 2:
+            removed = False
+            # Candidats non voisins: les cordes à tester ne se chevauchent pas
+            for parity in (1, 2):
+                left, right = kept[parity - 1:-2:2], kept[parity + 1::2]
+                if left.size == 0:
+                    continue
+                error = _chord_errors(X, Y, finite, left, right)
+                drop = kept[parity:-1:2][:left.size][error < self.tolerance / 4]
+                if drop.size:
+                    kept = np.setdiff1d(kept, drop, assume_unique=True)
+                    removed = True
+        return t[kept], v[kept]
+
+    def _split_asymptotes(self, t, v):
+        """Insère un NaN entre deux points passant d'au-delà du haut à en deçà du bas de la vue"""
+        low, high = view_limits(t, v)
+        above, below = v > high, v < low
+        jumps = np.flatnonzero((above[:-1] & below[1:]) | (below[:-1] & above[1:]))
+        self.asymptotes = jumps.size
+        if jumps.size == 0:
+            return t, v
+        middles = (t[jumps] + t[jumps + 1]) / 2
+        return np.insert(t, jumps + 1, middles), np.insert(v, jumps + 1, np.nan)
+
+
+def _refine_axis(values, Z, axis, tolerance, limit):
+    """Milieux des intervalles de l'axe où la surface s'écarte le plus de l'interpolation"""
+    if limit <= 0:
+        return np.empty(0)
+    Zt = np.moveaxis(Z, axis, 0) / _spread(Z)
+    t = (values - values[0]) / (values[-1] - values[0])
+    with np.errstate(invalid='ignore'):
+        weight = ((t[2:] - t[1:-1]) / (t[2:] - t[:-2]))[:, np.newaxis]
+        error = np.abs(Zt[1:-1] - (Zt[:-2] * weight + Zt[2:] * (1 - weight)))
+    finite = np.isfinite(Zt[:-2]) & np.isfinite(Zt[1:-1]) & np.isfinite(Zt[2:])
+    error = np.where(finite, error, np.where(np.isfinite(Zt[1:-1]) | np.isfinite(Zt[:-2]), np.inf, 0))
+    deviation = error.max(axis=1)
+    score = np.zeros(values.size - 1)
+    np.maximum.at(score, np.arange(deviation.size), deviation)
+    np.maximum.at(score, np.arange(1, deviation.size + 1), deviation)
+    candidates = np.flatnonzero((score > tolerance) & (np.diff(values) > MIN_WIDTH))
+    chosen = candidates[np.argsort(-score[candidates], kind='stable')][:limit]
+    return (values[chosen] + values[chosen + 1]) / 2
+
+
+def _evaluate_grid(function, xs, ys):
+    X, Y = np.meshgrid(xs, ys)
+    return np.broadcast_to(np.asarray(function(X, Y), dtype=float), X.shape).copy()
+
+
+def adaptive_grid(function, x_range, y_range, budget=GRID_BUDGET, tolerance=GRID_TOLERANCE):
+    """
+    Grille (non uniforme) adaptée à la surface z = f(x, y): les colonnes et
+    lignes sont ajoutées là où la surface s'écarte le plus de son
+    interpolation le long de chaque axe, dans la limite de budget points.
+    La grille de départ est uniforme, d'au moins GRID_MIN_POINTS points par
+    axe (si budget le permet), pour ne pas manquer une oscillation fine.
+
+    :return: Tuple (xs, ys, Z) avec Z de forme (len(ys), len(xs)).
+    """
+    for low, high in (x_range, y_range):
+        if not np.isfinite(low) or not np.isfinite(high) or low >= high:
+            raise ValueError("Intervalle d'échantillonnage invalide")
+    # Au plus la moitié du budget pour la grille de départ, le reste pour le raffinement
+    side = max(GRID_INITIAL, min(GRID_MIN_POINTS, math.isqrt(budget // 2)))
+    xs = np.linspace(*x_range, side)
+    ys = np.linspace(*y_range, side)
+    Z = _evaluate_grid(function, xs, ys)
+    while True:
+        # Nouvelles colonnes puis nouvelles lignes, chacune évaluée une seule fois
+        new_x = _refine_axis(xs, Z, 1, tolerance, (budget // ys.size - xs.size) // 2)
+        if new_x.size:
+            columns = _evaluate_grid(function, new_x, ys)
+            position = np.searchsorted(xs, new_x)
+            xs, Z = np.insert(xs, position, new_x), np.insert(Z, position, columns, axis=1)
+        new_y = _refine_axis(ys, Z, 0, tolerance, (budget // xs.size - ys.size) // 2)
+        if new_y.size:
+            rows = _evaluate_grid(function, xs, new_y)
+            position = np.searchsorted(ys, new_y)
+            ys, Z = np.insert(ys, position, new_y), np.insert(Z, position, rows, axis=0)
+        if not new_x.size and not new_y.size:
+            return xs, ys, Z
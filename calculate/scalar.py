@@ -0,0 +1,92 @@
+"""
+Opérateurs scalaires et leurs contrôles de domaine.
+
+Source unique des calculs sur un ou deux nombres: les commandes d'Operators
+('2 + 3', 'sqrt(4)', ...) les appellent après analyse du texte, et les
+formules compilées par evaluator les appellent directement.
+"""
+import math
+
+
+def addition(a, b):
+    return a + b
+
+
+def substraction(a, b):
+    return a - b
+
+
+def multiplication(a, b):
+    return a * b
+
+
+def division(a, b):
+    if b == 0:
+        raise ValueError("Division par zéro impossible")
+    return a / b
+
+
+def power(a, b):
+    try:
+        return math.pow(a, b)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Puissance non définie: {str(e)}")
+
+
+def modulo(a, b):
+    if b == 0:
+        raise ValueError("Division par zéro impossible")
+    return a % b
+
+
+def square_root(a):
+    if a < 0:
+        raise ValueError("Impossible de calculer la racine carrée d'un nombre négatif")
+    return math.sqrt(a)
+
+
+def logarithm(a):
+    if a <= 0:
+        raise ValueError("Le logarithme n'est défini que pour les nombres strictement positifs")
+    return math.log(a)
+
+
+def factorial(a):
+    if not float(a).is_integer() or a < 0:
+        raise ValueError("La factorielle n'est définie que pour les entiers positifs")
+    return math.factorial(int(a))
+
+
+def exponential(a):
+    try:
+        return math.exp(a)
+    except OverflowError:
+        raise ValueError("Dépassement de capacité pour l'exponentielle")
+
+
+sine = math.sin
+cosine = math.cos
+tangent = math.tan
+absolute = abs
+
+
+# Mêmes symboles et noms que les commandes d'Operators
+BINARY = {
+    '+': addition,
+    '-': substraction,
+    '*': multiplication,
+    '/': division,
+    '^': power,
+    '%': modulo,
+}
+
+UNARY = {
+    'sqrt': square_root,
+    'log': logarithm,
+    'sin': sine,
+    'cos': cosine,
+    'tan': tangent,
+    '!': factorial,
+    'abs': absolute,
+    'exp': exponential,
+}
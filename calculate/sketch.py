@@ -0,0 +1,136 @@
+"""
+Quantiles approchés sur des flux non bornés (sketch KLL).
+
+Le sketch conserve O(k log(n/k)) valeurs pondérées quelle que soit la taille
+du flux; l'erreur de rang est d'environ 1.7/k (k=200 -> ~0.9 %). Deux sketchs
+construits sur des fragments différents se fusionnent, et un même sketch
+répond à autant de percentiles que nécessaire (p50, p90, p99, ...).
+"""
+import math
+import numpy as np
+
+DEFAULT_K = 200
+_ERROR_FACTOR = 1.7
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+class QuantileSketch:
+    """Sketch KLL: compacteurs de poids 1, 2, 4, ... de capacité décroissante"""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        if k < 8:
+            raise ValueError("Le paramètre k du sketch doit valoir au moins 8")
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def with_error(cls, error, seed=None):
+        """Crée un sketch dont l'erreur de rang vaut environ error (ex: 0.01)"""
+        if not 0 < error < 1:
+            raise ValueError("L'erreur doit être comprise entre 0 et 1")
+        return cls(max(8, math.ceil(_ERROR_FACTOR / error)), seed)
+
+    @property
+    def error(self):
+        """Erreur de rang approximative du sketch"""
+        return _ERROR_FACTOR / self.k
+
+    @property
+    def exact(self):
+        """Vrai tant qu'aucune compaction n'a eu lieu (quantiles exacts)"""
+        return len(self._levels) == 1
+
+    def _capacity(self, level):
+        depth = len(self._levels) - 1 - level
+        return max(2, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs au sketch"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fusionne le sketch other (construit sur un autre fragment)"""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Compacte les niveaux pleins: un élément sur deux monte d'un niveau"""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Un nombre impair d'éléments laisse le plus petit au niveau courant
+                keep = items.size % 2
+                promoted = items[keep + self._rng.integers(2)::2]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                self._levels[level] = items[:keep]
+            level += 1
+
+    def size(self):
+        """Nombre de valeurs réellement conservées"""
+        return sum(items.size for items in self._levels)
+
+    def quantiles(self, qs):
+        """
+        Quantiles pour des probabilités qs dans [0, 1] (scalaire ou tableau).
+
+        Tant que le sketch est exact, le résultat est identique à np.quantile.
+        """
+        if self.count == 0:
+            raise ValueError("Aucune valeur dans le sketch")
+        qs = np.asarray(qs, dtype=float)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Les quantiles doivent être entre 0 et 1")
+        if self.exact:
+            return np.quantile(self._levels[0], qs)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        ranks = qs * cumulative[-1]
+        indices = np.minimum(np.searchsorted(cumulative, ranks, side='left'), items.size - 1)
+        result = items[indices]
+        result = np.where(qs == 0, self.min, np.where(qs == 1, self.max, result))
+        return result if result.ndim else float(result)
+
+    def percentiles(self, ps):
+        """Percentiles pour ps dans [0, 100] (scalaire ou tableau)"""
+        return self.quantiles(np.asarray(ps, dtype=float) / 100)
+
+    def median(self):
+        """Médiane (approchée) du flux"""
+        return self.quantiles(0.5)
+
+    @classmethod
+    def from_chunks(cls, chunks, k=DEFAULT_K, seed=None):
+        """Construit le sketch à partir d'un itérable de blocs"""
+        sketch = cls(k, seed)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch
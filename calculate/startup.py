@@ -0,0 +1,77 @@
+"""
+Mesure du temps de démarrage (rapport de type ``python -X importtime``).
+
+Usage:
+    python -m calculate.startup              # rapport pour main.py
+    python -m calculate.startup --budget 300 # code de sortie 1 si dépassé
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Budget de démarrage de main.py, en millisecondes
+STARTUP_BUDGET_MS = 400
+# Modules qui ne doivent jamais être importés au démarrage
+HEAVY_MODULES = ('matplotlib', 'scipy')
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(module='main'):
+    """
+    Importe module dans un interpréteur neuf avec -X importtime.
+
+    :return: Liste de tuples (nom du module, temps propre en µs,
+             temps cumulé en µs), dans l'ordre des imports.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=_ROOT, capture_output=True, text=True, check=True)
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def startup_report(module='main', budget_ms=STARTUP_BUDGET_MS, top=10):
+    """
+    Construit le rapport de démarrage de module.
+
+    :return: Dictionnaire avec le temps total, le budget, les modules lourds
+             importés à tort et les modules les plus coûteux.
+    """
+    imports = measure_imports(module)
+    total_ms = next(cumulative for name, _, cumulative in imports if name == module) / 1000
+    heavy = sorted({name for name, _, _ in imports if name.split('.')[0] in HEAVY_MODULES})
+    slowest = sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_ms': total_ms,
+        'budget_ms': budget_ms,
+        'within_budget': total_ms <= budget_ms and not heavy,
+        'heavy_modules': heavy,
+        'slowest': [(name, self_us / 1000) for name, self_us, _ in slowest]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rapport de temps de démarrage")
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS, help="budget en ms")
+    args = parser.parse_args(argv)
+    report = startup_report(args.module, args.budget)
+    print(f"Démarrage de {report['module']}: {report['total_ms']:.1f} ms "
+          f"(budget {report['budget_ms']:.0f} ms)")
+    for name, self_ms in report['slowest']:
+        print(f"  {self_ms:8.1f} ms  {name}")
+    if report['heavy_modules']:
+        print("Modules lourds importés au démarrage: " + ", ".join(report['heavy_modules']))
+    return 0 if report['within_budget'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""
+Statistiques en un seul passage sur des flux de données.
+
+Les valeurs sont consommées par blocs (générateur, fichier, socket) et
+résumées en mémoire constante. Les états partiels sont fusionnables, ce qui
+permet de répartir un calcul entre plusieurs processus ou machines.
+"""
+import math
+import warnings
+import numpy as np
+from calculate.lazy import lazy_import
+from calculate.sketch import QuantileSketch
+from calculate.histogram import Histogram, bin_rule
+
+stats = lazy_import('scipy.stats')
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_SEPARATORS = str.maketrans(',;', '  ')
+
+
+class RunningStats:
+    """
+    Accumulateur de moyenne et variance (Welford, fusion par paires de Chan).
+
+    Conserve uniquement count, mean, M2 (somme des carrés des écarts à la
+    moyenne), min et max.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs (tableau, liste ou scalaire)"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        chunk = RunningStats()
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.square(values - chunk.mean).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fusionne l'état partiel other dans cet accumulateur"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Variance de la population (comme np.var)"""
+        if self.count == 0:
+            raise ValueError("Aucune valeur")
+        return self.m2 / self.count
+
+    @property
+    def std(self):
+        """Écart-type de la population (comme np.std)"""
+        return math.sqrt(self.variance)
+
+    def result(self):
+        """Résumé sérialisable de l'état (reconstructible par from_dict)"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min,
+            'max': self.max,
+            'variance': self.variance,
+            'std': self.std
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Reconstruit un accumulateur à partir de result() (ex: reçu d'un worker)"""
+        accumulator = cls()
+        accumulator.count = int(state['count'])
+        accumulator.mean = float(state['mean'])
+        accumulator.m2 = float(state['m2'])
+        accumulator.min = float(state['min'])
+        accumulator.max = float(state['max'])
+        return accumulator
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Construit l'accumulateur à partir d'un itérable de blocs"""
+        accumulator = cls()
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator
+
+
+class RunningRegression:
+    """
+    Accumulateur de régression linéaire et de corrélation entre deux séries.
+
+    Conserve les statistiques suffisantes sous forme centrée (n, moyennes de x
+    et y, co-moments Sxx, Syy, Sxy), équivalentes à (n, Σx, Σy, Σxy, Σx², Σy²)
+    mais sans perte de précision par annulation. Mémoire O(1), fusionnable.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def update(self, x, y):
+        """Ajoute un bloc de couples (x, y)"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.size != y.size:
+            raise ValueError("Les deux séries doivent avoir la même longueur")
+        if x.size == 0:
+            return self
+        chunk = RunningRegression()
+        chunk.count = x.size
+        chunk.mean_x = float(x.mean())
+        chunk.mean_y = float(y.mean())
+        dx = x - chunk.mean_x
+        dy = y - chunk.mean_y
+        chunk.sxx = float(dx @ dx)
+        chunk.syy = float(dy @ dy)
+        chunk.sxy = float(dx @ dy)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Fusionne l'état partiel other dans cet accumulateur"""
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        factor = self.count * other.count / count
+        self.sxx += other.sxx + dx * dx * factor
+        self.syy += other.syy + dy * dy * factor
+        self.sxy += other.sxy + dx * dy * factor
+        self.mean_x += dx * other.count / count
+        self.mean_y += dy * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def correlation(self):
+        """Coefficient de corrélation de Pearson"""
+        if self.count < 2 or self.sxx == 0 or self.syy == 0:
+            raise ValueError("Corrélation non définie (moins de 2 points ou série constante)")
+        return self.sxy / math.sqrt(self.sxx * self.syy)
+
+    def result(self):
+        """
+        Pente, ordonnée à l'origine, R² et p-value (test de pente nulle),
+        comme scipy.stats.linregress.
+        """
+        if self.count < 3:
+            raise ValueError("La régression nécessite au moins 3 points")
+        if self.sxx == 0:
+            raise ValueError("Régression non définie: x est constant")
+        slope = self.sxy / self.sxx
+        intercept = self.mean_y - slope * self.mean_x
+        r = self.correlation if self.syy > 0 else 0.0
+        r = max(-1.0, min(1.0, r))
+        degrees = self.count - 2
+        if abs(r) == 1.0:
+            p_value = 0.0
+        else:
+            t = r * math.sqrt(degrees / (1 - r * r))
+            p_value = float(2 * stats.t.sf(abs(t), degrees))
+        return {
+            'slope': slope,
+            'intercept': intercept,
+            'r_squared': r * r,
+            'p_value': p_value
+        }
+
+    def state(self):
+        """État sérialisable (reconstructible par from_dict)"""
+        return {
+            'count': self.count,
+            'mean_x': self.mean_x,
+            'mean_y': self.mean_y,
+            'sxx': self.sxx,
+            'syy': self.syy,
+            'sxy': self.sxy
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Reconstruit un accumulateur à partir de state() (ex: reçu d'un worker)"""
+        regression = cls()
+        for name in ('mean_x', 'mean_y', 'sxx', 'syy', 'sxy'):
+            setattr(regression, name, float(state[name]))
+        regression.count = int(state['count'])
+        return regression
+
+    @classmethod
+    def from_chunks(cls, pairs):
+        """Construit l'accumulateur à partir d'un itérable de blocs (x, y)"""
+        regression = cls()
+        for x, y in pairs:
+            regression.update(x, y)
+        return regression
+
+
+def _parse_text_chunk(text):
+    """Convertit un bloc de texte (séparateurs , ; espaces) en tableau"""
+    text = text.translate(_SEPARATORS)
+    expected = len(text.split())
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            values = np.fromstring(text, dtype=float, sep=' ')
+    except (ValueError, DeprecationWarning):
+        values = None
+    if values is None or values.size != expected:
+        raise ValueError("Valeur non numérique dans le flux")
+    return values
+
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Découpe une source de valeurs en blocs NumPy.
+
+    :param source: Fichier texte ou binaire (nombres séparés par des virgules,
+                   points-virgules ou blancs), socket, tableau, ou itérable de
+                   nombres ou de blocs.
+    :param chunk_size: Nombre de valeurs (ou d'octets pour un flux) par bloc.
+    """
+    if hasattr(source, 'makefile') and not hasattr(source, 'read'):
+        source = source.makefile('rb')
+    if hasattr(source, 'read'):
+        rest = ''
+        while True:
+            data = source.read(chunk_size)
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            if not data:
+                break
+            data = rest + data
+            # Le dernier nombre peut être coupé: on le garde pour le bloc suivant
+            cut = max(data.rfind(c) for c in ', ;\n\t\r')
+            rest, data = data[cut + 1:], data[:cut + 1]
+            if data.strip():
+                yield _parse_text_chunk(data)
+        if rest.strip():
+            yield _parse_text_chunk(rest)
+        return
+    if isinstance(source, np.ndarray):
+        flat = source.ravel()
+        for start in range(0, flat.size, chunk_size):
+            yield flat[start:start + chunk_size]
+        return
+    buffer = []
+    for item in source:
+        if np.ndim(item) == 0:
+            buffer.append(item)
+            if len(buffer) >= chunk_size:
+                yield np.asarray(buffer, dtype=float)
+                buffer = []
+        else:
+            if buffer:
+                yield np.asarray(buffer, dtype=float)
+                buffer = []
+            yield np.asarray(item, dtype=float).ravel()
+    if buffer:
+        yield np.asarray(buffer, dtype=float)
+
+
+def stream_stats(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Résumé count/mean/M2/min/max/variance/std d'une source en un passage"""
+    return RunningStats.from_chunks(iter_chunks(source, chunk_size))
+
+
+def stream_histogram(chunks, bins='auto'):
+    """
+    Histogramme d'une source relisible en deux passes et en mémoire bornée:
+    la première fixe les bornes (min, max et quartiles approchés pour 'auto'),
+    la seconde cumule les effectifs bloc par bloc.
+
+    :param chunks: Fonction sans argument retournant un nouvel itérateur de blocs.
+    :param bins: Nombre de classes, 'auto' (règle de np.histogram), 'log' ou 'log:N'.
+    :return: Tuple (effectifs, bornes) comme np.histogram.
+    """
+    automatic = bin_rule(bins)[1] is None
+    summary = RunningStats()
+    sketch = QuantileSketch()
+    for chunk in chunks():
+        summary.update(chunk)
+        if automatic:
+            sketch.update(chunk)
+    if summary.count == 0:
+        raise ValueError("Aucune valeur")
+    quartiles = sketch.percentiles([25, 75]) if automatic else None
+    histogram = Histogram.for_values(bins, summary.min, summary.max, summary.count, quartiles)
+    for chunk in chunks():
+        histogram.update(chunk)
+    return histogram.counts, histogram.edges
@@ -1,3 +1,9 @@
+import json
+import math
+import sys
+import numpy as np
+
+
 class View:
     @staticmethod
     def print_menu():
@@ -76,16 +82,27 @@ class View:
         print("   Exemple: median(1,2,3,4,5)")
         print("\n3. Mode: mode(valeur1,valeur2,...)")
         print("   Exemple: mode(1,2,2,3,3,3)")
+        print("   Valeurs les plus fréquentes: mode(1,2,2,3,3,3;2)")
         print("\n4. Écart-type: std(valeur1,valeur2,...)")
         print("   Exemple: std(1,2,3,4,5)")
         print("\n5. Variance: var(valeur1,valeur2,...)")
         print("   Exemple: var(1,2,3,4,5)")
         print("\n6. Percentile: percentile(valeur1,valeur2,...;percentile)")
         print("   Exemple: percentile(1,2,3,4,5;75)")
+        print("   Plusieurs percentiles: percentile(1,2,3,4,5;50,90,99)")
         print("\n7. Corrélation: correlation(liste1;liste2)")
         print("   Exemple: correlation(1,2,3;4,5,6)")
+        print("   Matrice: corrmatrix(liste1;liste2;...;method=spearman)")
         print("\n8. Régression: regression(liste1;liste2)")
         print("   Exemple: regression(1,2,3;4,5,6)")
+        print("   Multiple: regression(x1;x2;...;y), options ;weights=w1,w2,... et ;ridge=valeur")
+        print("   Exemple: regression(1,2,3,4;2,1,4,3;5,6,8,9;weights=1,1,2,2)")
+        print("\n9. Résumé complet: describe(valeur1,valeur2,...;percentile1,...)")
+        print("   Exemple: describe(1,2,2,3,4;90)")
+        print("\nDonnées binaires: remplacez une liste par @fichier (.npy, .f64, .f32)")
+        print("   Exemple: mean(@mesures.npy), percentile(@mesures.f32;99), heatmap(@matrice.npy)")
+        print("   Colonne d'un .npy 2D: @table.npy:2, type d'un .bin: @donnees.bin:float32")
+        print("   Colonne CSV lue par blocs: mean(@mesures.csv:temperature), regression(@t.csv:x;@t.csv:y)")
         
         print("\nVisualisation:")
         print("1. Tracer une fonction: plot(f(x), x_min, x_max)")
@@ -94,6 +111,7 @@ class View:
         print("   Exemple: scatter(1,2,3,4,5,6)")
         print("\n3. Histogramme: histogram(valeur1,valeur2,...)")
         print("   Exemple: histogram(1,2,2,3,3,3,4,4,5)")
+        print("   Classes: histogram(valeurs;bins=20), bins=auto (défaut), bins=log ou bins=log:30")
         print("\n4. Graphique polaire: polar(r(theta), theta_min, theta_max)")
         print("   Exemple: polar(2*sin(theta), 0, 2*pi)")
         print("\n5. Surface 3D: 3d(z(x,y), x_min, x_max, y_min, y_max)")
@@ -104,7 +122,28 @@ class View:
         print("   Exemple: qqplot(1,2,3,4,5)")
         print("\n8. Carte de chaleur: heatmap(valeur1,valeur2,...;valeur3,valeur4,...)")
         print("   Exemple: heatmap(1,2,3;4,5,6)")
+        print("   Corrélations: heatmap(corrmatrix(1,2,3;4,5,7;3,2,1))")
         print("\n9. Diagramme circulaire: pie(valeur1,valeur2,...;label1,label2,...)")
         print("   Exemple: pie(30,20,50;A,B,C)")
         print("\n10. Diagramme en barres: bar(valeur1,valeur2,...;label1,label2,...)")
-        print("    Exemple: bar(10,20,30;A,B,C)") 
\ No newline at end of file
+        print("    Exemple: bar(10,20,30;A,B,C)") 
+
+    @staticmethod
+    def write_record(record, stream=None):
+        """Écrit un enregistrement JSON sur une ligne (format NDJSON)"""
+        stream = sys.stdout if stream is None else stream
+        stream.write(json.dumps(View._to_json(record), ensure_ascii=False))
+        stream.write("\n")
+
+    @staticmethod
+    def _to_json(value):
+        """Convertit un résultat (types NumPy, NaN, ...) en valeur sérialisable"""
+        if isinstance(value, dict):
+            return {str(k): View._to_json(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return [View._to_json(v) for v in value]
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
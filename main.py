@@ -1,4 +1,37 @@
+import argparse
+import sys
 from calculate.controller import Controller
 
+
+def job_count(text):
+    """Nombre de processus de --jobs: entier positif ou nul (0 pour tous les cœurs)"""
+    try:
+        jobs = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"nombre de processus invalide: {text}")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError("le nombre de processus doit être positif ou nul")
+    return jobs
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Calculatrice scientifique")
+    parser.add_argument(
+        '--batch', metavar='FICHIER',
+        help="exécute les commandes du fichier (une par ligne, '-' pour stdin) "
+             "et écrit les résultats en NDJSON sur stdout")
+    parser.add_argument(
+        '--jobs', metavar='N', type=job_count, default=1,
+        help="nombre de processus du mode batch (0 pour tous les cœurs)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    Controller().run()
+    args = parse_args()
+    if args.batch is None:
+        Controller().run()
+    elif args.batch == '-':
+        Controller().run_batch(sys.stdin, jobs=args.jobs or None)
+    else:
+        with open(args.batch, encoding='utf-8') as stream:
+            Controller().run_batch(stream, jobs=args.jobs or None)
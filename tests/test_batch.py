@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+from calculate.batch import batch, batch_operations
+
+class TestBatch:
+    """Tests pour le module batch."""
+
+    def test_unary_ufunc(self):
+        """Test d'un opérateur unaire vectorisé."""
+        result = batch('sin', np.array([0.0, np.pi / 2]))
+        np.testing.assert_allclose(result['values'], [0.0, 1.0], atol=1e-12)
+        assert not result['errors'].any()
+
+    def test_binary_broadcast(self):
+        """Test d'un opérateur binaire avec diffusion d'un scalaire."""
+        result = batch('^', np.array([1.0, 2.0, 3.0]), 2)
+        assert result['values'].tolist() == [1.0, 4.0, 9.0]
+
+    def test_domain_error_mask(self):
+        """Test du masque d'erreurs de domaine."""
+        result = batch('sqrt', [4, -1, 9])
+        assert result['errors'].tolist() == [False, True, False]
+        assert np.isnan(result['values'][1])
+        assert batch('log', [1, 0, -2])['errors'].tolist() == [False, True, True]
+        assert batch('/', [1, 2], [0, 2])['errors'].tolist() == [True, False]
+        assert batch('%', [5, 5], [0, 3])['errors'].tolist() == [True, False]
+
+    def test_factorial(self):
+        """Test de la factorielle vectorisée."""
+        result = batch('!', [0, 5, 2.5, -1, 171])
+        assert result['values'][:2].tolist() == [1.0, 120.0]
+        assert result['errors'].tolist() == [False, False, True, True, True]
+
+    def test_invalid_operator(self):
+        """Test des opérateurs ou arités invalides."""
+        with pytest.raises(ValueError):
+            batch('mean', [1, 2])
+        with pytest.raises(ValueError):
+            batch('+', [1, 2])
+
+    def test_batch_operations(self):
+        """Test de l'évaluation d'une liste d'opérations textuelles."""
+        result = batch_operations(["2 + 3", "sqrt(16)", "5!", "2 - -3", "log(0)", "abc", "1 / 0"])
+        assert result['values'][:4].tolist() == [5.0, 4.0, 120.0, 5.0]
+        assert result['errors'].tolist() == [False, False, False, False, True, True, True]
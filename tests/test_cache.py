@@ -0,0 +1,125 @@
+import os
+import time
+import pytest
+import numpy as np
+from calculate.cache import LRUCache, RenderCache
+
+class TestLRUCache:
+    """Tests pour le module cache."""
+
+    def test_get_put(self):
+        """Test de l'ajout et de la lecture."""
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_eviction_order(self):
+        """Test de l'éviction de l'entrée la moins récemment utilisée."""
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert cache.stats()['evictions'] == 1
+
+    def test_get_or_create(self):
+        """Test de la construction paresseuse des valeurs."""
+        cache = LRUCache(maxsize=4)
+        calls = []
+        factory = lambda: calls.append(1) or len(calls)
+        assert cache.get_or_create('k', factory) == 1
+        assert cache.get_or_create('k', factory) == 1
+        assert len(calls) == 1
+
+    def test_invalid_size(self):
+        """Test d'une taille invalide."""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestRenderCache:
+    """Tests pour le cache des images rendues."""
+
+    def test_make_key(self):
+        """Test de l'empreinte: même contenu, même clé."""
+        key = RenderCache.make_key('bar', np.array([1.0, 2.0]), ['A', 'B'], (10, 6))
+        assert key == RenderCache.make_key('bar', np.array([1.0, 2.0]), ['A', 'B'], (10, 6))
+        assert key != RenderCache.make_key('bar', np.array([1.0, 3.0]), ['A', 'B'], (10, 6))
+        assert key != RenderCache.make_key('pie', np.array([1.0, 2.0]), ['A', 'B'], (10, 6))
+        assert RenderCache.make_key('a', 1) != RenderCache.make_key('a', 1.0)
+
+    def test_byte_bound(self):
+        """Test de l'éviction selon la taille totale en octets."""
+        cache = RenderCache(max_bytes=10)
+        cache.put('a', b'12345')
+        cache.put('b', b'12345')
+        cache.get('a')
+        cache.put('c', b'123')
+        assert cache.get('b') is None
+        assert cache.get('a') == b'12345'
+        cache.put('big', b'x' * 11)
+        assert cache.get('big') is None
+        assert cache.stats()['bytes'] <= 10
+
+    def test_ttl(self):
+        """Test de l'expiration des entrées."""
+        now = [0.0]
+        cache = RenderCache(ttl=60, clock=lambda: now[0])
+        cache.put('a', b'image')
+        now[0] = 59
+        assert cache.get('a') == b'image'
+        now[0] = 61
+        assert cache.get('a') is None
+        assert cache.stats()['size'] == 0
+
+    def test_disk_tier(self, tmp_path):
+        """Test du niveau disque partagé entre instances."""
+        RenderCache(directory=str(tmp_path)).put('abcdef', b'image')
+        other = RenderCache(directory=str(tmp_path))
+        assert other.get('abcdef') == b'image'
+        assert other.get('abcdef') == b'image'
+        assert other.stats()['disk_hits'] == 1 and other.stats()['hits'] == 1
+        assert other.get('inconnu') is None
+
+    def test_disk_bound(self, tmp_path):
+        """Test de la borne en octets du niveau disque (images les moins récemment utilisées supprimées)."""
+        cache = RenderCache(max_bytes=10, directory=str(tmp_path), max_disk_bytes=250)
+        for index, key in enumerate(['aa1', 'bb2', 'cc3']):
+            cache.put(key, bytes(100))
+            os.utime(tmp_path / key[:2] / key, (1000 + index, 1000 + index))
+        assert not (tmp_path / 'aa' / 'aa1').exists()
+        assert cache.stats()['disk_bytes'] == 200 and cache.stats()['disk_evictions'] == 1
+        # bb2 relu: c'est cc3 qui est supprimé à l'écriture suivante
+        os.utime(tmp_path / 'cc' / 'cc3', (1003, 1002))
+        assert RenderCache(directory=str(tmp_path)).get('bb2') == bytes(100)
+        cache.put('dd4', bytes(100))
+        assert (tmp_path / 'bb' / 'bb2').exists() and not (tmp_path / 'cc' / 'cc3').exists()
+        assert RenderCache(directory=str(tmp_path)).stats()['disk_bytes'] == 200
+
+    def test_disk_expired_deleted(self, tmp_path):
+        """Test de la suppression d'une image expirée lors de sa lecture sur disque."""
+        now = [time.time()]
+        RenderCache(directory=str(tmp_path)).put('abcdef', b'image')
+        cache = RenderCache(ttl=60, directory=str(tmp_path), clock=lambda: now[0])
+        now[0] += 120
+        assert cache.get('abcdef') is None
+        assert not (tmp_path / 'ab' / 'abcdef').exists()
+        assert cache.stats()['disk_bytes'] == 0
+
+    def test_get_or_render(self):
+        """Test du rendu paresseux."""
+        cache = RenderCache()
+        calls = []
+        render = lambda: calls.append(1) or b'png'
+        assert cache.get_or_render('k', render) == b'png'
+        assert cache.get_or_render('k', render) == b'png'
+        assert len(calls) == 1
+        with pytest.raises(ValueError):
+            RenderCache(max_bytes=0)
+        with pytest.raises(ValueError):
+            RenderCache(max_disk_bytes=0)
@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from calculate.chunked import parallel_stats, parallel_percentile, stream_percentile
+from calculate.operators import Operators
+
+class TestChunked:
+    """Tests pour le module chunked."""
+
+    @pytest.fixture
+    def values(self):
+        """Fixture d'une série asymétrique."""
+        return np.random.default_rng(2).lognormal(0, 2, 200001)
+
+    def test_parallel_stats(self, values):
+        """Test de la fusion des moyennes et variances par blocs."""
+        accumulator = parallel_stats(values, threads=4, chunk_size=10000)
+        assert accumulator.count == values.size
+        assert accumulator.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert accumulator.variance == pytest.approx(values.var(), rel=1e-12)
+
+    def test_parallel_percentile_exact(self, values):
+        """Test des percentiles exacts face à np.percentile."""
+        q = [0, 0.1, 25, 50, 73.3, 99.9, 100]
+        result = parallel_percentile(values, q, threads=4, chunk_size=10000)
+        np.testing.assert_array_equal(result, np.percentile(values, q))
+        assert parallel_percentile(values, 50, chunk_size=10000) == np.median(values)
+
+    def test_stream_percentile(self, values):
+        """Test des percentiles exacts d'une série relue par blocs."""
+        q = [0, 1, 50, 99.5, 100]
+        read = lambda: (values[start:start + 7000] for start in range(0, values.size, 7000))
+        np.testing.assert_array_equal(stream_percentile(read, q), np.percentile(values, q))
+        with pytest.raises(ValueError, match="Aucune valeur"):
+            stream_percentile(lambda: iter([]), 50)
+
+    def test_duplicates_and_constant(self):
+        """Test des séries à valeurs répétées ou constantes."""
+        values = np.random.default_rng(4).integers(0, 4, 50000).astype(float)
+        np.testing.assert_array_equal(parallel_percentile(values, [10, 50, 90], chunk_size=7000),
+                                      np.percentile(values, [10, 50, 90]))
+        assert parallel_percentile(np.full(1000, 3.0), 50, chunk_size=100) == 3.0
+
+    def test_infinite(self, values):
+        """Test des valeurs infinies, placées aux extrémités comme dans np.percentile."""
+        series = np.concatenate([values, [np.inf, -np.inf, np.inf]])
+        q = [1, 25, 50, 99]
+        np.testing.assert_array_equal(parallel_percentile(series, q, chunk_size=10000),
+                                      np.percentile(series, q))
+        operators = Operators()
+        operators.parallel_threshold = 5
+        assert operators.median('median(1,2,3,4,5,inf)') == 3.5
+        read = lambda: iter([np.array([-np.inf, 1.0]), np.array([2.0, np.inf])])
+        assert stream_percentile(read, 50) == 1.5
+
+    def test_nan_and_empty(self):
+        """Test des valeurs manquantes et de la série vide."""
+        assert np.isnan(parallel_percentile(np.array([1.0, np.nan, 2.0]), 50))
+        with pytest.raises(ValueError, match="Aucune valeur"):
+            parallel_percentile(np.empty(0), 50)
+
+    def test_operators_threshold(self, values):
+        """Test du seuil de bascule vers le chemin parallèle dans Operators."""
+        operators = Operators()
+        operators.parallel_threshold = 1000
+        text = ','.join(map(str, values[:5001].round(6)))
+        series = np.array(values[:5001].round(6))
+        assert operators.mean(f'mean({text})') == pytest.approx(series.mean())
+        assert operators.variance(f'var({text})') == pytest.approx(series.var())
+        assert operators.median(f'median({text})') == np.median(series)
+        np.testing.assert_array_equal(operators.percentile(f'percentile({text};5,95)'),
+                                      np.percentile(series, [5, 95]))
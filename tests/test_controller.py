@@ -235,4 +235,50 @@ class TestController:
         mock_get_input.side_effect = ["21", "correlation(1,2,3;4,5,6)", "34"]  # Corrélation
         controller.run()
         mock_print_result.assert_called_once()
-        mock_continue.assert_called_once() 
\ No newline at end of file
+        mock_continue.assert_called_once() 
+
+    def test_run_batch(self, controller):
+        """Test du mode non interactif (NDJSON)."""
+        import io
+        import json
+        lines = ["mean(1,2,3)", "", "# commentaire", "2 + 3", "sqrt(-1)", "1+2*3"]
+        output = io.StringIO()
+        with patch('calculate.view.View.print_menu') as mock_menu, \
+                patch('calculate.view.View.continue_message') as mock_continue:
+            count = controller.run_batch(lines, output)
+            mock_menu.assert_not_called()
+            mock_continue.assert_not_called()
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert count == 4
+        assert records[0] == {'operation': 'mean(1,2,3)', 'result': 2.0}
+        assert records[1]['result'] == 5
+        assert 'error' in records[2]
+        assert records[3]['result'] == 7
+
+    def test_registry_dispatch(self, controller):
+        """Test de la table de dispatch construite au démarrage."""
+        assert controller.registry.by_code("15")("mean(1,2,3)") == 2
+        assert controller.registry.by_name("3d").__name__ == "plot_3d"
+        # Les méthodes sont résolues à l'appel: un opérateur remplacé est utilisé
+        controller.operator = MagicMock(spec=Operators)
+        controller.operator.visualize.return_value = "ok"
+        assert controller.registry.by_code("27")("plot(x, 0, 1)") == "ok"
+        controller.operator.visualize.assert_called_once_with("plot(x, 0, 1)")
+
+    def test_plugins(self):
+        """Test de l'enregistrement d'opérations par un plugin."""
+        def plugin(registry):
+            registry.register('double', lambda operation: 2 * float(operation[7:-1]), code='35')
+
+        controller = Controller(plugins=[plugin])
+        assert controller._is_input_valid("35")
+        assert controller.registry.execute("double(21)") == 42
+        # Plugins fournis par un générateur: installés une seule fois, conservés pour les workers
+        controller = Controller(plugins=(p for p in [plugin]))
+        assert controller.registry.execute("double(21)") == 42
+        assert controller.plugins == (plugin,)
+
+    def test_registry_extra_operations(self, controller):
+        """Test des opérations sans code de menu, accessibles par leur nom."""
+        result = controller.registry.execute("describe(1,2,3)")
+        assert result['median'] == 2
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from scipy import stats
+from calculate.correlation import correlation_matrix
+
+class TestCorrelation:
+    """Tests pour le module correlation."""
+
+    @pytest.fixture
+    def series(self):
+        """Fixture de séries corrélées."""
+        rng = np.random.default_rng(5)
+        base = rng.normal(size=300)
+        return np.array([base + rng.normal(0, s, 300) for s in (0.1, 0.5, 1, 2, 4)])
+
+    def test_pearson_matches_corrcoef(self, series):
+        """Test de la matrice de Pearson face à np.corrcoef."""
+        np.testing.assert_allclose(correlation_matrix(series), np.corrcoef(series), atol=1e-12)
+
+    def test_blocks(self, series):
+        """Test du calcul par blocs (résultat identique)."""
+        np.testing.assert_allclose(correlation_matrix(series, block_size=2), np.corrcoef(series), atol=1e-12)
+
+    def test_spearman(self, series):
+        """Test de la matrice de Spearman."""
+        expected = stats.spearmanr(series, axis=1)[0]
+        np.testing.assert_allclose(correlation_matrix(series, 'spearman'), expected, atol=1e-12)
+
+    def test_constant_series(self):
+        """Test d'une série constante (NaN)."""
+        result = correlation_matrix([[1, 2, 3], [5, 5, 5]])
+        assert np.isnan(result[1, 1]) and np.isnan(result[0, 1])
+        assert result[0, 0] == 1
+
+    def test_invalid(self):
+        """Test des entrées invalides."""
+        with pytest.raises(ValueError):
+            correlation_matrix([[1, 2, 3]])
+        with pytest.raises(ValueError):
+            correlation_matrix([[1, 2, 3], [1, 2]])
+        with pytest.raises(ValueError):
+            correlation_matrix([[1, 2, 3], [3, 2, 1]], method='kendall')
@@ -0,0 +1,177 @@
+import pytest
+import numpy as np
+from scipy import stats
+from calculate.datasource import is_reference, split_reference, load_array, CsvColumn, iter_aligned
+from calculate.streaming import stream_histogram
+from calculate.operators import Operators
+
+class TestDatasource:
+    """Tests pour le module datasource."""
+
+    @pytest.fixture
+    def values(self):
+        """Fixture de valeurs aléatoires."""
+        return np.random.default_rng(3).normal(size=1000)
+
+    def test_is_reference(self):
+        """Test de la détection des références @fichier."""
+        assert is_reference(' @data.npy')
+        assert not is_reference('1,2,3')
+
+    def test_split_reference(self):
+        """Test du découpage chemin / sélecteur."""
+        assert split_reference('@data.npy') == ('data.npy', None)
+        assert split_reference('@data.bin:float32') == ('data.bin', 'float32')
+        assert split_reference('@C:\\data.npy') == ('C:\\data.npy', None)
+
+    def test_npy_memory_mapped(self, tmp_path, values):
+        """Test du chargement .npy projeté en mémoire."""
+        path = tmp_path / 'data.npy'
+        np.save(path, values)
+        loaded = load_array(f'@{path}')
+        assert isinstance(loaded, np.memmap)
+        assert not loaded.flags.writeable
+        np.testing.assert_array_equal(loaded, values)
+
+    def test_npy_column(self, tmp_path, values):
+        """Test de la sélection d'une colonne d'un .npy 2D."""
+        path = tmp_path / 'table.npy'
+        np.save(path, values.reshape(-1, 4))
+        np.testing.assert_array_equal(load_array(f'@{path}:1'), values.reshape(-1, 4)[:, 1])
+        with pytest.raises(ValueError, match="Colonne invalide"):
+            load_array(f'@{path}:4')
+
+    def test_raw_floats(self, tmp_path, values):
+        """Test des flottants bruts float64 et float32."""
+        values.tofile(tmp_path / 'data.f64')
+        values.astype(np.float32).tofile(tmp_path / 'data.bin')
+        np.testing.assert_array_equal(load_array(f"@{tmp_path / 'data.f64'}"), values)
+        loaded = load_array(f"@{tmp_path / 'data.bin'}:float32")
+        assert loaded.dtype == np.float32
+        np.testing.assert_allclose(loaded, values, rtol=1e-6)
+
+    def test_errors(self, tmp_path):
+        """Test des erreurs (fichier absent, format, taille, type)."""
+        with pytest.raises(ValueError, match="introuvable"):
+            load_array(f"@{tmp_path / 'absent.npy'}")
+        (tmp_path / 'data.txt').write_text('1,2')
+        with pytest.raises(ValueError, match="non supporté"):
+            load_array(f"@{tmp_path / 'data.txt'}")
+        (tmp_path / 'data.f64').write_bytes(b'\0' * 12)
+        with pytest.raises(ValueError, match="incompatible"):
+            load_array(f"@{tmp_path / 'data.f64'}")
+        with pytest.raises(ValueError, match="Type de données"):
+            load_array(f"@{tmp_path / 'data.f64'}:complex128")
+
+    def test_operators(self, tmp_path, values):
+        """Test des références dans les commandes statistiques."""
+        operators = Operators()
+        path = tmp_path / 'data.npy'
+        np.save(path, values)
+        assert operators.mean(f'mean(@{path})') == pytest.approx(values.mean())
+        assert operators.percentile(f'percentile(@{path};90)') == pytest.approx(np.percentile(values, 90))
+        np.save(tmp_path / 'table.npy', np.column_stack([values, 2 * values + 1]))
+        table = tmp_path / 'table.npy'
+        assert operators.correlation(f'correlation(@{table}:0;@{table}:1)') == pytest.approx(1.0)
+        assert operators._parse_matrix(f'heatmap(@{table})', 'heatmap').shape == (1000, 2)
+
+
+class TestCsvColumn:
+    """Tests pour la lecture par blocs des colonnes CSV."""
+
+    @pytest.fixture
+    def table(self, tmp_path):
+        """Fixture d'un CSV avec en-tête (x, y = 2x + 1 + bruit)."""
+        rng = np.random.default_rng(8)
+        x = rng.normal(size=2500)
+        y = 2 * x + 1 + rng.normal(0, 0.1, 2500)
+        path = tmp_path / 'table.csv'
+        lines = ['x;y'] + [f'{a};{b}' for a, b in zip(x.tolist(), y.tolist())]
+        path.write_text('\n'.join(lines) + '\n')
+        return path, x, y
+
+    def test_header_and_delimiter(self, table):
+        """Test de la détection de l'en-tête et du séparateur."""
+        path, x, y = table
+        column = CsvColumn(str(path), 'y', chunk_rows=1000)
+        assert column.has_header and column.delimiter == ';'
+        assert [len(c) for c in column.chunks()] == [1000, 1000, 500]
+        np.testing.assert_array_equal(column.to_array(), y)
+        np.testing.assert_array_equal(CsvColumn(str(path), '0').to_array(), x)
+
+    def test_without_header(self, tmp_path):
+        """Test d'un CSV sans en-tête."""
+        path = tmp_path / 'data.csv'
+        path.write_text('1,10\n2,20\n3,30\n')
+        column = CsvColumn(str(path), '1')
+        assert not column.has_header
+        assert column.to_array().tolist() == [10, 20, 30]
+
+    def test_errors(self, tmp_path, table):
+        """Test des colonnes inconnues et des valeurs manquantes."""
+        path = table[0]
+        with pytest.raises(ValueError, match="Colonne inconnue"):
+            CsvColumn(str(path), 'z')
+        with pytest.raises(ValueError, match="Colonne invalide"):
+            CsvColumn(str(path), '5')
+        bad = tmp_path / 'bad.csv'
+        bad.write_text('a,b\n1,2\n3,\n')
+        with pytest.raises(ValueError, match="non numérique"):
+            CsvColumn(str(bad), 'b').to_array()
+
+    def test_operators_edge_cases(self, tmp_path):
+        """Test des colonnes CSV vides ou contenant des infinis."""
+        operators = Operators()
+        empty = tmp_path / 'empty.csv'
+        empty.write_text('a,b\n')
+        for command in ('mean', 'var', 'std', 'median'):
+            with pytest.raises(ValueError, match="Aucune valeur"):
+                operators.execute(f'{command}(@{empty}:a)')
+        infinite = tmp_path / 'infinite.csv'
+        infinite.write_text('a\n1\n2\ninf\n3\n4\n5\n')
+        assert operators.median(f'median(@{infinite}:a)') == 3.5
+        np.testing.assert_array_equal(operators.percentile(f'percentile(@{infinite}:a;10,50)'),
+                                      np.percentile([1, 2, np.inf, 3, 4, 5], [10, 50]))
+
+    def test_iter_aligned(self, table):
+        """Test du parcours parallèle d'une colonne et d'un tableau."""
+        path, x, y = table
+        column = CsvColumn(str(path), 'x', chunk_rows=700)
+        pairs = list(iter_aligned([column, y]))
+        assert len(pairs) == 4
+        np.testing.assert_array_equal(np.concatenate([p[1] for p in pairs]), y)
+        with pytest.raises(ValueError, match="même longueur"):
+            list(iter_aligned([column, y[:10]]))
+
+    def test_operators(self, table):
+        """Test des opérateurs statistiques sur des colonnes CSV."""
+        path, x, y = table
+        operators = Operators()
+        assert operators.mean(f'mean(@{path}:x)') == pytest.approx(x.mean())
+        assert operators.variance(f'var(@{path}:x)') == pytest.approx(x.var())
+        assert operators.median(f'median(@{path}:x)') == np.median(x)
+        np.testing.assert_array_equal(operators.percentile(f'percentile(@{path}:y;10,90)'),
+                                      np.percentile(y, [10, 90]))
+        operators.quantile_error = 0.001
+        result = operators.percentile(f'percentile(@{path}:y;10,90)')
+        ranks = [np.mean(y <= value) for value in result]
+        np.testing.assert_allclose(ranks, [0.1, 0.9], atol=0.005)
+        operators.quantile_error = None
+        assert operators.correlation(f'correlation(@{path}:x;@{path}:y)') == pytest.approx(np.corrcoef(x, y)[0, 1])
+        regression = operators.linear_regression(f'regression(@{path}:x;@{path}:y)')
+        assert regression['slope'] == pytest.approx(stats.linregress(x, y).slope)
+        ridge = operators.linear_regression(f'regression(@{path}:x;@{path}:y;ridge=0)')
+        assert ridge['slope'] == pytest.approx(regression['slope'])
+        assert operators.histogram(f'histogram(@{path}:x)') == "Graphique sauvegardé dans 'histogram.png'"
+
+    def test_stream_histogram(self, table):
+        """Test de l'histogramme en deux passes face à np.histogram."""
+        path, x, y = table
+        column = CsvColumn(str(path), 'x', chunk_rows=300)
+        counts, edges = stream_histogram(column.chunks, bins=15)
+        expected_counts, expected_edges = np.histogram(x, 15)
+        np.testing.assert_allclose(edges, expected_edges)
+        np.testing.assert_array_equal(counts, expected_counts)
+        counts, edges = stream_histogram(column.chunks)
+        assert counts.sum() == x.size
+        assert abs(len(counts) - len(np.histogram_bin_edges(x, 'auto')) + 1) <= 2
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from calculate.decimate import minmax, lttb, decimate_line, bin_points, padded_limits
+from calculate.figures import FigurePool
+from calculate.operators import Operators
+
+class TestDecimate:
+    """Tests pour le module decimate."""
+
+    @pytest.fixture
+    def line(self):
+        """Fixture d'une courbe bruitée de 200 000 points."""
+        x = np.linspace(0, 10, 200000)
+        y = np.sin(x) + np.random.default_rng(6).normal(0, 0.2, x.size)
+        return x, y
+
+    def test_minmax_envelope(self, line):
+        """Test de la conservation des extrêmes et des extrémités."""
+        x, y = line
+        rx, ry = minmax(x, y, 500)
+        assert rx.size <= 4 * 500
+        assert np.all(np.diff(rx) > 0)
+        assert ry.min() == y.min() and ry.max() == y.max()
+        assert (rx[0], rx[-1]) == (x[0], x[-1])
+        # Chaque classe garde son minimum et son maximum
+        index = np.minimum((x / 10 * 500).astype(int), 499)
+        kept = np.minimum((rx / 10 * 500).astype(int), 499)
+        for bucket in (0, 123, 499):
+            assert ry[kept == bucket].max() == y[index == bucket].max()
+            assert ry[kept == bucket].min() == y[index == bucket].min()
+
+    def test_gaps_preserved(self, line):
+        """Test des coupures (NaN) conservées."""
+        x, y = line
+        y = y.copy()
+        y[50000:50010] = np.nan
+        for method in ('minmax', 'lttb'):
+            rx, ry = decimate_line(x, y, 300, method)
+            gap = np.flatnonzero(np.isnan(ry))
+            assert gap.size == 1
+            assert rx[gap[0] - 1] < x[50000] and rx[gap[0] + 1] > x[50009]
+
+    def test_small_input_unchanged(self):
+        """Test d'une courbe déjà plus petite que la résolution."""
+        x = np.arange(10.0)
+        rx, ry = decimate_line(x, x ** 2, 775)
+        np.testing.assert_array_equal(ry, x ** 2)
+        with pytest.raises(ValueError, match="Méthode"):
+            decimate_line(x, x, 10, 'moyenne')
+
+    def test_lttb(self, line):
+        """Test de LTTB: nombre de points et extrémités."""
+        x, y = line
+        rx, ry = lttb(x, y, 1000)
+        assert rx.size == 1000
+        assert (rx[0], rx[-1]) == (x[0], x[-1])
+        assert np.all(np.diff(rx) > 0)
+
+    def test_bin_points(self):
+        """Test du regroupement d'un nuage sur une grille."""
+        x = np.array([0.1, 0.12, 0.9, np.nan])
+        y = np.array([0.1, 0.11, 0.9, 0.5])
+        bx, by, counts = bin_points(x, y, (0, 1), (0, 1), (10, 10))
+        assert counts.tolist() == [2, 1]
+        np.testing.assert_allclose(bx, [0.15, 0.95])
+        np.testing.assert_allclose(by, [0.15, 0.95])
+        assert padded_limits(np.array([0.0, 10.0]), 0.05) == (-0.5, 10.5)
+
+    def test_line_pixels(self, line):
+        """Test d'un rendu min-max quasi identique au tracé complet."""
+        x, y = line
+        images = []
+        for reduced in (False, True):
+            with FigurePool(0).figure((5, 3)) as (fig, ax):
+                ax.plot(*(decimate_line(x, y, ax.bbox.width) if reduced else (x, y)))
+                fig.canvas.draw()
+                images.append(np.asarray(fig.canvas.buffer_rgba()).astype(int))
+        assert np.mean(images[0] != images[1]) < 0.01
+
+    def test_scatter_binning(self):
+        """Test du nuage de points regroupé au-delà du seuil."""
+        operator = Operators()
+        operator.scatter_binning_threshold = 100
+        coords = ','.join(str(v) for v in np.random.default_rng(1).normal(size=1000).round(3))
+        assert operator.scatter_plot(f"scatter({coords})", output='bytes').startswith(b'\x89PNG')
+
+    def test_settings_in_cache_key(self):
+        """Test de la prise en compte des réglages de réduction dans la clé du cache des rendus."""
+        operator = Operators()
+        coords = ','.join(str(v) for v in np.random.default_rng(2).normal(size=400).round(3))
+        binned = operator.scatter_plot(f"scatter({coords})", output='bytes')
+        operator.scatter_binning_threshold = 100
+        assert operator.scatter_plot(f"scatter({coords})", output='bytes') != binned
+        operator.plot_function("plot(sin(1/x), -1, 1)", output='bytes')
+        misses = operator.render_cache.stats()['misses']
+        operator.line_decimation = 'lttb'
+        operator.plot_function("plot(sin(1/x), -1, 1)", output='bytes')
+        assert operator.render_cache.stats()['misses'] == misses + 1
+
+    def test_plot_decimated_above_budget(self, monkeypatch):
+        """Test de la réduction des courbes échantillonnées au-delà de 4 points par pixel."""
+        import calculate.operators as operators
+        sizes = []
+        original = operators.decimate_line
+
+        def spy(x, y, pixels, method='minmax'):
+            reduced = original(x, y, pixels, method)
+            sizes.append((len(x), len(reduced[0]), pixels))
+            return reduced
+
+        monkeypatch.setattr(operators, 'decimate_line', spy)
+        operator = Operators()
+        operator.render_cache = None
+        operator.plot_points = 20000
+        operator.plot_function("plot(sin(1000*x), -10, 10)", output='bytes')
+        sampled, drawn, pixels = sizes[-1]
+        assert sampled > 4 * pixels
+        assert drawn <= 4 * pixels < sampled
@@ -0,0 +1,58 @@
+import pytest
+from calculate.evaluator import compile_formula, tokenize
+
+class TestEvaluator:
+    """Tests pour le module evaluator."""
+
+    def test_tokenize(self):
+        """Test du découpage en jetons."""
+        assert tokenize("2.5*x") == [('number', 2.5), ('op', '*'), ('name', 'x'), ('end', None)]
+        with pytest.raises(ValueError):
+            tokenize("1 $ 2")
+
+    def test_precedence(self):
+        """Test de la priorité et de l'associativité des opérateurs."""
+        assert compile_formula("1+2*3")() == 7
+        assert compile_formula("(1+2)*3")() == 9
+        assert compile_formula("2^3^2")() == 512
+        assert compile_formula("-2^2")() == -4
+        assert compile_formula("10 - 4 - 3")() == 3
+        assert compile_formula("3!+1")() == 7
+
+    def test_nested_functions(self):
+        """Test des fonctions imbriquées et constantes."""
+        assert compile_formula("sqrt(abs(-16))+1")() == 5
+        assert compile_formula("sin(0)+cos(0)")() == 1
+        assert compile_formula("2*pi")() == pytest.approx(6.283185307179586)
+        assert compile_formula("mean(1,2,3)*median(4,5,6)")() == 10
+
+    def test_variables(self):
+        """Test de la réutilisation d'une formule compilée."""
+        formula = compile_formula("2*x+1")
+        assert formula(x=3) == 7
+        assert formula(x=0) == 1
+        with pytest.raises(ValueError):
+            formula()
+
+    def test_domain_errors(self):
+        """Test des erreurs de domaine."""
+        with pytest.raises(ValueError):
+            compile_formula("1/0")()
+        with pytest.raises(ValueError):
+            compile_formula("log(0)")()
+        with pytest.raises(ValueError):
+            compile_formula("2.5!")()
+        with pytest.raises(ValueError):
+            compile_formula("1000!+1")()
+
+    def test_functions(self):
+        """Test des fonctions à nombre variable d'arguments fournies à la compilation."""
+        assert compile_formula("total(1,2,3)+1", {'total': lambda *v: sum(v)})() == 7
+        with pytest.raises(ValueError):
+            compile_formula("total(1,2)", {})
+
+    def test_syntax_errors(self):
+        """Test des formules mal formées."""
+        for text in ["2 +", "(1+2", "1 2", "foo(2)", "sqrt(1,2)", "*3"]:
+            with pytest.raises(ValueError):
+                compile_formula(text)
@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+from calculate.expression import (compile_expression, evaluate_constant,
+                                  normalize_expression, ExpressionCache)
+
+class TestExpression:
+    """Tests pour le module expression."""
+
+    def test_compile_polynomial(self):
+        """Test d'une expression polynomiale avec l'opérateur ^."""
+        f = compile_expression("x^2 + 1")
+        x = np.linspace(-2, 2, 5)
+        np.testing.assert_allclose(f(x), x ** 2 + 1)
+
+    def test_compile_functions_and_constants(self):
+        """Test des fonctions et constantes autorisées."""
+        f = compile_expression("2*sin(theta) + pi", ('theta',))
+        theta = np.array([0.0, np.pi / 2])
+        np.testing.assert_allclose(f(theta), [np.pi, 2 + np.pi])
+
+    def test_compile_two_variables(self):
+        """Test d'une surface z(x, y) évaluée sur une grille."""
+        f = compile_expression("x^2+y^2", ('x', 'y'))
+        X, Y = np.meshgrid(np.linspace(-1, 1, 3), np.linspace(-1, 1, 4))
+        Z = f(X, Y)
+        assert Z.shape == (4, 3)
+        np.testing.assert_allclose(Z, X ** 2 + Y ** 2)
+
+    def test_domain_errors_become_nan(self):
+        """Test des erreurs de domaine transformées en NaN."""
+        f = compile_expression("log(x) + 1/x")
+        y = f(np.array([-1.0, 0.0, 1.0]))
+        assert np.isnan(y[0])
+        assert np.isnan(y[1])
+        assert y[2] == pytest.approx(1.0)
+
+    def test_constant_expression_broadcast(self):
+        """Test d'une expression constante étendue à la grille."""
+        f = compile_expression("3")
+        np.testing.assert_array_equal(f(np.zeros(4)), [3, 3, 3, 3])
+
+    def test_invalid_expressions(self):
+        """Test des expressions refusées."""
+        with pytest.raises(ValueError):
+            compile_expression("x +")
+        with pytest.raises(ValueError):
+            compile_expression("__import__('os')")
+        with pytest.raises(ValueError):
+            compile_expression("y * 2")
+        with pytest.raises(ValueError):
+            compile_expression("x.real")
+        with pytest.raises(ValueError):
+            compile_expression("'abc'")
+
+    def test_evaluate_constant(self):
+        """Test de l'évaluation des bornes constantes."""
+        assert evaluate_constant("2*pi") == pytest.approx(2 * np.pi)
+        assert evaluate_constant("-10") == -10
+        with pytest.raises(ValueError):
+            evaluate_constant("a")
+        with pytest.raises(ValueError):
+            evaluate_constant("log(-1)")
+
+    def test_normalize_expression(self):
+        """Test de la forme canonique des expressions."""
+        assert normalize_expression(" x ^ 2 ") == "x^2"
+        assert normalize_expression("x**2 + 1") == "x^2+1"
+        assert normalize_expression("sin (x) * exp( -x)") == "sin(x)*exp(-x)"
+
+    def test_normalize_keeps_meaning(self):
+        """Test des espaces significatifs conservés (lexèmes qui fusionneraient)."""
+        assert normalize_expression("2 3") == "2 3"
+        assert normalize_expression("2 e+1") == "2 e+1"
+        assert normalize_expression("x * * 2") == "x* *2"
+        with pytest.raises(ValueError):
+            ExpressionCache().get("2 3")
+        with pytest.raises(ValueError):
+            ExpressionCache().get("x * * 2")
+
+    def test_expression_cache(self):
+        """Test du cache partagé des expressions compilées."""
+        cache = ExpressionCache(maxsize=2)
+        f = cache.get("x ^ 2")
+        assert cache.get("x**2") is f
+        assert cache.get("x^2", ('x', 'y')) is not f
+        cache.get("x+1")
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 3
+        assert stats['evictions'] == 1
@@ -0,0 +1,62 @@
+import threading
+import numpy as np
+import pytest
+from calculate.figures import FigurePool
+
+class TestFigurePool:
+    """Tests pour le module figures."""
+
+    @staticmethod
+    def pixels(fig):
+        """Rendu RGBA d'une figure."""
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+    def test_reuse(self):
+        """Test de la réutilisation d'une figure par taille et projection."""
+        pool = FigurePool()
+        with pool.figure((4, 3)) as (fig, ax):
+            ax.plot([1, 2, 3])
+        with pool.figure((4, 3)) as (again, ax):
+            assert again is fig
+            assert not ax.lines
+        with pool.figure((4, 3), projection='polar') as (polar, ax):
+            assert polar is not fig
+        assert pool.stats()['created'] == 2 and pool.stats()['reused'] == 1
+
+    def test_bounded(self):
+        """Test de la taille maximale de la réserve."""
+        pool = FigurePool(maxsize=2)
+        figures = [pool.acquire((2 + i, 2)) for i in range(3)]
+        for i, (fig, ax) in enumerate(figures):
+            pool.release(fig, (2 + i, 2))
+        assert pool.stats()['idle'] == 2
+        fig, ax = pool.acquire((2, 2))
+        assert fig is not figures[0][0]
+        with pytest.raises(ValueError):
+            FigurePool(maxsize=-1)
+
+    def test_thread_affinity(self):
+        """Test de l'isolement des figures entre threads."""
+        pool = FigurePool()
+        with pool.figure((3, 3)) as (fig, ax):
+            pass
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(pool.acquire((3, 3))[0]))
+        thread.start()
+        thread.join()
+        assert seen[0] is not fig
+
+    def test_reset_matches_new_figure(self):
+        """Test d'un rendu identique sur une figure réutilisée (pie, colorbar)."""
+        pool = FigurePool()
+        with pool.figure((4, 3)) as (fig, ax):
+            ax.pie([1, 2], labels=['a', 'b'])
+        with pool.figure((4, 3)) as (fig, ax):
+            fig.colorbar(ax.imshow([[1, 2], [3, 4]]))
+        with pool.figure((4, 3)) as (fig, ax):
+            ax.plot([1, 3, 2])
+            reused = self.pixels(fig)
+        with FigurePool().figure((4, 3)) as (fresh, ax):
+            ax.plot([1, 3, 2])
+            np.testing.assert_array_equal(self.pixels(fresh), reused)
@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from calculate.frequency import frequencies, mode, top_k, MisraGries
+
+class TestFrequency:
+    """Tests pour le module frequency."""
+
+    def test_mode_small_input(self):
+        """Test du mode sur une petite entrée (table de hachage)."""
+        assert mode([1, 2, 2, 3, 3, 3]) == 3
+        assert mode([2, 2, 1, 1]) == 1
+        assert mode([0.5, 0.25, 0.5]) == 0.5
+
+    def test_large_integer_input(self):
+        """Test du comptage linéaire par bincount."""
+        values = np.random.default_rng(0).integers(-50, 50, 100000).astype(float)
+        values[:5000] = 7
+        uniques, counts = frequencies(values)
+        expected_uniques, expected_counts = np.unique(values, return_counts=True)
+        np.testing.assert_array_equal(uniques, expected_uniques)
+        np.testing.assert_array_equal(counts, expected_counts)
+        assert mode(values) == 7
+
+    def test_large_float_input(self):
+        """Test du chemin par tri pour les flottants."""
+        values = np.concatenate([np.random.default_rng(1).random(10000), [0.125] * 3])
+        assert mode(values) == 0.125
+
+    def test_top_k(self):
+        """Test des k valeurs les plus fréquentes."""
+        assert top_k([1, 2, 2, 3, 3, 3, 4, 4], 3) == [(3.0, 3), (2.0, 2), (4.0, 2)]
+        with pytest.raises(ValueError):
+            top_k([1, 2], 0)
+        with pytest.raises(ValueError):
+            mode([])
+
+    def test_misra_gries(self):
+        """Test du résumé des valeurs fréquentes d'un flux."""
+        rng = np.random.default_rng(2)
+        values = np.concatenate([rng.integers(0, 10000, 50000), [42] * 3000, [7] * 2000]).astype(float)
+        rng.shuffle(values)
+        left = MisraGries(k=20)
+        for chunk in np.array_split(values[:30000], 10):
+            left.update(chunk)
+        right = MisraGries(k=20).update(values[30000:])
+        summary = left.merge(right)
+        assert len(summary.counters) <= 20
+        assert summary.mode() == 42
+        assert [v for v, _ in summary.top_k(2)] == [42.0, 7.0]
+        estimated = dict(summary.top_k())
+        assert 3000 - summary.error <= estimated[42.0] <= 3000
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from calculate.histogram import Histogram, bin_rule, histogram_of, auto_bin_count
+from calculate.chunked import parallel_histogram
+from calculate.operators import Operators
+
+class TestHistogram:
+    """Tests pour le module histogram."""
+
+    @pytest.fixture
+    def values(self):
+        """Fixture de 200 000 valeurs normales."""
+        return np.random.default_rng(9).normal(3, 2, 200000)
+
+    def test_matches_numpy(self, values):
+        """Test des effectifs et bornes identiques à np.histogram (fixe et auto)."""
+        for bins in (1, 7, 100, 'auto'):
+            histogram = histogram_of(values, bins)
+            counts, edges = np.histogram(values, bins)
+            np.testing.assert_array_equal(histogram.counts, counts)
+            np.testing.assert_allclose(histogram.edges, edges)
+        assert histogram.total == values.size
+
+    def test_edges_and_outliers(self):
+        """Test des valeurs sur les bornes, hors bornes et NaN."""
+        histogram = Histogram(0, 1, 10)
+        histogram.update([0, 0.1, 0.3, 0.7, 1.0, -0.5, 1.5, np.nan])
+        np.testing.assert_array_equal(histogram.counts, np.histogram([0, 0.1, 0.3, 0.7, 1.0], 10, (0, 1))[0])
+        assert histogram.total == 5
+        constant = histogram_of([4, 4, 4], 'auto')
+        assert constant.total == 3 and constant.edges[0] < 4 < constant.edges[-1]
+
+    def test_log_bins(self):
+        """Test des classes logarithmiques."""
+        values = np.random.default_rng(1).lognormal(0, 2, 50000)
+        histogram = histogram_of(values, 'log:40')
+        assert histogram.bins == 40
+        np.testing.assert_allclose(np.diff(np.log10(histogram.edges)), np.diff(np.log10(histogram.edges))[0])
+        np.testing.assert_array_equal(histogram.counts, np.histogram(values, histogram.edges)[0])
+        assert histogram_of(values, 'log').bins > 1
+        with pytest.raises(ValueError):
+            histogram_of([-1, 2, 3], 'log')
+
+    def test_merge(self, values):
+        """Test de la fusion des effectifs partiels de blocs."""
+        total = Histogram(values.min(), values.max(), 50)
+        for chunk in np.array_split(values, 7):
+            total.merge(total.empty().update(chunk))
+        np.testing.assert_array_equal(total.counts, np.histogram(values, 50)[0])
+        with pytest.raises(ValueError):
+            total.merge(Histogram(0, 1, 50))
+
+    def test_parallel(self, values):
+        """Test de l'histogramme par blocs en parallèle."""
+        for bins in (30, 'auto', 'log'):
+            positive = np.abs(values) + 1 if bins == 'log' else values
+            histogram = parallel_histogram(positive, bins, threads=3, chunk_size=30000)
+            np.testing.assert_array_equal(histogram.counts, histogram_of(positive, bins).counts)
+
+    def test_bin_rule(self):
+        """Test de l'analyse des règles de classes."""
+        assert bin_rule('auto') == (False, None)
+        assert bin_rule(' 20 ') == (False, 20)
+        assert bin_rule('log') == (True, None)
+        assert bin_rule('log:15') == (True, 15)
+        for invalid in ('0', '2.5', 'abc', '-3'):
+            with pytest.raises(ValueError):
+                bin_rule(invalid)
+        assert auto_bin_count(100, 1, 1, 0, 0) == 1
+
+    def test_operator(self, values, tmp_path):
+        """Test de l'option bins de histogram et de la clé de cache."""
+        operators = Operators()
+        path = tmp_path / 'valeurs.npy'
+        np.save(path, values)
+        auto = operators.histogram(f'histogram(@{path})', output='bytes')
+        fixed = operators.histogram(f'histogram(@{path};bins=20)', output='bytes')
+        assert auto[:8] == fixed[:8] == b'\x89PNG\r\n\x1a\n'
+        assert auto != fixed
+        assert operators.histogram('histogram(1,2,4,8;bins=log)', output='bytes')[:4] == b'\x89PNG'
+        with pytest.raises(ValueError):
+            operators.histogram('histogram(1,2,3;classes=4)')
+        with pytest.raises(ValueError):
+            operators.histogram('histogram(1,2,3;bins=0)')
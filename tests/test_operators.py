@@ -153,6 +153,9 @@ class TestOperators:
         assert operator.mode("mode(1,2,2,3,3,3)") == 3
         assert operator.mode("mode(1,1,2,2)") == 1
         assert operator.mode("mode(0,0,0)") == 0
+        assert operator.mode("mode(1,2,2,3,3,3;2)") == [(3.0, 3), (2.0, 2)]
+        with pytest.raises(ValueError):
+            operator.mode("mode(1,2,2;0)")
         with pytest.raises(ValueError):
             operator.mode("mode(1,a,3)")
 
@@ -188,6 +191,22 @@ class TestOperators:
         with pytest.raises(ValueError):
             operator.correlation("correlation(1,a,3;4,5,6)")
 
+    def test_correlation_matrix(self, operator):
+        """Test de la matrice de corrélation."""
+        matrix = operator.correlation_matrix("corrmatrix(1,2,3;4,5,7;3,2,1)")
+        assert matrix.shape == (3, 3)
+        assert matrix[0, 2] == pytest.approx(-1.0)
+        assert matrix[0, 1] == pytest.approx(np.corrcoef([1, 2, 3], [4, 5, 7])[0, 1])
+        spearman = operator.correlation_matrix("corrmatrix(1,2,3;4,5,7;method=spearman)")
+        assert spearman[0, 1] == pytest.approx(1.0)
+        with pytest.raises(ValueError):
+            operator.correlation_matrix("corrmatrix(1,2,3;4,a,7)")
+
+    def test_heatmap_correlation_matrix(self, operator):
+        """Test de la carte de chaleur alimentée par une matrice de corrélation."""
+        assert "Graphique sauvegardé" in operator.heatmap("heatmap(corrmatrix(1,2,3;4,5,7;3,2,1))")
+        assert "Graphique sauvegardé" in operator.heatmap(np.eye(3))
+
     def test_linear_regression(self, operator):
         """Test de la régression linéaire."""
         result = operator.linear_regression("regression(1,2,3;4,5,6)")
@@ -199,6 +218,21 @@ class TestOperators:
         with pytest.raises(ValueError):
             operator.linear_regression("regression(1,a,3;4,5,6)")
 
+    def test_multiple_regression(self, operator):
+        """Test de la régression multiple, pondérée et ridge."""
+        result = operator.linear_regression("regression(1,2,3,4;2,1,4,3;5,6,8,9;weights=1,1,2,2)")
+        assert result['coefficients'].tolist() == pytest.approx([1.25, 0.25])
+        assert result['intercept'] == pytest.approx(3.25)
+        result = operator.linear_regression("regression(1,2,3;4,5,6;ridge=0)")
+        assert result['slope'] == pytest.approx(1.0)
+        assert result['p_value'] < 1e-6
+        result = operator.linear_regression("regression(1,2,3,4;2,1,4,3;weights=1,1,1,1)")
+        assert result == pytest.approx(operator.linear_regression("regression(1,2,3,4;2,1,4,3)"))
+        with pytest.raises(ValueError):
+            operator.linear_regression("regression(1,2,3;4,5,6;alpha=1)")
+        with pytest.raises(ValueError):
+            operator.linear_regression("regression(1,2,3;4,5,6;7,8)")
+
     # Tests des fonctions de visualisation
     def test_plot_function(self, operator):
         """Test du tracé de fonction."""
@@ -273,7 +307,7 @@ class TestOperators:
     # Tests des fonctions de parsing
     def test_parse_list(self, operator):
         """Test du parsing de liste."""
-        assert operator._parse_list("mean(1,2,3)", "mean") == [1.0, 2.0, 3.0]
+        assert operator._parse_list("mean(1,2,3)", "mean").tolist() == [1.0, 2.0, 3.0]
         with pytest.raises(ValueError):
             operator._parse_list("mean(1,a,3)", "mean")
         with pytest.raises(ValueError):
@@ -282,8 +316,8 @@ class TestOperators:
     def test_parse_two_lists(self, operator):
         """Test du parsing de deux listes."""
         list1, list2 = operator._parse_two_lists("correlation(1,2,3;4,5,6)", "correlation")
-        assert list1 == [1.0, 2.0, 3.0]
-        assert list2 == [4.0, 5.0, 6.0]
+        assert list1.tolist() == [1.0, 2.0, 3.0]
+        assert list2.tolist() == [4.0, 5.0, 6.0]
         with pytest.raises(ValueError):
             operator._parse_two_lists("correlation(1,2,3)", "correlation")
         with pytest.raises(ValueError):
@@ -297,13 +331,15 @@ class TestOperators:
         assert matrix[1, 2] == 6.0
         with pytest.raises(ValueError):
             operator._parse_matrix("heatmap(1,a,3;4,5,6)", "heatmap")
+        with pytest.raises(ValueError):
+            operator._parse_matrix("heatmap(1,2,3;4,5)", "heatmap")
         with pytest.raises(ValueError):
             operator._parse_matrix("heatmap(1,2,3)", "heatmap")
 
     def test_parse_pie_data(self, operator):
         """Test du parsing des données pour le diagramme circulaire."""
         values, labels = operator._parse_pie_data("pie(30,20,50;A,B,C)")
-        assert values == [30.0, 20.0, 50.0]
+        assert values.tolist() == [30.0, 20.0, 50.0]
         assert labels == ["A", "B", "C"]
         with pytest.raises(ValueError):
             operator._parse_pie_data("pie(30,20;A,B,C)")
@@ -313,7 +349,7 @@ class TestOperators:
     def test_parse_bar_data(self, operator):
         """Test du parsing des données pour le diagramme en barres."""
         values, labels = operator._parse_bar_data("bar(10,20,30;A,B,C)")
-        assert values == [10.0, 20.0, 30.0]
+        assert values.tolist() == [10.0, 20.0, 30.0]
         assert labels == ["A", "B", "C"]
         with pytest.raises(ValueError):
             operator._parse_bar_data("bar(10,20;A,B,C)")
@@ -323,9 +359,99 @@ class TestOperators:
     def test_parse_operation_with_percentile(self, operator):
         """Test du parsing d'opération avec percentile."""
         values, p = operator._parse_operation_with_percentile("percentile(1,2,3,4,5;75)", "percentile")
-        assert values == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert values.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
         assert p == 75.0
         with pytest.raises(ValueError):
             operator._parse_operation_with_percentile("percentile(1,2,3;150)", "percentile")
         with pytest.raises(ValueError):
-            operator._parse_operation_with_percentile("percentile(1,a,3;50)", "percentile") 
\ No newline at end of file
+            operator._parse_operation_with_percentile("percentile(1,a,3;50)", "percentile") 
+
+    def test_plot_expression_cache(self, operator):
+        """Test du cache d'expressions partagé par les graphiques."""
+        operator.plot_function("plot(x^2, -1, 1)")
+        operator.plot_function("plot( x ^ 2 , -5, 5)")
+        stats = operator.expression_cache.stats()
+        assert stats['misses'] == 1
+        # Même expression normalisée: l'échantillonneur (et sa fonction compilée) est réutilisé
+        assert len(operator.samplers) == 1
+
+    def test_evaluate(self, operator):
+        """Test de l'évaluation d'expressions complètes."""
+        assert operator.evaluate("1+2*3") == 7
+        assert operator.evaluate("sqrt(16)") == 4
+        assert operator.evaluate("5!") == 120
+        assert operator.evaluate_many(["2 + 3", "2 + 3", "sqrt(2)+1"]) == [5, 5, pytest.approx(2.414213562373095)]
+        assert operator.formula_cache.stats()['misses'] == 5
+        with pytest.raises(ValueError):
+            operator.evaluate("5 / 0")
+        with pytest.raises(ValueError):
+            operator.evaluate("")
+
+    def test_evaluate_overflow(self, operator):
+        """Test du dépassement de capacité signalé par une ValueError."""
+        for formula in ("1000!+1", "171!/1", "exp(1000)", "10^400"):
+            with pytest.raises(ValueError):
+                operator.evaluate(formula)
+
+    def test_evaluate_shares_operators(self, operator):
+        """Test des statistiques d'une formule calculées par les commandes de l'opérateur."""
+        calls = []
+        median = operator.operators['median']
+        operator.operators['median'] = lambda operation: calls.append(operation) or median(operation)
+        assert operator.evaluate("median(4,5,6)*2") == 10
+        assert calls == ["median(4.0,5.0,6.0)"]
+
+    def test_batch(self, operator):
+        """Test de l'API vectorisée des opérateurs scalaires."""
+        result = operator.batch('sqrt', np.array([4.0, -1.0, 9.0]))
+        assert result['values'][[0, 2]].tolist() == [2.0, 3.0]
+        assert result['errors'].tolist() == [False, True, False]
+        result = operator.batch_operations(["2 * 3", "sqrt(-4)"])
+        assert result['values'][0] == 6
+        assert result['errors'].tolist() == [False, True]
+
+    def test_stream_statistics(self, operator):
+        """Test des statistiques en un passage sur un flux."""
+        result = operator.stream_statistics((x for x in [1.0, 2.0, 3.0, 4.0, 5.0]), chunk_size=2)
+        assert result['mean'] == 3
+        assert result['std'] == pytest.approx(1.4142135623730951)
+
+    def test_percentile_sketch_mode(self, operator):
+        """Test des percentiles multiples et du mode approché par sketch."""
+        result = operator.percentile("percentile(1,2,3,4,5;50,75)")
+        assert result.tolist() == [3, 4]
+        operator.quantile_error = 0.01
+        assert operator.median("median(1,2,3,4,5)") == 3
+        sketch = operator.quantile_sketch(np.arange(100001, dtype=float), chunk_size=4096)
+        assert sketch.percentiles(50) == pytest.approx(50000, rel=0.02)
+
+    def test_describe(self, operator):
+        """Test du résumé statistique en une passe."""
+        values = [1, 2, 2, 3, 4, 5]
+        result = operator.describe("describe(1,2,2,3,4,5;90)")
+        assert result['count'] == 6
+        assert result['mean'] == pytest.approx(np.mean(values))
+        assert result['median'] == pytest.approx(np.median(values))
+        assert result['mode'] == 2
+        assert result['std'] == pytest.approx(np.std(values))
+        assert result['variance'] == pytest.approx(np.var(values))
+        assert (result['min'], result['max']) == (1, 5)
+        assert result['percentiles'][90.0] == pytest.approx(np.percentile(values, 90))
+        assert set(operator.describe("describe(1,2,3)")['percentiles']) == {25.0, 75.0}
+        with pytest.raises(ValueError):
+            operator.describe("describe(1,a,3)")
+        with pytest.raises(ValueError):
+            operator.describe("describe(1,2,3;150)")
+
+    def test_stream_mode(self, operator):
+        """Test du mode d'un flux par résumé Misra-Gries."""
+        summary = operator.stream_mode((x % 7 == 0 and 3.0 or x for x in range(1000)), k=10, chunk_size=64)
+        assert summary.mode() == 3.0
+
+    def test_stream_regression(self, operator):
+        """Test de la régression en un passage sur des blocs (x, y)."""
+        pairs = [([1, 2], [4, 5]), ([3], [6])]
+        result = operator.stream_regression(pairs)
+        assert result['slope'] == pytest.approx(1.0)
+        assert result['intercept'] == pytest.approx(3.0)
+        assert result['correlation'] == pytest.approx(1.0)
@@ -0,0 +1,85 @@
+import io
+import json
+import pytest
+from calculate.controller import Controller
+from calculate.parallel import build_tasks, execute_parallel
+from main import parse_args
+
+
+def double(registry):
+    """Plugin de test (niveau module pour être transmis aux processus)."""
+    registry.register('double', lambda operation: 2 * float(operation[7:-1]))
+
+
+class TestParallel:
+    """Tests pour le module parallel."""
+
+    def test_build_tasks(self):
+        """Test du découpage en lots consécutifs, graphiques compris."""
+        operations = ['mean(1,2)', 'plot(x,0,1)', 'sqrt(4)', 'plot(x^2,0,1)', 'abs(-1)']
+        tasks = list(build_tasks(operations, 2))
+        assert tasks == [
+            [(0, 'mean(1,2)'), (1, 'plot(x,0,1)')],
+            [(2, 'sqrt(4)'), (3, 'plot(x^2,0,1)')],
+            [(4, 'abs(-1)')]
+        ]
+
+    def test_streaming(self):
+        """Test de la lecture des commandes au fil de l'exécution (fenêtre bornée)."""
+        read = []
+
+        def operations():
+            for i in range(1000):
+                read.append(i)
+                yield f'abs(-{i})'
+
+        records = execute_parallel(operations(), jobs=1, task_size=4)
+        assert next(records)['result'] == 0
+        assert len(read) < 100
+        assert [r['result'] for r in records] == list(range(1, 1000))
+
+    def test_serialized_visualizations(self, tmp_path, monkeypatch):
+        """Test des graphiques rendus en parallèle, fichier écrit dans l'ordre (dernier gagnant)."""
+        monkeypatch.chdir(tmp_path)
+        operations = ['bar(1,2;A,B)', 'bar(3,1,2;A,B,C)', 'bar(a;A)', 'mean(1,3)']
+        records = list(execute_parallel(operations, jobs=2, serialized={'bar'}, task_size=1))
+        assert records[0]['result'] == records[1]['result'] == "Graphique sauvegardé dans 'bar_chart.png'"
+        assert 'error' in records[2]
+        assert records[3]['result'] == 2
+        expected = Controller().operator.bar_chart('bar(3,1,2;A,B,C)', 'bytes')
+        assert (tmp_path / 'bar_chart.png').read_bytes() == expected
+
+    def test_order_and_errors(self):
+        """Test de l'ordre des résultats et de l'isolement des erreurs."""
+        operations = [f'mean({i},{i + 2})' for i in range(40)] + ['sqrt(-1)', '2 + 3']
+        records = list(execute_parallel(operations, jobs=2))
+        assert [r['operation'] for r in records] == operations
+        assert [r['result'] for r in records[:40]] == [i + 1 for i in range(40)]
+        assert 'error' in records[40]
+        assert records[41]['result'] == 5
+
+    def test_plugins(self):
+        """Test de l'installation des plugins dans chaque processus."""
+        records = list(execute_parallel(['double(21)'], jobs=2, plugins=(double,)))
+        assert records == [{'operation': 'double(21)', 'result': 42.0}]
+
+    def test_empty(self):
+        """Test d'un batch vide."""
+        assert list(execute_parallel([], jobs=2)) == []
+
+    def test_controller_jobs(self):
+        """Test du mode batch parallèle du Controller (sortie identique)."""
+        lines = ["mean(1,2,3)", "# commentaire", "", "percentile(1,2,3,4;50)", "1/0", "1+2*3"]
+        sequential, parallel = io.StringIO(), io.StringIO()
+        assert Controller().run_batch(lines, sequential) == 4
+        assert Controller().run_batch(lines, parallel, jobs=2) == 4
+        assert parallel.getvalue() == sequential.getvalue()
+        assert json.loads(parallel.getvalue().splitlines()[-1])['result'] == 7
+
+    def test_jobs_argument(self, capsys):
+        """Test du rejet d'un nombre de processus négatif par la ligne de commande."""
+        assert parse_args(['--batch', '-', '--jobs', '0']).jobs == 0
+        for invalid in ('-1', 'deux'):
+            with pytest.raises(SystemExit):
+                parse_args(['--jobs', invalid])
+        assert 'positif' in capsys.readouterr().err
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+from calculate.parser import parse_command, parse_numbers
+
+class TestParser:
+    """Tests pour le module parser."""
+
+    def test_parse_numbers(self):
+        """Test de la conversion directe en tableau NumPy."""
+        values = parse_numbers(" 1 , 2.5,-3e2 ")
+        assert isinstance(values, np.ndarray)
+        assert values.tolist() == [1.0, 2.5, -300.0]
+        for text in ["1,a,3", "1,2x", "", "1,,3", "1,2,"]:
+            with pytest.raises(ValueError):
+                parse_numbers(text)
+
+    def test_groups(self):
+        """Test du découpage en groupes séparés par ';'."""
+        command = parse_command("percentile(1,2,3;50)", "percentile")
+        assert len(command) == 2
+        assert command.numbers(0).tolist() == [1.0, 2.0, 3.0]
+        assert command.number(1) == 50.0
+
+    def test_labels(self):
+        """Test des groupes de libellés."""
+        command = parse_command("pie(30,20,50; A, B ,C)", "pie")
+        assert command.labels(1) == ["A", "B", "C"]
+
+    def test_nested_arguments(self):
+        """Test des virgules et parenthèses imbriquées."""
+        command = parse_command("3d(max(x,y)+sin(x), -2, 2, -1, 1)", "3d")
+        assert command.arguments() == ["max(x,y)+sin(x)", "-2", "2", "-1", "1"]
+
+    def test_bare_body(self):
+        """Test du contenu seul, sans l'enveloppe nom(...)."""
+        assert parse_command("1, 2, 3", "mean").numbers().tolist() == [1, 2, 3]
+        command = parse_command("1, 2, 3, 4, 5; 50", "percentile")
+        assert len(command) == 2 and command.number(1) == 50
+        assert parse_command("sin(x), 0, 1", "plot").arguments() == ["sin(x)", "0", "1"]
+
+    def test_invalid_commands(self):
+        """Test des commandes mal formées."""
+        with pytest.raises(ValueError):
+            parse_command("mean(1,2,3)", "median")
+        with pytest.raises(ValueError):
+            parse_command("mean(1,2,3", "mean")
+        with pytest.raises(ValueError):
+            parse_command("plot(sin(x, 0, 1)", "plot").arguments()
+
+    def test_options(self):
+        """Test de la séparation des options nom=valeur."""
+        command = parse_command("regression(1,2;3,4;weights=1,2; ridge = 0.5)", "regression")
+        positional, options = command.options()
+        assert positional == [0, 1]
+        assert options == {'weights': '1,2', 'ridge': ' 0.5'}
@@ -0,0 +1,31 @@
+import pytest
+from calculate.registry import OperationRegistry
+
+class TestOperationRegistry:
+    """Tests pour le module registry."""
+
+    @pytest.fixture
+    def registry(self):
+        """Fixture pour créer un registre avec une fonction de repli."""
+        registry = OperationRegistry(fallback=lambda operation: 'repli')
+        registry.register('double', lambda operation: 'double', code='1')
+        return registry
+
+    def test_lookup(self, registry):
+        """Test de la recherche par code et par nom."""
+        assert registry.has_code('1')
+        assert registry.has_name('double')
+        assert registry.by_code('1')('x') == 'double'
+        assert registry.by_name('double')('x') == 'double'
+        with pytest.raises(ValueError):
+            registry.by_code('2')
+        with pytest.raises(ValueError):
+            registry.by_name('triple')
+
+    def test_execute(self, registry):
+        """Test de l'exécution par nom de commande ou par repli."""
+        assert registry.execute("double(2)") == 'double'
+        assert registry.execute("double(2)+1") == 'repli'
+        assert registry.execute("2 + 3") == 'repli'
+        with pytest.raises(ValueError):
+            OperationRegistry().execute("2 + 3")
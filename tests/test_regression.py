@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+from calculate.regression import design_matrix, least_squares, simple_regression
+
+class TestRegression:
+    """Tests pour le module regression."""
+
+    @pytest.fixture
+    def data(self):
+        """Fixture d'un problème à deux prédicteurs."""
+        rng = np.random.default_rng(4)
+        X = rng.normal(size=(200, 2))
+        y = 1.5 + X @ np.array([2.0, -3.0]) + rng.normal(0, 0.1, 200)
+        return X, y
+
+    def test_design_matrix(self):
+        """Test de la construction de la matrice de conception."""
+        X = design_matrix([[1, 2, 3], [4, 5, 6]])
+        assert X.shape == (3, 3)
+        assert X[:, 0].tolist() == [1, 1, 1]
+        with pytest.raises(ValueError):
+            design_matrix([[1, 2, 3], [4, 5]])
+
+    def test_multiple_regression(self, data):
+        """Test de la régression multiple face à np.linalg.lstsq."""
+        X, y = data
+        result = least_squares(X, y)
+        expected = np.linalg.lstsq(design_matrix(X), y, rcond=None)[0]
+        assert result['intercept'] == pytest.approx(expected[0])
+        np.testing.assert_allclose(result['coefficients'], expected[1:])
+        assert 0.99 < result['r_squared'] <= 1
+
+    def test_weighted_regression(self, data):
+        """Test de la régression pondérée (équivalente à la duplication des points)."""
+        X, y = data
+        weights = np.ones(len(y))
+        weights[:50] = 2
+        result = least_squares(X, y, weights=weights)
+        duplicated = least_squares(np.vstack([X, X[:50]]), np.concatenate([y, y[:50]]))
+        np.testing.assert_allclose(result['coefficients'], duplicated['coefficients'])
+        assert result['r_squared'] == pytest.approx(duplicated['r_squared'])
+
+    def test_ridge_regression(self, data):
+        """Test de la régularisation ridge face à la solution fermée."""
+        X, y = data
+        ridge = 5.0
+        result = least_squares(X, y, ridge=ridge, intercept=False)
+        expected = np.linalg.solve(X.T @ X + ridge * np.eye(2), X.T @ y)
+        np.testing.assert_allclose(result['coefficients'], expected)
+
+    def test_batched_responses(self, data):
+        """Test de l'ajustement de plusieurs réponses en un seul appel."""
+        X, y = data
+        Y = np.column_stack([y, 2 * y, -y])
+        result = least_squares(X, Y)
+        single = least_squares(X, y)
+        assert result['coefficients'].shape == (2, 3)
+        np.testing.assert_allclose(result['coefficients'][:, 1], 2 * single['coefficients'])
+        np.testing.assert_allclose(result['intercept'], np.array([1, 2, -1]) * single['intercept'])
+
+    def test_invalid(self, data):
+        """Test des cas non définis."""
+        X, y = data
+        with pytest.raises(ValueError):
+            least_squares(np.column_stack([X[:, 0], 2 * X[:, 0]]), y)
+        with pytest.raises(ValueError):
+            least_squares(X, y[:-1])
+        with pytest.raises(ValueError):
+            least_squares(X, y, weights=-np.ones(len(y)))
+        with pytest.raises(ValueError):
+            least_squares(X, y, ridge=-1)
+
+    def test_scale_invariant(self):
+        """Test de la colinéarité indépendante de l'échelle des prédicteurs."""
+        x, y = np.array([1.0, 2.0, 3.0, 4.0]), np.array([1.0, 2.0, 3.0, 5.0])
+        small = least_squares(x * 1e-13, y)
+        large = least_squares(x * 1e13, y)
+        reference = least_squares(x, y)
+        assert small['coefficients'][0] * 1e-13 == pytest.approx(reference['coefficients'][0])
+        assert large['coefficients'][0] * 1e13 == pytest.approx(reference['coefficients'][0])
+        with pytest.raises(ValueError):
+            least_squares(np.column_stack([x * 1e-13, x * 2e-13]), y)
+
+    def test_simple_regression(self, data):
+        """Test de la régression simple face à scipy.stats.linregress."""
+        from scipy import stats
+        X, y = data
+        result = simple_regression(X[:, 0], y)
+        expected = stats.linregress(X[:, 0], y)
+        assert result['slope'] == pytest.approx(expected.slope)
+        assert result['intercept'] == pytest.approx(expected.intercept)
+        assert result['r_squared'] == pytest.approx(expected.rvalue ** 2)
+        assert result['p_value'] == pytest.approx(expected.pvalue)
+        weighted = simple_regression(X[:, 0], y, weights=np.full(len(y), 3.0))
+        assert weighted == pytest.approx(result)
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pytest
+from calculate.render import RenderOptions
+from calculate.operators import Operators
+
+class TestRender:
+    """Tests pour le module render et l'option output des graphiques."""
+
+    @pytest.fixture
+    def operator(self):
+        """Fixture pour créer une instance d'Operators."""
+        return Operators()
+
+    def test_options(self):
+        """Test de la déduction du format et de la validation des options."""
+        assert RenderOptions().format == 'png'
+        assert RenderOptions('out/graph.SVG').format == 'svg'
+        assert RenderOptions('bytes', format='pdf', dpi=72).key() == ('bytes', 'pdf', 72)
+        assert RenderOptions.from_output(None) is None
+        assert RenderOptions.from_output('rgba').keeps_figure
+        with pytest.raises(ValueError, match="Format"):
+            RenderOptions('bytes', format='bmp')
+        with pytest.raises(ValueError, match="résolution"):
+            RenderOptions(dpi=0)
+
+    def test_bytes(self, operator, tmp_path, monkeypatch):
+        """Test du rendu en mémoire (PNG, SVG) sans écriture de fichier."""
+        monkeypatch.chdir(tmp_path)
+        png = operator.bar_chart("bar(10,20,30;A,B,C)", output='bytes')
+        assert png.startswith(b'\x89PNG')
+        svg = operator.visualize("pie(30,70;A,B)", RenderOptions('bytes', format='svg'))
+        assert b'<svg' in svg
+        assert os.listdir(tmp_path) == []
+
+    def test_rgba(self, operator):
+        """Test du tampon RGBA et de sa résolution."""
+        buffer = operator.scatter_plot("scatter(1,2,3,4)", output=RenderOptions('rgba', dpi=50))
+        assert isinstance(buffer, memoryview)
+        assert buffer.shape == (300, 500, 4)
+        # La figure du tampon n'est pas réutilisée par le graphique suivant
+        operator.scatter_plot("scatter(5,6,7,8)", output='bytes')
+        assert np.asarray(buffer).shape == (300, 500, 4)
+
+    def test_path(self, operator, tmp_path):
+        """Test de l'écriture dans un fichier choisi par l'appelant."""
+        path = tmp_path / 'courbe.svg'
+        result = operator.plot_function("plot(x^2,-1,1)", output=path)
+        assert result == f"Graphique sauvegardé dans '{path}'"
+        assert path.read_text().lstrip().startswith('<?xml')
+
+    def test_render_cache(self, operator, tmp_path):
+        """Test du cache des rendus: même requête, même image sans nouveau tracé."""
+        first = operator.histogram("histogram(1,2,2,3)", output='bytes')
+        second = operator.histogram("histogram(1.0, 2, 2, 3)", output='bytes')
+        assert second == first
+        assert operator.render_cache.stats()['hits'] == 1
+        assert operator.histogram("histogram(1,2,3)", output='bytes') != first
+        svg = operator.histogram("histogram(1,2,2,3)", output=RenderOptions('bytes', format='svg'))
+        assert b'<svg' in svg
+        uncached = Operators()
+        uncached.render_cache = None
+        assert uncached.histogram("histogram(1,2,2,3)", output='bytes') == first
+        path = tmp_path / 'histogramme.png'
+        operator.histogram("histogram(1,2,2,3)", output=path)
+        assert path.read_bytes() == first
+
+    def test_render_cache_normalized_expression(self, operator):
+        """Test de la clé de cache des courbes: expression sous forme normalisée."""
+        first = operator.plot_function("plot(x^2,-10,10)", output='bytes')
+        hits = operator.render_cache.stats()['hits']
+        assert operator.plot_function("plot( x ** 2 ,-10,10)", output='bytes') == first
+        assert operator.polar_plot("polar(1+cos(theta),0,pi)", output='bytes') \
+            == operator.polar_plot("polar( 1 + cos ( theta ) ,0,pi)", output='bytes')
+        assert operator.render_cache.stats()['hits'] == hits + 2
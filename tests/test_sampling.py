@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from calculate.expression import compile_expression
+from calculate.sampling import AdaptiveSampler, adaptive_grid, view_limits, DEFAULT_BUDGET
+from calculate.operators import Operators
+
+class TestSampling:
+    """Tests pour le module sampling."""
+
+    @pytest.fixture
+    def operators(self):
+        """Fixture des opérateurs, sans cache de rendus."""
+        operators = Operators()
+        operators.render_cache = None
+        return operators
+
+    def test_flat_regions_sparse(self):
+        """Test du peu de points sur une droite et de la concentration sur un pic."""
+        line = AdaptiveSampler(compile_expression('2*x + 1', ('x',)))
+        x, y = line.sample(-10, 10)
+        assert x.size < 100
+        assert (x[0], x[-1]) == (-10, 10)
+        np.testing.assert_allclose(y, 2 * x + 1)
+
+        peak = AdaptiveSampler(compile_expression('exp(-100*x^2)', ('x',)))
+        x, y = peak.sample(-10, 10)
+        assert np.all(np.diff(x) > 0)
+        near = np.count_nonzero(np.abs(x) < 0.5)
+        assert near > np.count_nonzero(np.abs(x) > 5)
+
+    def test_accuracy(self):
+        """Test de l'écart à la courbe exacte entre deux points, sous la tolérance."""
+        sampler = AdaptiveSampler(compile_expression('sin(x)', ('x',)))
+        x, y = sampler.sample(0, 20)
+        dense = np.linspace(0, 20, 100001)
+        assert np.max(np.abs(np.interp(dense, x, y) - np.sin(dense))) < 0.01
+        assert x.size <= DEFAULT_BUDGET
+
+    def test_no_aliasing(self):
+        """Test d'une oscillation rapide: la grille de départ ne la replie pas."""
+        sampler = AdaptiveSampler(compile_expression('sin(20*x)', ('x',)))
+        x, y = sampler.sample(-10, 10)
+        dense = np.linspace(-10, 10, 200001)
+        assert np.max(np.abs(np.interp(dense, x, y) - np.sin(20 * dense))) < 0.2
+        assert np.count_nonzero(np.abs(y) > 0.99) > 100
+
+    def test_budget(self):
+        """Test du budget de points respecté sur une fonction très oscillante."""
+        sampler = AdaptiveSampler(compile_expression('sin(1/x)', ('x',)), budget=300)
+        x, y = sampler.sample(-1, 1)
+        assert x.size <= 301
+
+    def test_asymptotes(self):
+        """Test des coupures (NaN) aux asymptotes de tan."""
+        sampler = AdaptiveSampler(compile_expression('tan(x)', ('x',)))
+        x, y = sampler.sample(-10, 10)
+        assert sampler.asymptotes == 6
+        breaks = x[np.isnan(y)]
+        np.testing.assert_allclose(breaks, np.pi / 2 + np.pi * np.arange(-3, 3), atol=0.01)
+        low, high = view_limits(x, y)
+        assert -100 < low < -10 and 10 < high < 100
+
+    def test_domain_edge(self):
+        """Test de la localisation du bord de domaine de sqrt, sans coupure d'asymptote."""
+        sampler = AdaptiveSampler(compile_expression('sqrt(x)', ('x',)))
+        x, y = sampler.sample(-1, 1)
+        assert sampler.asymptotes == 0
+        assert x[np.isfinite(y)].min() < 1e-3
+
+    def test_zoom_reuses_evaluations(self):
+        """Test de la réutilisation des évaluations lors d'un zoom."""
+        calls = []
+
+        def function(t):
+            calls.append(t.size)
+            return np.sin(5 * t)
+
+        sampler = AdaptiveSampler(function)
+        sampler.sample(-10, 10)
+        first = sampler.evaluations
+        x, y = sampler.sample(-10, 10)
+        assert sampler.evaluations == first
+        sampler.sample(0, 5)
+        assert sampler.evaluations - first < first
+        assert sum(calls) == sampler.evaluations
+
+    def test_invalid_range(self):
+        """Test du rejet d'un intervalle vide."""
+        sampler = AdaptiveSampler(np.sin)
+        with pytest.raises(ValueError):
+            sampler.sample(1, 1)
+
+    def test_adaptive_grid(self):
+        """Test de la grille 3D: budget respecté, lignes resserrées où la surface varie."""
+        f = compile_expression('exp(-10*x^2)', ('x', 'y'))
+        xs, ys, Z = adaptive_grid(f, (-3, 3), (-3, 3), budget=2500)
+        assert Z.shape == (ys.size, xs.size)
+        assert xs.size * ys.size <= 2500
+        # La surface ne dépend pas de y: les lignes ne sont pas raffinées
+        assert ys.size < xs.size
+        X, Y = np.meshgrid(xs, ys)
+        np.testing.assert_allclose(Z, np.exp(-10 * X ** 2))
+        assert np.count_nonzero(np.abs(xs) < 1) > np.count_nonzero(np.abs(xs) > 2)
+
+    def test_adaptive_grid_no_aliasing(self):
+        """Test d'une surface oscillante: la grille 3D n'est pas réduite à un plan."""
+        f = compile_expression('sin(10*x)*y', ('x', 'y'))
+        xs, ys, Z = adaptive_grid(f, (-5, 5), (-5, 5))
+        assert xs.size >= 100 and ys.size >= 100
+        dense = np.linspace(-5, 5, 10001)
+        assert np.max(np.abs(np.interp(dense, xs, Z[-1]) - 5 * np.sin(10 * dense))) < 0.5
+
+    def test_plot_operators(self, operators):
+        """Test des tracés échantillonnés et de la réutilisation des échantillonneurs."""
+        for command in ('plot(tan(x), -10, 10)', 'polar(1 + cos(theta), 0, 2*pi)',
+                        '3d(sin(x)*cos(y), -3, 3, -3, 3)'):
+            data = operators.visualize(command, output='bytes')
+            assert data[:8] == b'\x89PNG\r\n\x1a\n'
+        sampler = operators.samplers.get(('tan(x)', 'x'))
+        evaluations = sampler.evaluations
+        operators.visualize('plot(tan(x), 0, 1)', output='bytes')
+        assert operators.samplers.get(('tan(x)', 'x')) is sampler
+        assert sampler.evaluations > evaluations
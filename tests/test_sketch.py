@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from calculate.sketch import QuantileSketch
+
+class TestQuantileSketch:
+    """Tests pour le module sketch."""
+
+    @pytest.fixture
+    def values(self):
+        """Fixture d'un grand échantillon asymétrique."""
+        return np.random.default_rng(1).lognormal(0, 1, 200000)
+
+    def rank_error(self, values, estimate, p):
+        """Erreur de rang d'une estimation du percentile p."""
+        return abs(np.searchsorted(np.sort(values), estimate) / values.size - p / 100)
+
+    def test_exact_when_small(self):
+        """Test de l'exactitude tant qu'aucune compaction n'a eu lieu."""
+        sketch = QuantileSketch().update([1, 2, 3, 4])
+        assert sketch.exact
+        assert sketch.median() == 2.5
+        assert sketch.percentiles(75) == np.percentile([1, 2, 3, 4], 75)
+
+    def test_bounded_memory_and_error(self, values):
+        """Test de la mémoire bornée et de l'erreur de rang."""
+        sketch = QuantileSketch.from_chunks(np.array_split(values, 20), seed=0)
+        assert sketch.count == values.size
+        assert sketch.size() < 3 * sketch.k
+        estimates = sketch.percentiles([50, 90, 99])
+        for p, estimate in zip([50, 90, 99], estimates):
+            assert self.rank_error(values, estimate, p) < 2 * sketch.error
+        assert sketch.percentiles(0) == values.min()
+        assert sketch.percentiles(100) == values.max()
+
+    def test_merge_shards(self, values):
+        """Test de la fusion de sketchs construits sur des fragments."""
+        left = QuantileSketch(seed=1).update(values[:120000])
+        right = QuantileSketch(seed=2).update(values[120000:])
+        merged = left.merge(right)
+        assert merged.count == values.size
+        assert self.rank_error(values, merged.median(), 50) < 2 * merged.error
+
+    def test_invalid(self):
+        """Test des paramètres invalides."""
+        with pytest.raises(ValueError):
+            QuantileSketch(k=2)
+        with pytest.raises(ValueError):
+            QuantileSketch.with_error(2)
+        with pytest.raises(ValueError):
+            QuantileSketch().median()
+        with pytest.raises(ValueError):
+            QuantileSketch().update([1]).quantiles(1.5)
@@ -0,0 +1,25 @@
+from calculate.lazy import lazy_import
+from calculate.startup import measure_imports, startup_report
+
+class TestStartup:
+    """Tests pour le chargement paresseux et le budget de démarrage."""
+
+    def test_lazy_import(self):
+        """Test du chargement au premier accès."""
+        module = lazy_import('json')
+        assert not module.loaded
+        assert module.dumps([1]) == '[1]'
+        assert module.loaded
+
+    def test_no_heavy_import_at_startup(self):
+        """Test que matplotlib et scipy ne sont pas importés au démarrage."""
+        names = [name for name, _, _ in measure_imports('main')]
+        assert 'calculate.operators' in names
+        assert not [name for name in names if name.split('.')[0] in ('matplotlib', 'scipy')]
+
+    def test_startup_report(self):
+        """Test du rapport de démarrage."""
+        report = startup_report('calculate.parser', budget_ms=1e6, top=3)
+        assert report['within_budget']
+        assert report['heavy_modules'] == []
+        assert len(report['slowest']) == 3
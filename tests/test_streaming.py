@@ -0,0 +1,88 @@
+import io
+import pytest
+import numpy as np
+from calculate.streaming import RunningStats, RunningRegression, iter_chunks, stream_stats
+from scipy import stats
+
+class TestStreaming:
+    """Tests pour le module streaming."""
+
+    @pytest.fixture
+    def values(self):
+        """Fixture de valeurs aléatoires reproductibles."""
+        return np.random.default_rng(0).normal(10, 3, 10001)
+
+    def test_running_stats_matches_numpy(self, values):
+        """Test de l'accumulation par blocs face à NumPy."""
+        stats = RunningStats.from_chunks(np.array_split(values, 7))
+        assert stats.count == values.size
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.variance == pytest.approx(np.var(values))
+        assert stats.std == pytest.approx(np.std(values))
+        assert stats.min == values.min()
+        assert stats.max == values.max()
+
+    def test_merge_partial_states(self, values):
+        """Test de la fusion d'états partiels (ex: calculés par des workers)."""
+        left = RunningStats().update(values[:3000])
+        right = RunningStats.from_dict(RunningStats().update(values[3000:]).result())
+        merged = left.merge(right)
+        assert merged.mean == pytest.approx(np.mean(values))
+        assert merged.m2 == pytest.approx(np.var(values) * values.size)
+        assert RunningStats().merge(RunningStats()).count == 0
+
+    def test_empty(self):
+        """Test d'un accumulateur vide."""
+        with pytest.raises(ValueError):
+            RunningStats().variance
+
+    def test_iter_chunks_text_stream(self):
+        """Test de la lecture d'un flux texte coupé au milieu des nombres."""
+        stream = io.StringIO("1.5,2.5\n3,4;5 6\n70,800")
+        chunks = list(iter_chunks(stream, chunk_size=4))
+        assert np.concatenate(chunks).tolist() == [1.5, 2.5, 3, 4, 5, 6, 70, 800]
+        with pytest.raises(ValueError):
+            list(iter_chunks(io.StringIO("1,a,3")))
+
+    def test_iter_chunks_generator(self):
+        """Test de la lecture d'un générateur de nombres."""
+        chunks = list(iter_chunks((float(i) for i in range(10)), chunk_size=4))
+        assert [len(c) for c in chunks] == [4, 4, 2]
+
+    def test_stream_stats(self):
+        """Test du résumé d'un fichier binaire."""
+        result = stream_stats(io.BytesIO(b"1 2 3 4 5"), chunk_size=3).result()
+        assert result['count'] == 5
+        assert result['mean'] == 3
+        assert result['variance'] == pytest.approx(2.0)
+
+    def test_running_regression_matches_linregress(self):
+        """Test de la régression incrémentale face à scipy.stats.linregress."""
+        rng = np.random.default_rng(3)
+        x = rng.normal(1e6, 1, 20000)
+        y = 3 * x + rng.normal(0, 2, x.size)
+        pairs = zip(np.array_split(x, 9), np.array_split(y, 9))
+        result = RunningRegression.from_chunks(pairs).result()
+        expected = stats.linregress(x, y)
+        assert result['slope'] == pytest.approx(expected.slope)
+        assert result['intercept'] == pytest.approx(expected.intercept)
+        assert result['r_squared'] == pytest.approx(expected.rvalue ** 2)
+        assert result['p_value'] == pytest.approx(expected.pvalue, abs=1e-12)
+
+    def test_running_regression_merge(self):
+        """Test de la fusion d'états de régression calculés séparément."""
+        x = np.arange(100, dtype=float)
+        y = np.sin(x) + x / 10
+        left = RunningRegression().update(x[:40], y[:40])
+        right = RunningRegression.from_dict(RunningRegression().update(x[40:], y[40:]).state())
+        merged = left.merge(right)
+        assert merged.correlation == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+    def test_running_regression_errors(self):
+        """Test des cas non définis."""
+        with pytest.raises(ValueError):
+            RunningRegression().update([1, 2], [1])
+        with pytest.raises(ValueError):
+            RunningRegression().update([1, 2], [3, 4]).result()
+        with pytest.raises(ValueError):
+            RunningRegression().update([1, 1, 1], [1, 2, 3]).correlation
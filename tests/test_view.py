@@ -133,4 +133,16 @@ class TestView:
         assert "var" in help_text
         assert "percentile" in help_text
         assert "correlation" in help_text
-        assert "regression" in help_text 
\ No newline at end of file
+        assert "regression" in help_text 
+
+    def test_write_record(self):
+        """Test de l'écriture d'un enregistrement NDJSON."""
+        import io
+        import json
+        import numpy as np
+        output = io.StringIO()
+        View.write_record({'operation': 'x', 'result': {'a': np.float64(1.5), 'b': np.nan,
+                                                          'c': np.array([1, 2])}}, output)
+        text = output.getvalue()
+        assert text.endswith("\n") and text.count("\n") == 1
+        assert json.loads(text) == {'operation': 'x', 'result': {'a': 1.5, 'b': None, 'c': [1, 2]}}